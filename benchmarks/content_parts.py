@@ -0,0 +1,63 @@
+"""
+Compares decoding content parts by their `type` tag with trying the members of an untagged union in turn.
+
+The untagged union is `typing.Union[TypedText, TypedMediaContent]`, which content parts used to be typed as: each
+part is validated against `TypedText` and then `TypedMediaContent` until one of them works. Every other part is
+text, the rest alternate between images and videos. The last column is a whole chat response with that many parts.
+
+    python benchmarks/content_parts.py --parts 10 100 1000
+"""
+
+import argparse
+import timeit
+import typing
+
+from reka import ChatMessageOutputContentItem, ChatResponse, TypedMediaContent, TypedText
+from reka.core import construct_type
+
+UNTAGGED = typing.List[typing.Union[TypedText, TypedMediaContent]]
+TAGGED = typing.List[ChatMessageOutputContentItem]
+
+
+def _part(i: int) -> typing.Dict[str, typing.Any]:
+    if i % 2 == 0:
+        return {"type": "text", "text": f"Part {i} " + "lorem ipsum " * 5}
+    if i % 4 == 1:
+        return {"type": "image_url", "image_url": f"https://example.com/{i}.png"}
+    return {"type": "video_url", "video_url": f"https://example.com/{i}.mp4"}
+
+
+def _response(parts: typing.List[typing.Any]) -> typing.Dict[str, typing.Any]:
+    return {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"message": {"role": "assistant", "content": parts}, "finish_reason": "stop"}],
+        "usage": {"input_tokens": 42, "output_tokens": 17},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parts", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for parts in args.parts:
+        content = [_part(i) for i in range(parts)]
+        response = _response(content)
+        number = max(10_000 // parts, 3)
+        results = {}
+        for name, type_, object_ in [
+            ("untagged", UNTAGGED, content),
+            ("tagged", TAGGED, content),
+            ("response", ChatResponse, response),
+        ]:
+            seconds = min(timeit.repeat(lambda: construct_type(type_=type_, object_=object_), number=number, repeat=5))
+            results[name] = seconds / number
+        print(
+            f"{parts:>5} parts  untagged {results['untagged'] * 1e3:8.3f} ms  tagged {results['tagged'] * 1e3:8.3f} ms"
+            f"  {results['untagged'] / results['tagged']:5.1f}x  response {results['response'] * 1e3:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
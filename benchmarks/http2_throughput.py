@@ -0,0 +1,170 @@
+"""
+Compares chat.create throughput over HTTP/1.1 and HTTP/2 against a local stand-in server.
+
+The server answers every POST /chat with a canned ChatResponse after a fixed delay, standing in for model latency,
+and speaks both HTTP/1.1 (via h11) and cleartext HTTP/2 (via h2). With a connection pool capped at
+`--max-connections`, HTTP/1.1 can only have that many requests in flight, while HTTP/2 multiplexes every concurrent
+call over the same connections.
+
+The real API negotiates HTTP/2 through TLS ALPN, which is what `AsyncReka(http2=True)` relies on. Locally there is
+no certificate, so the HTTP/2 client is built with the same limits but uses prior knowledge instead.
+
+Requires the `h2` package:
+
+    pip install httpx[http2]
+    python benchmarks/http2_throughput.py --concurrency 64 128 256
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import typing
+
+import h2.config
+import h2.connection
+import h2.events
+import h11
+import httpx
+
+from reka import ChatMessage
+from reka.client import AsyncReka, _get_limits
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+CHAT_RESPONSE = json.dumps(
+    {
+        "id": "benchmark",
+        "model": "reka-core",
+        "responses": [{"message": {"role": "assistant", "content": "Hello there!"}, "finish_reason": "stop"}],
+        "usage": {"input_tokens": 12, "output_tokens": 3},
+    }
+).encode()
+
+
+async def _serve_h11(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, first: bytes, latency: float) -> None:
+    conn = h11.Connection(h11.SERVER)
+    conn.receive_data(first)
+    while True:
+        event = conn.next_event()
+        if event is h11.NEED_DATA:
+            data = await reader.read(65536)
+            if not data:
+                return
+            conn.receive_data(data)
+        elif isinstance(event, h11.EndOfMessage):
+            await asyncio.sleep(latency)
+            headers = [("content-type", "application/json"), ("content-length", str(len(CHAT_RESPONSE)))]
+            writer.write(conn.send(h11.Response(status_code=200, headers=headers)))
+            writer.write(conn.send(h11.Data(data=CHAT_RESPONSE)))
+            writer.write(conn.send(h11.EndOfMessage()))
+            await writer.drain()
+            conn.start_next_cycle()
+        elif isinstance(event, h11.ConnectionClosed):
+            return
+
+
+async def _serve_h2(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, first: bytes, latency: float) -> None:
+    conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+    conn.initiate_connection()
+    writer.write(conn.data_to_send())
+
+    async def respond(stream_id: int) -> None:
+        await asyncio.sleep(latency)
+        headers = [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(CHAT_RESPONSE)))]
+        conn.send_headers(stream_id, headers)
+        conn.send_data(stream_id, CHAT_RESPONSE, end_stream=True)
+        writer.write(conn.data_to_send())
+        await writer.drain()
+
+    pending = set()
+    data = first
+    while data:
+        for event in conn.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                task = asyncio.ensure_future(respond(event.stream_id))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        writer.write(conn.data_to_send())
+        await writer.drain()
+        data = await reader.read(65536)
+
+
+def _run_server(sock: socket.socket, latency: float) -> None:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            first = await reader.readexactly(len(H2_PREFACE))
+        except asyncio.IncompleteReadError:
+            return
+        serve = _serve_h2 if first == H2_PREFACE else _serve_h11
+        try:
+            await serve(reader, writer, first, latency)
+        except (ConnectionError, h11.RemoteProtocolError):
+            pass
+        finally:
+            writer.close()
+
+    async def main() -> None:
+        server = await asyncio.start_server(handle, sock=sock, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+async def _measure(client: AsyncReka, concurrency: int, requests: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    messages = [ChatMessage(role="user", content="Hi")]
+
+    async def call() -> None:
+        async with semaphore:
+            await client.chat.create(messages=messages, model="reka-core")
+
+    # Warm up the pool so that connection setup is not part of the measurement.
+    await asyncio.gather(*(call() for _ in range(concurrency)))
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> typing.List[typing.Dict[str, typing.Any]]:
+    limits = _get_limits(max_connections=args.max_connections)
+    clients = {
+        "http/1.1": lambda: httpx.AsyncClient(limits=limits, timeout=60),
+        "http/2": lambda: httpx.AsyncClient(limits=limits, timeout=60, http1=False, http2=True),
+    }
+    results = []
+    for concurrency in args.concurrency:
+        for protocol, make_client in clients.items():
+            async with make_client() as httpx_client:
+                client = AsyncReka(api_key="benchmark", base_url=base_url, httpx_client=httpx_client)
+                throughput = await _measure(client, concurrency, max(args.requests, concurrency))
+            results.append({"protocol": protocol, "concurrency": concurrency, "requests_per_second": throughput})
+            print(f"{protocol:>8}  concurrency={concurrency:<4}  {throughput:8.1f} req/s")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--requests", type=int, default=1024)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency in seconds.")
+    parser.add_argument("--max-connections", type=int, default=16)
+    args = parser.parse_args()
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = multiprocessing.Process(target=_run_server, args=(sock, args.latency), daemon=True)
+    server.start()
+    try:
+        print(f"latency={args.latency}s  max_connections={args.max_connections}")
+        asyncio.run(_run(args, f"http://127.0.0.1:{sock.getsockname()[1]}/v1"))
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures how long importing the SDK takes, with `python -X importtime`, in a fresh interpreter for every run.
+
+Each statement is timed `--repeat` times and the fastest run is reported, counting only the modules of the SDK and
+what they import. `--top` lists the modules that take the longest to import themselves for each statement.
+
+    python benchmarks/import_time.py --repeat 5 --top 10
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import typing
+
+STATEMENTS = [
+    "import reka",
+    "import reka; reka.ChatMessage",
+    "from reka.client import Reka",
+    "import reka.v2",
+]
+
+# "import time: <self us> | <cumulative us> | <two spaces per nesting level><module>"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(statement: str) -> typing.List[typing.Tuple[int, int, int, str]]:
+    """
+    Returns the self and cumulative microseconds, the nesting level and the name of each module `statement` imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    times = []
+    for line in process.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is not None:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return times
+
+
+def sdk_modules(times: typing.List[typing.Tuple[int, int, int, str]]) -> typing.List[typing.Tuple[int, int, int, str]]:
+    """
+    Returns the modules of the SDK imported at the top level and everything they import, leaving out the modules the
+    interpreter imports at startup.
+    """
+    modules: typing.List[typing.Tuple[int, int, int, str]] = []
+    # A module is reported after the modules it imports.
+    imported: typing.List[typing.Tuple[int, int, int, str]] = []
+    for module in times:
+        imported.append(module)
+        _, _, level, name = module
+        if level == 0:
+            if name.split(".")[0] == "reka":
+                modules += imported
+            imported = []
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        try:
+            runs = [import_times(statement) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as error:
+            print(f"{statement:>32}  failed: {error.stderr.strip().splitlines()[-1]}")
+            continue
+        modules = [sdk_modules(times) for times in runs]
+        total_us = min(sum(cumulative for _, cumulative, level, _ in run if level == 0) for run in modules)
+        print(f"{statement:>32}  {total_us / 1000:8.2f} ms  {len(modules[0])} modules")
+        for self_us, _, _, name in sorted(modules[0], reverse=True)[: args.top]:
+            print(f"{name:>48}  {self_us / 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures the per-chunk and per-response cost of each installed JSON backend.
+
+"chunk" decodes the data of one SSE event of chat.create_stream, "response" decodes a chat.create response with
+`--tokens` tokens of text, and "request" encodes a chat.create body with a `--history`-message conversation. For
+reference, the last column of the decode rows is the time construct_type takes to build the typed object from the
+decoded value, which is the same for every backend.
+
+    pip install orjson msgspec
+    python benchmarks/json_codec.py --tokens 1000 --history 20
+"""
+
+import argparse
+import json
+import timeit
+import typing
+
+from reka import ChatMessage
+from reka.core import JSONCodec, construct_type, jsonable_encoder
+from reka.types import ChatResponse, ChunkChatResponse
+
+
+def _chunk() -> bytes:
+    return json.dumps(
+        {
+            "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+            "model": "reka-core-20240501",
+            "responses": [{"chunk": {"role": "assistant", "content": " the"}, "finish_reason": None}],
+            "usage": {"input_tokens": 42, "output_tokens": 17},
+        }
+    ).encode()
+
+
+def _response(tokens: int) -> bytes:
+    return json.dumps(
+        {
+            "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+            "model": "reka-core-20240501",
+            "responses": [
+                {"message": {"role": "assistant", "content": "word " * tokens}, "finish_reason": "stop"},
+            ],
+            "usage": {"input_tokens": 42, "output_tokens": tokens},
+        }
+    ).encode()
+
+
+def _request(history: int) -> typing.Any:
+    messages = [
+        ChatMessage(role="user" if i % 2 == 0 else "assistant", content=f"Message number {i}, " + "lorem ipsum " * 40)
+        for i in range(history)
+    ]
+    return {"messages": jsonable_encoder(messages), "model": "reka-core", "max_tokens": 1024, "temperature": 0.4}
+
+
+def _per_call(fn: typing.Callable[[], typing.Any], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1000, help="Length of the response text.")
+    parser.add_argument("--history", type=int, default=20, help="Number of messages in the request.")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    chunk, response, request = _chunk(), _response(args.tokens), _request(args.history)
+    chunk_construct = _per_call(lambda: construct_type(type_=ChunkChatResponse, object_=json.loads(chunk)), args.number)
+    response_construct = _per_call(
+        lambda: construct_type(type_=ChatResponse, object_=json.loads(response)), args.number
+    )
+    print(f"chunk {len(chunk)} B, response {len(response)} B, request {len(json.dumps(request))} B")
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            codec = JSONCodec(backend)
+        except ImportError:
+            print(f"{backend:>8}  not installed")
+            continue
+        chunk_time = _per_call(lambda: codec.loads(chunk), args.number)
+        response_time = _per_call(lambda: codec.loads(response), args.number)
+        request_time = _per_call(lambda: codec.dumps(request), args.number)
+        print(
+            f"{backend:>8}  chunk {chunk_time * 1e6:7.2f} us (construct {chunk_construct * 1e6:.2f} us)"
+            f"  response {response_time * 1e6:7.2f} us (construct {response_construct * 1e6:.2f} us)"
+            f"  request {request_time * 1e6:7.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures how long `.dict()` and `.json()` take on the generated models, for conversations of `--turns` turns.
+
+Each turn is a user message with text and image content parts, an assistant message calling a tool and the tool's
+output, so the messages nest models up to three levels deep. The chat response has `--responses` candidate
+responses with text content.
+
+    python benchmarks/model_dict.py --turns 1 10 50 --number 200
+"""
+
+import argparse
+import timeit
+import typing
+
+from reka import ChatMessage, ChatResponse, ToolCall, ToolOutput, TypedMediaContent, TypedText
+from reka.core import construct_type
+
+
+def conversation(turns: int) -> typing.List[ChatMessage]:
+    messages = []
+    for i in range(turns):
+        messages += [
+            ChatMessage(
+                role="user",
+                content=[
+                    TypedText(type="text", text=f"What is the weather like in picture {i}?"),
+                    TypedMediaContent(type="image_url", image_url=f"https://example.com/{i}.png"),
+                ],
+            ),
+            ChatMessage(
+                role="assistant",
+                tool_calls=[ToolCall(id=f"call-{i}", name="get_weather", parameters={"location": "Paris", "day": i})],
+            ),
+            ChatMessage(role="tool_output", content=[ToolOutput(tool_call_id=f"call-{i}", output="21 C, sunny")]),
+        ]
+    return messages
+
+
+def response(responses: int) -> ChatResponse:
+    message = {"role": "assistant", "content": [{"type": "text", "text": "It is sunny."}], "tool_calls": None}
+    return construct_type(
+        type_=ChatResponse,
+        object_={
+            "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+            "model": "reka-core-20240501",
+            "responses": [{"message": message, "finish_reason": "stop"} for _ in range(responses)],
+            "usage": {"input_tokens": 42, "output_tokens": 17},
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--responses", type=int, default=4)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    cases: typing.Dict[str, typing.List[typing.Any]] = {f"{turns} turns": conversation(turns) for turns in args.turns}
+    cases[f"{args.responses} responses"] = [response(args.responses)]
+    for name, models in cases.items():
+        for method in ("dict", "json"):
+            seconds = min(
+                timeit.repeat(lambda: [getattr(model, method)() for model in models], number=args.number, repeat=5)
+            )
+            print(f"{name:>12}  {method}  {seconds / args.number * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
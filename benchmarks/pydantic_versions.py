@@ -0,0 +1,101 @@
+"""
+Compares decoding and encoding throughput of the generated models built on pydantic 2 with the same models built
+on its `pydantic.v1` compatibility layer, i.e. with and without REKA_PYDANTIC_V2 set.
+
+Each build runs in its own process. The cases decode a chat response with `--responses` candidate responses,
+validate and encode a request of `--turns` turns and serialize both with `.dict()` and `.json()`.
+
+    python benchmarks/pydantic_versions.py --turns 10 --responses 4 --number 200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+import typing
+
+from reka import ChatMessage, ChatResponse
+from reka.core import construct_type
+from reka.core.pydantic_utilities import IS_PYDANTIC_V2
+from reka.core.request_encoder import encode_request
+
+
+def conversation(turns: int) -> typing.List[typing.Dict[str, typing.Any]]:
+    messages: typing.List[typing.Dict[str, typing.Any]] = []
+    for i in range(turns):
+        messages += [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": f"What is the weather like in picture {i}?"},
+                    {"type": "image_url", "image_url": f"https://example.com/{i}.png"},
+                ],
+            },
+            {
+                "role": "assistant",
+                "tool_calls": [{"id": f"call-{i}", "name": "get_weather", "parameters": {"location": "Paris"}}],
+            },
+        ]
+    return messages
+
+
+def response(responses: int) -> typing.Dict[str, typing.Any]:
+    message = {"role": "assistant", "content": [{"type": "text", "text": "It is sunny."}], "tool_calls": None}
+    return {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"message": message, "finish_reason": "stop"} for _ in range(responses)],
+        "usage": {"input_tokens": 42, "output_tokens": 17},
+    }
+
+
+def measure(turns: int, responses: int, number: int) -> typing.Dict[str, float]:
+    """
+    Returns the microseconds each case takes in this process.
+    """
+    body = response(responses)
+    decoded = construct_type(type_=ChatResponse, object_=body)
+    raw_messages = conversation(turns)
+    messages = [ChatMessage(**message) for message in raw_messages]
+    cases: typing.Dict[str, typing.Callable[[], typing.Any]] = {
+        "decode response": lambda: construct_type(type_=ChatResponse, object_=body),
+        "response dict()": lambda: decoded.dict(),
+        "response json()": lambda: decoded.json(),
+        "validate request": lambda: [ChatMessage(**message) for message in raw_messages],
+        "encode request": lambda: encode_request({"messages": messages, "model": "reka-core"}),
+        "request dict()": lambda: [message.dict() for message in messages],
+        "request json()": lambda: [message.json() for message in messages],
+    }
+    return {name: min(timeit.repeat(case, number=number, repeat=5)) / number * 1e6 for name, case in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--responses", type=int, default=4)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.turns, args.responses, args.number)))
+        return
+    if not IS_PYDANTIC_V2:
+        parser.error("pydantic 2 is not installed")
+
+    results = {}
+    for build, v2 in (("pydantic.v1", ""), ("pydantic 2", "1")):
+        env = {**os.environ, "REKA_PYDANTIC_V2": v2}
+        command = [sys.executable, __file__, "--measure", *sys.argv[1:]]
+        results[build] = json.loads(subprocess.run(command, env=env, capture_output=True, check=True).stdout)
+
+    print(f"{'':>18}  {'pydantic.v1':>12}  {'pydantic 2':>12}")
+    for name in results["pydantic.v1"]:
+        v1_us, v2_us = results["pydantic.v1"][name], results["pydantic 2"][name]
+        print(f"{name:>18}  {v1_us:9.2f} us  {v2_us:9.2f} us  {v1_us / v2_us:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Weighs the time spent compressing chat request bodies against the upload time it saves.
+
+Each payload is a chat request carrying one inline image as a base64 `data:` URL. "jpeg" is random bytes, standing
+in for media that is already compressed, where only the base64 overhead can be won back; "png" repeats short runs of
+random bytes, standing in for screenshots and diagrams with large flat areas. For every encoding and level the table
+shows the compressed size, the time to compress, and the net time saved when uploading over a `--mbps` link, which
+is the upload time saved minus the compression time. zstd is only measured when `zstandard` is installed.
+
+    python benchmarks/request_compression.py --sizes 256 1024 4096 --mbps 10 100
+"""
+
+import argparse
+import base64
+import os
+import random
+import time
+import typing
+
+from reka import ChatMessage
+from reka.core import RequestCompression, jsonable_encoder
+
+SETTINGS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("zstd", 1), ("zstd", 3), ("zstd", 9)]
+
+
+def _jpeg_like(size: int) -> bytes:
+    return os.urandom(size)
+
+
+def _png_like(size: int) -> bytes:
+    rng = random.Random(0)
+    chunks: typing.List[bytes] = []
+    while sum(map(len, chunks)) < size:
+        chunks.append(bytes([rng.randrange(256)]) * rng.randrange(1, 64) + os.urandom(rng.randrange(1, 16)))
+    return b"".join(chunks)[:size]
+
+
+def _body(image: bytes, mime_type: str) -> typing.Any:
+    url = f"data:{mime_type};base64,{base64.b64encode(image).decode()}"
+    message = ChatMessage(
+        role="user", content=[{"type": "image_url", "image_url": url}, {"type": "text", "text": "Describe this."}]
+    )
+    return {"messages": jsonable_encoder([message]), "model": "reka-core"}
+
+
+def _time(fn: typing.Callable[[], typing.Any], repeat: int) -> typing.Tuple[float, typing.Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024, 4096], help="Image sizes in KiB.")
+    parser.add_argument("--mbps", type=float, nargs="+", default=[10.0, 100.0], help="Upload speeds in Mbit/s.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for kind, make_image, mime_type in [("jpeg", _jpeg_like, "image/jpeg"), ("png", _png_like, "image/png")]:
+        for size in args.sizes:
+            body = _body(make_image(size * 1024), mime_type)
+            encode_time, encoded = _time(lambda: RequestCompression().encode(body), args.repeat)
+            print(f"{kind} {size} KiB: body {len(encoded) / 1024:.0f} KiB, encoded in {encode_time * 1000:.1f} ms")
+            for encoding, level in SETTINGS:
+                try:
+                    compression = RequestCompression(encoding=encoding, level=level, threshold=0)
+                except ImportError:
+                    continue
+                compress_time, compressed = _time(lambda: compression.compress(encoded), args.repeat)
+                saved = [(len(encoded) - len(compressed)) * 8 / (mbps * 1e6) - compress_time for mbps in args.mbps]
+                print(
+                    f"  {encoding:>4} -{level:<2} {len(compressed) / len(encoded):6.1%} of the body"
+                    f"  {compress_time * 1000:8.1f} ms"
+                    + "".join(f"  {mbps:g} Mbit/s: {net * 1000:+8.1f} ms" for mbps, net in zip(args.mbps, saved))
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares encode_request with jsonable_encoder on chat.create request bodies with long conversation histories.
+
+Each conversation alternates user and assistant turns. Every fourth user turn carries an image and a text part, and
+every fifth assistant turn makes a tool call that the next turn answers with a tool output. Two tools are defined.
+
+    python benchmarks/request_encoder.py --messages 10 100 1000
+"""
+
+import argparse
+import timeit
+import typing
+
+from reka import ChatMessage, Tool, ToolCall, ToolOutput, TypedMediaContent, TypedText
+from reka.core import jsonable_encoder
+from reka.core.request_encoder import encode_request
+
+TOOLS = [
+    Tool(
+        name="get_weather",
+        description="Get the weather in a given location.",
+        parameters={"type": "object", "properties": {"location": {"type": "string"}}, "required": ["location"]},
+    ),
+    Tool(name="search", description="Search the web.", parameters={"type": "object", "properties": {}}),
+]
+
+
+def _message(i: int) -> ChatMessage:
+    if i % 2 == 1:
+        if i % 5 == 0:
+            call = ToolCall(id=f"call-{i}", name="get_weather", parameters={"location": "Paris"})
+            return ChatMessage(role="assistant", tool_calls=[call])
+        return ChatMessage(role="assistant", content=f"Answer {i}: " + "lorem ipsum " * 20)
+    if i % 5 == 1 and i > 1:
+        return ChatMessage(role="tool_output", content=[ToolOutput(tool_call_id=f"call-{i - 1}", output="21 C")])
+    if i % 4 == 0:
+        return ChatMessage(
+            role="user",
+            content=[
+                TypedMediaContent(type="image_url", image_url=f"https://example.com/{i}.png"),
+                TypedText(type="text", text="What is in this picture?"),
+            ],
+        )
+    return ChatMessage(role="user", content=f"Question {i}: " + "dolor sit amet " * 10)
+
+
+def _request(messages: int) -> typing.Dict[str, typing.Any]:
+    return {
+        "messages": [_message(i) for i in range(messages)],
+        "model": "reka-core",
+        "max_tokens": 1024,
+        "temperature": 0.4,
+        "tools": TOOLS,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for messages in args.messages:
+        request = _request(messages)
+        assert encode_request(request) == jsonable_encoder(request)
+        number = max(10_000 // messages, 3)
+        results = {}
+        for name, encode in [("jsonable_encoder", jsonable_encoder), ("encode_request", encode_request)]:
+            results[name] = min(timeit.repeat(lambda: encode(request), number=number, repeat=5)) / number
+        print(
+            f"{messages:>5} messages  jsonable_encoder {results['jsonable_encoder'] * 1e3:8.3f} ms"
+            f"  encode_request {results['encode_request'] * 1e3:8.3f} ms"
+            f"  {results['jsonable_encoder'] / results['encode_request']:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures the per-call overhead of the clients: everything a call does besides the network, which
+`httpx.MockTransport` stands in for with a canned response.
+
+The calls are small, so that the cost of building each request, i.e. its URL, headers, timeout and body, and of
+decoding the response dominates, as it does for high-QPS traffic. Calls without request options take the fast path
+through the precomputed request envelope, the calls with request options merge theirs in.
+
+    python benchmarks/request_overhead.py --number 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+import typing
+
+import httpx
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import RequestOptions
+
+CHAT_RESPONSE = json.dumps(
+    {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"message": {"role": "assistant", "content": "Hi"}, "finish_reason": "stop"}],
+        "usage": {"input_tokens": 5, "output_tokens": 1},
+    }
+).encode()
+MODELS = json.dumps([{"id": "reka-core"}]).encode()
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+REQUEST_OPTIONS: RequestOptions = {"timeout_in_seconds": 30, "additional_headers": {"X-Request-Id": "1"}}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, content=MODELS if request.url.path.endswith("/models") else CHAT_RESPONSE)
+
+
+def _cases(client: typing.Any) -> typing.Dict[str, typing.Callable[[], typing.Any]]:
+    return {
+        "chat.create": lambda: client.chat.create(messages=MESSAGES, model="reka-core"),
+        "chat.create with options": lambda: client.chat.create(
+            messages=MESSAGES, model="reka-core", request_options=REQUEST_OPTIONS
+        ),
+        "models.get": lambda: client.models.get(),
+    }
+
+
+def measure_sync(number: int) -> typing.Dict[str, float]:
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(_handler)))
+    return {
+        name: min(timeit.repeat(case, number=number, repeat=5)) / number * 1e6 for name, case in _cases(client).items()
+    }
+
+
+async def measure_async(number: int) -> typing.Dict[str, float]:
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler)))
+    results = {}
+    for name, case in _cases(client).items():
+        runs = []
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(number):
+                await case()
+            runs.append(time.perf_counter() - started)
+        results[name] = min(runs) / number * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    for client, results in (
+        ("Reka", measure_sync(args.number)),
+        ("AsyncReka", asyncio.run(measure_async(args.number))),
+    ):
+        for name, us in results.items():
+            print(f"{client:>9}  {name:>24}  {us:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
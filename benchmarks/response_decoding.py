@@ -0,0 +1,66 @@
+"""
+Measures how long construct_type takes to turn decoded JSON into the typed responses of the API.
+
+The payloads are a single stream chunk, a chat response with text content, one with a tool call, one with
+`--parts` multimodal content parts per message, a response with several candidate responses, and the model list.
+JSON decoding is not included, see benchmarks/json_codec.py for that.
+
+    python benchmarks/response_decoding.py --number 2000
+"""
+
+import argparse
+import timeit
+import typing
+
+from reka.core import construct_type
+from reka.types import ChatResponse, ChunkChatResponse, Model
+
+USAGE = {"input_tokens": 42, "output_tokens": 17}
+
+
+def _response(message: typing.Dict[str, typing.Any], responses: int = 1) -> typing.Dict[str, typing.Any]:
+    return {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"message": message, "finish_reason": "stop"} for _ in range(responses)],
+        "usage": USAGE,
+    }
+
+
+def payloads(parts: int) -> typing.Dict[str, typing.Tuple[typing.Any, typing.Any]]:
+    content = [
+        {"type": "text", "text": f"Part {i}"} if i % 2 else {"type": "image_url", "image_url": f"https://x/{i}.png"}
+        for i in range(parts)
+    ]
+    tool_call = {"id": "call-1", "name": "get_weather", "parameters": {"location": "Paris", "unit": "c"}}
+    return {
+        "chunk": (
+            ChunkChatResponse,
+            {
+                "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+                "model": "reka-core-20240501",
+                "responses": [{"chunk": {"role": "assistant", "content": " the"}, "finish_reason": None}],
+                "usage": USAGE,
+            },
+        ),
+        "text": (ChatResponse, _response({"role": "assistant", "content": "The fifth prime number is 11."})),
+        "tool call": (ChatResponse, _response({"role": "assistant", "content": None, "tool_calls": [tool_call]})),
+        "multimodal": (ChatResponse, _response({"role": "assistant", "content": content})),
+        "4 responses": (ChatResponse, _response({"role": "assistant", "content": "Eleven."}, responses=4)),
+        "models": (typing.List[Model], [{"id": f"reka-model-{i}"} for i in range(10)]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--parts", type=int, default=16, help="Content parts of the multimodal response.")
+    args = parser.parse_args()
+
+    for name, (type_, object_) in payloads(args.parts).items():
+        seconds = min(timeit.repeat(lambda: construct_type(type_=type_, object_=object_), number=args.number, repeat=5))
+        print(f"{name:>12}  {seconds / args.number * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares the CPU time and memory of a decoded response in each response format: "models", "raw" and "slots".
+
+The time covers decoding the JSON body and constructing what the client returns. The memory is what `--keep`
+decoded responses retain, per response, as traced by tracemalloc. The payloads are a chat response with a text
+answer, one with `--parts` multimodal content parts, and a stream chunk.
+
+    python benchmarks/response_format.py --number 2000 --keep 1000
+"""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+import typing
+
+from reka.core import ResponseFormat
+from reka.core.response_format import decode_response
+from reka.types import ChatResponse, ChunkChatResponse
+
+FORMATS: typing.List[ResponseFormat] = ["models", "raw", "slots"]
+USAGE = {"input_tokens": 42, "output_tokens": 17}
+
+
+def _response(content: typing.Any) -> typing.Dict[str, typing.Any]:
+    return {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": USAGE,
+    }
+
+
+def payloads(parts: int) -> typing.Dict[str, typing.Tuple[typing.Any, bytes]]:
+    content = [
+        {"type": "text", "text": f"Part {i}"} if i % 2 else {"type": "image_url", "image_url": f"https://x/{i}.png"}
+        for i in range(parts)
+    ]
+    chunk = {
+        "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+        "model": "reka-core-20240501",
+        "responses": [{"chunk": {"role": "assistant", "content": " the"}, "finish_reason": None}],
+        "usage": USAGE,
+    }
+    return {
+        "text": (ChatResponse, json.dumps(_response("The fifth prime number is 11.")).encode()),
+        "multimodal": (ChatResponse, json.dumps(_response(content)).encode()),
+        "chunk": (ChunkChatResponse, json.dumps(chunk).encode()),
+    }
+
+
+def _retained(type_: typing.Any, body: bytes, response_format: ResponseFormat, keep: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    responses = [decode_response(type_, json.loads(body), response_format) for _ in range(keep)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del responses
+    return retained / keep
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--keep", type=int, default=1000, help="Responses kept alive to measure their memory.")
+    parser.add_argument("--parts", type=int, default=16, help="Content parts of the multimodal response.")
+    args = parser.parse_args()
+
+    for name, (type_, body) in payloads(args.parts).items():
+        for response_format in FORMATS:
+            seconds = min(
+                timeit.repeat(
+                    lambda: decode_response(type_, json.loads(body), response_format), number=args.number, repeat=5
+                )
+            )
+            retained = _retained(type_, body, response_format, args.keep)
+            print(
+                f"{name:>10}  {response_format:>6}  {seconds / args.number * 1e6:8.2f} us"
+                f"  {retained / 1024:7.2f} KiB per response"
+            )
+
+
+if __name__ == "__main__":
+    main()
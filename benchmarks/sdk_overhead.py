@@ -0,0 +1,279 @@
+"""
+Measures the CPU time the SDK adds to each call, against an `httpx.MockTransport` serving canned chat, SSE and
+models payloads, so that no time is spent on the network.
+
+The "cpu_us" results are the CPU microseconds of:
+
+- encode: turning a chat request of `--history` messages into its JSON body, as `chat.create` does;
+- decode: turning the JSON of a chat response of `--tokens` tokens, of one stream chunk and of the model list into
+  the typed responses;
+- `Reka.*` and `AsyncReka.*`: whole calls of `chat.create`, `chat.create_stream` with `--chunks` chunks, per chunk,
+  and `models.get`;
+- `httpx.*`: the same requests sent with the httpx client alone.
+
+The "sdk_overhead_us" results are the calls minus their httpx counterparts, i.e. what the SDK adds per call, or per
+chunk of a stream. `--output` writes the results as JSON, `--compare` shows how they changed since an earlier run,
+and `--budget NAME=US` exits with status 1 when the overhead of a call exceeds its budget.
+
+    python benchmarks/sdk_overhead.py --output before.json
+    python benchmarks/sdk_overhead.py --compare before.json --budget Reka.chat.create=400
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import typing
+
+import httpx
+import pydantic
+
+import reka
+from reka import ChatMessage, ChatResponse, ChunkChatResponse, Model
+from reka.client import AsyncReka, Reka
+from reka.core.request_encoder import encode_request
+from reka.core.response_format import decode_response
+
+BASE_URL = "https://api.reka.ai/v1"
+
+
+class Payloads:
+    """
+    The canned request and responses.
+    """
+
+    def __init__(self, *, history: int, tokens: int, chunks: int):
+        self.messages = [
+            ChatMessage(role="user" if i % 2 == 0 else "assistant", content=f"Message {i} of the conversation.")
+            for i in range(history)
+        ]
+        self.chat = json.dumps(
+            {
+                "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+                "model": "reka-core-20240501",
+                "responses": [{"message": {"role": "assistant", "content": "word " * tokens}, "finish_reason": "stop"}],
+                "usage": {"input_tokens": 42, "output_tokens": tokens},
+            }
+        ).encode()
+        self.chunk = json.dumps(
+            {
+                "id": "6f4b2e1c-3d6a-4d8e-9a51-8b2f1c0e7d3a",
+                "model": "reka-core-20240501",
+                "responses": [{"chunk": {"role": "assistant", "content": " the"}, "finish_reason": None}],
+                "usage": {"input_tokens": 42, "output_tokens": 17},
+            }
+        ).encode()
+        self.chunks = chunks
+        self.stream = b"".join(b"data: " + self.chunk + b"\n\n" for _ in range(chunks))
+        self.models = json.dumps([{"id": "reka-core"}, {"id": "reka-flash"}, {"id": "reka-edge"}]).encode()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, content=self.models)
+        if json.loads(request.read()).get("stream"):
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=self.stream)
+        return httpx.Response(200, content=self.chat)
+
+
+def _cpu_us(case: typing.Callable[[], typing.Any], number: int, repeat: int) -> float:
+    """
+    Returns the fewest CPU microseconds a call of `case` took, over `repeat` runs of `number` calls.
+    """
+    runs = []
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(number):
+            case()
+        runs.append(time.process_time() - started)
+    return min(runs) / number * 1e6
+
+
+async def _async_cpu_us(case: typing.Callable[[], typing.Awaitable[typing.Any]], number: int, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(number):
+            await case()
+        runs.append(time.process_time() - started)
+    return min(runs) / number * 1e6
+
+
+def measure_codec(payloads: Payloads, number: int, repeat: int) -> typing.Dict[str, float]:
+    body = {"messages": payloads.messages, "model": "reka-core", "stream": False}
+    return {
+        "encode.chat_request": _cpu_us(lambda: json.dumps(encode_request(body)).encode(), number, repeat),
+        "decode.chat_response": _cpu_us(
+            lambda: decode_response(ChatResponse, json.loads(payloads.chat), "models"), number, repeat
+        ),
+        "decode.stream_chunk": _cpu_us(
+            lambda: decode_response(ChunkChatResponse, json.loads(payloads.chunk), "models"), number, repeat
+        ),
+        "decode.models": _cpu_us(
+            lambda: decode_response(typing.List[Model], json.loads(payloads.models), "models"), number, repeat
+        ),
+    }
+
+
+def measure_sync(payloads: Payloads, number: int, repeat: int) -> typing.Dict[str, float]:
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(payloads.handle)))
+    httpx_client = httpx.Client(transport=httpx.MockTransport(payloads.handle))
+    body = json.dumps(encode_request({"messages": payloads.messages, "model": "reka-core", "stream": False}))
+    stream_body = json.dumps(encode_request({"messages": payloads.messages, "model": "reka-core", "stream": True}))
+
+    def httpx_stream() -> None:
+        with httpx_client.stream("POST", f"{BASE_URL}/chat", content=stream_body) as response:
+            for _ in response.iter_bytes():
+                pass
+
+    return {
+        "Reka.chat.create": _cpu_us(
+            lambda: client.chat.create(messages=payloads.messages, model="reka-core"), number, repeat
+        ),
+        "Reka.chat.create_stream.per_chunk": _cpu_us(
+            lambda: list(client.chat.create_stream(messages=payloads.messages, model="reka-core")), number, repeat
+        )
+        / payloads.chunks,
+        "Reka.models.get": _cpu_us(client.models.get, number, repeat),
+        "httpx.chat.create": _cpu_us(
+            lambda: httpx_client.post(f"{BASE_URL}/chat", content=body).content, number, repeat
+        ),
+        "httpx.chat.create_stream.per_chunk": _cpu_us(httpx_stream, number, repeat) / payloads.chunks,
+        "httpx.models.get": _cpu_us(lambda: httpx_client.get(f"{BASE_URL}/models").content, number, repeat),
+    }
+
+
+async def measure_async(payloads: Payloads, number: int, repeat: int) -> typing.Dict[str, float]:
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(payloads.handle)))
+    httpx_client = httpx.AsyncClient(transport=httpx.MockTransport(payloads.handle))
+    body = json.dumps(encode_request({"messages": payloads.messages, "model": "reka-core", "stream": False}))
+    stream_body = json.dumps(encode_request({"messages": payloads.messages, "model": "reka-core", "stream": True}))
+
+    async def create_stream() -> None:
+        async for _ in client.chat.create_stream(messages=payloads.messages, model="reka-core"):
+            pass
+
+    async def httpx_post() -> None:
+        await (await httpx_client.post(f"{BASE_URL}/chat", content=body)).aread()
+
+    async def httpx_stream() -> None:
+        async with httpx_client.stream("POST", f"{BASE_URL}/chat", content=stream_body) as response:
+            async for _ in response.aiter_bytes():
+                pass
+
+    async def httpx_get() -> None:
+        await (await httpx_client.get(f"{BASE_URL}/models")).aread()
+
+    return {
+        "AsyncReka.chat.create": await _async_cpu_us(
+            lambda: client.chat.create(messages=payloads.messages, model="reka-core"), number, repeat
+        ),
+        "AsyncReka.chat.create_stream.per_chunk": await _async_cpu_us(create_stream, number, repeat) / payloads.chunks,
+        "AsyncReka.models.get": await _async_cpu_us(client.models.get, number, repeat),
+        "httpx.async.chat.create": await _async_cpu_us(httpx_post, number, repeat),
+        "httpx.async.chat.create_stream.per_chunk": await _async_cpu_us(httpx_stream, number, repeat) / payloads.chunks,
+        "httpx.async.models.get": await _async_cpu_us(httpx_get, number, repeat),
+    }
+
+
+def sdk_overhead(cpu_us: typing.Dict[str, float]) -> typing.Dict[str, float]:
+    """
+    Returns the CPU microseconds each call of the clients takes beyond the same request sent with httpx alone.
+    """
+    baselines = {"Reka": "httpx", "AsyncReka": "httpx.async"}
+    overhead = {}
+    for name, us in cpu_us.items():
+        client, _, call = name.partition(".")
+        if client in baselines:
+            overhead[name] = us - cpu_us[f"{baselines[client]}.{call}"]
+    return overhead
+
+
+def _commit() -> typing.Optional[str]:
+    try:
+        process = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def _parse_budget(value: str) -> typing.Tuple[str, float]:
+    name, separator, us = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected NAME=US, got {value!r}")
+    return name, float(us)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="writes the results to this JSON file")
+    parser.add_argument("--compare", help="a JSON file written by an earlier run")
+    parser.add_argument("--budget", type=_parse_budget, action="append", default=[], metavar="NAME=US")
+    args = parser.parse_args()
+
+    payloads = Payloads(history=args.history, tokens=args.tokens, chunks=args.chunks)
+    cpu_us = {
+        **measure_codec(payloads, args.number, args.repeat),
+        **measure_sync(payloads, args.number, args.repeat),
+        **asyncio.run(measure_async(payloads, args.number, args.repeat)),
+    }
+    results: typing.Dict[str, typing.Any] = {
+        "metadata": {
+            "commit": _commit(),
+            "reka": reka.__version__,
+            "python": platform.python_version(),
+            "httpx": httpx.__version__,
+            "pydantic": pydantic.VERSION,
+            "platform": platform.platform(),
+            "timer": "time.process_time",
+            "parameters": {
+                "history": args.history,
+                "tokens": args.tokens,
+                "chunks": args.chunks,
+                "number": args.number,
+                "repeat": args.repeat,
+            },
+        },
+        "cpu_us": cpu_us,
+        "sdk_overhead_us": sdk_overhead(cpu_us),
+    }
+    unknown = [name for name, _ in args.budget if name not in results["sdk_overhead_us"]]
+    if unknown:
+        parser.error(f"no overhead is measured for {', '.join(unknown)}, see the sdk_overhead_us results")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    baseline: typing.Dict[str, typing.Any] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    for section in ("cpu_us", "sdk_overhead_us"):
+        print(f"{section}:")
+        for name, us in results[section].items():
+            line = f"{name:>42}  {us:9.2f} us"
+            before = baseline.get(section, {}).get(name)
+            if before:
+                line += f"  was {before:9.2f} us  {(us - before) / before:+7.1%}"
+            print(line)
+
+    over_budget = [
+        f"{name}: {results['sdk_overhead_us'][name]:.2f} us > {us:.2f} us"
+        for name, us in args.budget
+        if results["sdk_overhead_us"][name] > us
+    ]
+    if over_budget:
+        print("Over budget:", *over_budget, sep="\n  ", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,91 @@
 # This file was auto-generated by Fern from our API Definition.
 
-from .types import (
-    ChatMessage,
-    ChatMessageChunk,
-    ChatMessageChunkContentItem,
-    ChatMessageInputContentItem,
-    ChatMessageOutputContentItem,
-    ChatResponse,
-    ChatRole,
-    ChunkChatResponse,
-    ChunkMessageResponse,
-    Content,
-    FinishReason,
-    HttpValidationError,
-    MediaType,
-    MessageResponse,
-    Model,
-    Tool,
-    ToolCall,
-    ToolChoice,
-    ToolOutput,
-    TypedMediaContent,
-    TypedText,
-    Usage,
-    ValidationError,
-    ValidationErrorLocItem,
-)
-from .errors import UnprocessableEntityError
-from . import chat, models
-from .environment import RekaEnvironment
-from .version import __version__
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import chat, models, v2
+    from .environment import RekaEnvironment
+    from .errors import UnprocessableEntityError
+    from .types import (
+        ChatMessage,
+        ChatMessageChunk,
+        ChatMessageChunkContentItem,
+        ChatMessageInputContentItem,
+        ChatMessageOutputContentItem,
+        ChatResponse,
+        ChatRole,
+        ChunkChatResponse,
+        ChunkMessageResponse,
+        Content,
+        FinishReason,
+        HttpValidationError,
+        MediaType,
+        MessageResponse,
+        Model,
+        Tool,
+        ToolCall,
+        ToolChoice,
+        ToolOutput,
+        TypedMediaContent,
+        TypedText,
+        Usage,
+        ValidationError,
+        ValidationErrorLocItem,
+    )
+    from .version import __version__
+
+# The module each attribute is imported from on first access (PEP 562), so that `import reka` loads neither httpx
+# nor pydantic. Subpackages map to themselves.
+_LAZY_ATTRIBUTES = {
+    "ChatMessage": ".types",
+    "ChatMessageChunk": ".types",
+    "ChatMessageChunkContentItem": ".types",
+    "ChatMessageInputContentItem": ".types",
+    "ChatMessageOutputContentItem": ".types",
+    "ChatResponse": ".types",
+    "ChatRole": ".types",
+    "ChunkChatResponse": ".types",
+    "ChunkMessageResponse": ".types",
+    "Content": ".types",
+    "FinishReason": ".types",
+    "HttpValidationError": ".types",
+    "MediaType": ".types",
+    "MessageResponse": ".types",
+    "Model": ".types",
+    "RekaEnvironment": ".environment",
+    "Tool": ".types",
+    "ToolCall": ".types",
+    "ToolChoice": ".types",
+    "ToolOutput": ".types",
+    "TypedMediaContent": ".types",
+    "TypedText": ".types",
+    "UnprocessableEntityError": ".errors",
+    "Usage": ".types",
+    "ValidationError": ".types",
+    "ValidationErrorLocItem": ".types",
+    "__version__": ".version",
+    "chat": ".chat",
+    "models": ".models",
+    "v2": ".v2",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if module_name == f".{name}" else getattr(module, name)
+    # Later accesses find the attribute without going through `__getattr__`.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
 
 __all__ = [
     "ChatMessage",
@@ -1,8 +1,6 @@
 # This file was auto-generated by Fern from our API Definition.
 
-import json
 import typing
-import urllib.parse
 from json.decoder import JSONDecodeError
 
 import httpx_sse
@@ -10,9 +8,10 @@ import httpx_sse
 from ..core.api_error import ApiError
 from ..core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
 from ..core.jsonable_encoder import jsonable_encoder
-from ..core.query_encoder import encode_query
 from ..core.remove_none_from_dict import remove_none_from_dict
-from ..core.request_options import RequestOptions
+from ..core.request_encoder import encode_request
+from ..core.request_options import RawRequestOptions, RequestOptions, SlotsRequestOptions
+from ..core.response_format import ResponseView, decode_response, get_response_format
 from ..core.unchecked_base_model import construct_type
 from ..errors.unprocessable_entity_error import UnprocessableEntityError
 from ..types.chat_message import ChatMessage
@@ -30,6 +29,66 @@ class ChatClient:
     def __init__(self, *, client_wrapper: SyncClientWrapper):
         self._client_wrapper = client_wrapper
 
+    @typing.overload
+    def create_stream(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: RawRequestOptions,
+    ) -> typing.Iterator[typing.Dict[str, typing.Any]]: ...
+
+    @typing.overload
+    def create_stream(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: SlotsRequestOptions,
+    ) -> typing.Iterator[ResponseView]: ...
+
+    @typing.overload
+    def create_stream(
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Iterator[ChunkChatResponse]: ...
+
     def create_stream(
         self,
         *,
@@ -47,7 +106,9 @@ class ChatClient:
         top_p: typing.Optional[float] = OMIT,
         use_search_engine: typing.Optional[bool] = OMIT,
         request_options: typing.Optional[RequestOptions] = None,
-    ) -> typing.Iterator[ChunkChatResponse]:
+    ) -> typing.Union[
+        typing.Iterator[ChunkChatResponse], typing.Iterator[typing.Dict[str, typing.Any]], typing.Iterator[ResponseView]
+    ]:
         """
         Parameters
         ----------
@@ -165,38 +226,33 @@ class ChatClient:
             _request["top_p"] = top_p
         if use_search_engine is not OMIT:
             _request["use_search_engine"] = use_search_engine
+        _response_format = get_response_format(self._client_wrapper.response_format, request_options)
+        _envelope = self._client_wrapper.get_request_envelope("chat")
         with self._client_wrapper.httpx_client.stream(
             method="POST",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "chat"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            json=jsonable_encoder(_request)
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            json=encode_request(_request)
             if request_options is None or request_options.get("additional_body_parameters") is None
             else {
-                **jsonable_encoder(_request),
+                **encode_request(_request),
                 **(jsonable_encoder(remove_none_from_dict(request_options.get("additional_body_parameters", {})))),
             },
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
+            encode_body=True,
         ) as _response:
             if 200 <= _response.status_code < 300:
                 _event_source = httpx_sse.EventSource(_response)
                 for _sse in _event_source.iter_sse():
-                    yield typing.cast(ChunkChatResponse, construct_type(type_=ChunkChatResponse, object_=json.loads(_sse.data)))  # type: ignore
+                    yield typing.cast(
+                        ChunkChatResponse,
+                        decode_response(
+                            ChunkChatResponse, self._client_wrapper.json_codec.loads(_sse.data), _response_format
+                        ),
+                    )
                 return
             _response.read()
             if _response.status_code == 422:
@@ -209,6 +265,47 @@ class ChatClient:
                 raise ApiError(status_code=_response.status_code, body=_response.text)
             raise ApiError(status_code=_response.status_code, body=_response_json)
 
+    @typing.overload
+    def create(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: RawRequestOptions,
+    ) -> typing.Dict[str, typing.Any]: ...
+
+    @typing.overload
+    def create(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: SlotsRequestOptions,
+    ) -> ResponseView: ...
+
+    @typing.overload
     def create(
         self,
         *,
@@ -226,7 +323,26 @@ class ChatClient:
         top_p: typing.Optional[float] = OMIT,
         use_search_engine: typing.Optional[bool] = OMIT,
         request_options: typing.Optional[RequestOptions] = None,
-    ) -> ChatResponse:
+    ) -> ChatResponse: ...
+
+    def create(
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Union[ChatResponse, typing.Dict[str, typing.Any], ResponseView]:
         """
         Parameters
         ----------
@@ -275,6 +391,7 @@ class ChatClient:
         Returns
         -------
         ChatResponse
+            A dict with the "raw" response format, or a ResponseView with the "slots" one.
 
 
         Examples
@@ -318,36 +435,72 @@ class ChatClient:
             _request["top_p"] = top_p
         if use_search_engine is not OMIT:
             _request["use_search_engine"] = use_search_engine
+        _response_format = get_response_format(self._client_wrapper.response_format, request_options)
+        # Encoded once, for the cache and coalescer keys as well as the request body.
+        _body = encode_request(_request)
+        _cache = self._client_wrapper.response_cache
+        _cache_key = None
+        if _cache is not None and (seed not in (OMIT, None) or temperature == 0):
+            # Only the request itself identifies the response, per-call options like timeouts and retries do not.
+            # The api key is part of the hashed key, so that clients sharing a cache never see each other's responses.
+            _options: RequestOptions = request_options if request_options is not None else {}
+            _cache_key = _cache.key(
+                "chat",
+                self._client_wrapper.get_base_url(),
+                self._client_wrapper.api_key,
+                _body,
+                jsonable_encoder(_options.get("additional_body_parameters")),
+                jsonable_encoder(_options.get("additional_query_parameters")),
+            )
+            _cached = _cache.get(_cache_key)
+            if _cached is not None:
+                return typing.cast(
+                    ChatResponse,
+                    decode_response(ChatResponse, self._client_wrapper.json_codec.loads(_cached), _response_format),
+                )
+        _coalescer = self._client_wrapper.request_coalescer
+        if _coalescer is None:
+            return self._create(_body, request_options, _cache_key)
+        return _coalescer.do(
+            _coalescer.key("chat", _body, jsonable_encoder(request_options)),
+            lambda: self._create(_body, request_options, _cache_key),
+        )
+
+    def _create(
+        self,
+        _body: typing.Dict[str, typing.Any],
+        request_options: typing.Optional[RequestOptions],
+        cache_key: typing.Optional[str] = None,
+    ) -> ChatResponse:
+        _envelope = self._client_wrapper.get_request_envelope("chat")
         _response = self._client_wrapper.httpx_client.request(
             method="POST",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "chat"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            json=jsonable_encoder(_request)
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            json=_body
             if request_options is None or request_options.get("additional_body_parameters") is None
             else {
-                **jsonable_encoder(_request),
+                **_body,
                 **(jsonable_encoder(remove_none_from_dict(request_options.get("additional_body_parameters", {})))),
             },
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
+            hedge=True,
+            encode_body=True,
         )
         if 200 <= _response.status_code < 300:
-            return typing.cast(ChatResponse, construct_type(type_=ChatResponse, object_=_response.json()))  # type: ignore
+            if cache_key is not None and self._client_wrapper.response_cache is not None:
+                self._client_wrapper.response_cache.set(cache_key, _response.content)
+            return typing.cast(
+                ChatResponse,
+                decode_response(
+                    ChatResponse,
+                    self._client_wrapper.json_codec.loads(_response.content),
+                    get_response_format(self._client_wrapper.response_format, request_options),
+                ),
+            )
         if _response.status_code == 422:
             raise UnprocessableEntityError(
                 typing.cast(HttpValidationError, construct_type(type_=HttpValidationError, object_=_response.json()))  # type: ignore
@@ -363,6 +516,66 @@ class AsyncChatClient:
     def __init__(self, *, client_wrapper: AsyncClientWrapper):
         self._client_wrapper = client_wrapper
 
+    @typing.overload
+    def create_stream(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: RawRequestOptions,
+    ) -> typing.AsyncIterator[typing.Dict[str, typing.Any]]: ...
+
+    @typing.overload
+    def create_stream(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: SlotsRequestOptions,
+    ) -> typing.AsyncIterator[ResponseView]: ...
+
+    @typing.overload
+    def create_stream(
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.AsyncIterator[ChunkChatResponse]: ...
+
     async def create_stream(
         self,
         *,
@@ -380,7 +593,11 @@ class AsyncChatClient:
         top_p: typing.Optional[float] = OMIT,
         use_search_engine: typing.Optional[bool] = OMIT,
         request_options: typing.Optional[RequestOptions] = None,
-    ) -> typing.AsyncIterator[ChunkChatResponse]:
+    ) -> typing.Union[
+        typing.AsyncIterator[ChunkChatResponse],
+        typing.AsyncIterator[typing.Dict[str, typing.Any]],
+        typing.AsyncIterator[ResponseView],
+    ]:
         """
         Parameters
         ----------
@@ -498,38 +715,33 @@ class AsyncChatClient:
             _request["top_p"] = top_p
         if use_search_engine is not OMIT:
             _request["use_search_engine"] = use_search_engine
+        _response_format = get_response_format(self._client_wrapper.response_format, request_options)
+        _envelope = self._client_wrapper.get_request_envelope("chat")
         async with self._client_wrapper.httpx_client.stream(
             method="POST",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "chat"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            json=jsonable_encoder(_request)
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            json=encode_request(_request)
             if request_options is None or request_options.get("additional_body_parameters") is None
             else {
-                **jsonable_encoder(_request),
+                **encode_request(_request),
                 **(jsonable_encoder(remove_none_from_dict(request_options.get("additional_body_parameters", {})))),
             },
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
+            encode_body=True,
         ) as _response:
             if 200 <= _response.status_code < 300:
                 _event_source = httpx_sse.EventSource(_response)
                 async for _sse in _event_source.aiter_sse():
-                    yield typing.cast(ChunkChatResponse, construct_type(type_=ChunkChatResponse, object_=json.loads(_sse.data)))  # type: ignore
+                    yield typing.cast(
+                        ChunkChatResponse,
+                        decode_response(
+                            ChunkChatResponse, self._client_wrapper.json_codec.loads(_sse.data), _response_format
+                        ),
+                    )
                 return
             await _response.aread()
             if _response.status_code == 422:
@@ -542,6 +754,47 @@ class AsyncChatClient:
                 raise ApiError(status_code=_response.status_code, body=_response.text)
             raise ApiError(status_code=_response.status_code, body=_response_json)
 
+    @typing.overload
+    async def create(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: RawRequestOptions,
+    ) -> typing.Dict[str, typing.Any]: ...
+
+    @typing.overload
+    async def create(  # type: ignore[overload-overlap]
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: SlotsRequestOptions,
+    ) -> ResponseView: ...
+
+    @typing.overload
     async def create(
         self,
         *,
@@ -559,7 +812,26 @@ class AsyncChatClient:
         top_p: typing.Optional[float] = OMIT,
         use_search_engine: typing.Optional[bool] = OMIT,
         request_options: typing.Optional[RequestOptions] = None,
-    ) -> ChatResponse:
+    ) -> ChatResponse: ...
+
+    async def create(
+        self,
+        *,
+        messages: typing.Sequence[ChatMessage],
+        model: str,
+        frequency_penalty: typing.Optional[float] = OMIT,
+        max_tokens: typing.Optional[int] = OMIT,
+        presence_penalty: typing.Optional[float] = OMIT,
+        seed: typing.Optional[int] = OMIT,
+        stop: typing.Optional[typing.Sequence[str]] = OMIT,
+        temperature: typing.Optional[float] = OMIT,
+        tool_choice: typing.Optional[ToolChoice] = OMIT,
+        tools: typing.Optional[typing.Sequence[Tool]] = OMIT,
+        top_k: typing.Optional[int] = OMIT,
+        top_p: typing.Optional[float] = OMIT,
+        use_search_engine: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Union[ChatResponse, typing.Dict[str, typing.Any], ResponseView]:
         """
         Parameters
         ----------
@@ -608,6 +880,7 @@ class AsyncChatClient:
         Returns
         -------
         ChatResponse
+            A dict with the "raw" response format, or a ResponseView with the "slots" one.
 
 
         Examples
@@ -651,36 +924,72 @@ class AsyncChatClient:
             _request["top_p"] = top_p
         if use_search_engine is not OMIT:
             _request["use_search_engine"] = use_search_engine
+        _response_format = get_response_format(self._client_wrapper.response_format, request_options)
+        # Encoded once, for the cache and coalescer keys as well as the request body.
+        _body = encode_request(_request)
+        _cache = self._client_wrapper.response_cache
+        _cache_key = None
+        if _cache is not None and (seed not in (OMIT, None) or temperature == 0):
+            # Only the request itself identifies the response, per-call options like timeouts and retries do not.
+            # The api key is part of the hashed key, so that clients sharing a cache never see each other's responses.
+            _options: RequestOptions = request_options if request_options is not None else {}
+            _cache_key = _cache.key(
+                "chat",
+                self._client_wrapper.get_base_url(),
+                self._client_wrapper.api_key,
+                _body,
+                jsonable_encoder(_options.get("additional_body_parameters")),
+                jsonable_encoder(_options.get("additional_query_parameters")),
+            )
+            _cached = await _cache.get_async(_cache_key)
+            if _cached is not None:
+                return typing.cast(
+                    ChatResponse,
+                    decode_response(ChatResponse, self._client_wrapper.json_codec.loads(_cached), _response_format),
+                )
+        _coalescer = self._client_wrapper.request_coalescer
+        if _coalescer is None:
+            return await self._create(_body, request_options, _cache_key)
+        return await _coalescer.do_async(
+            _coalescer.key("chat", _body, jsonable_encoder(request_options)),
+            lambda: self._create(_body, request_options, _cache_key),
+        )
+
+    async def _create(
+        self,
+        _body: typing.Dict[str, typing.Any],
+        request_options: typing.Optional[RequestOptions],
+        cache_key: typing.Optional[str] = None,
+    ) -> ChatResponse:
+        _envelope = self._client_wrapper.get_request_envelope("chat")
         _response = await self._client_wrapper.httpx_client.request(
             method="POST",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "chat"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            json=jsonable_encoder(_request)
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            json=_body
             if request_options is None or request_options.get("additional_body_parameters") is None
             else {
-                **jsonable_encoder(_request),
+                **_body,
                 **(jsonable_encoder(remove_none_from_dict(request_options.get("additional_body_parameters", {})))),
             },
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
+            hedge=True,
+            encode_body=True,
         )
         if 200 <= _response.status_code < 300:
-            return typing.cast(ChatResponse, construct_type(type_=ChatResponse, object_=_response.json()))  # type: ignore
+            if cache_key is not None and self._client_wrapper.response_cache is not None:
+                await self._client_wrapper.response_cache.set_async(cache_key, _response.content)
+            return typing.cast(
+                ChatResponse,
+                decode_response(
+                    ChatResponse,
+                    self._client_wrapper.json_codec.loads(_response.content),
+                    get_response_format(self._client_wrapper.response_format, request_options),
+                ),
+            )
         if _response.status_code == 422:
             raise UnprocessableEntityError(
                 typing.cast(HttpValidationError, construct_type(type_=HttpValidationError, object_=_response.json()))  # type: ignore
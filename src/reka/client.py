@@ -8,9 +8,29 @@ import httpx
 from .chat.client import AsyncChatClient, ChatClient
 from .core.api_error import ApiError
 from .core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
+from .core.circuit_breaker import CircuitBreaker
+from .core.concurrency_limiter import GradientConcurrencyLimiter
+from .core.hedging import HedgingPolicy
+from .core.json_codec import JSONCodec
+from .core.load_balancer import LoadBalancer
+from .core.rate_limiter import AdaptiveRateLimiter
+from .core.request_coalescer import RequestCoalescer
+from .core.request_compression import RequestCompression
+from .core.response_cache import ResponseCache
+from .core.response_format import ResponseFormat
+from .core.retry_budget import RetryBudget
+from .core.streaming_request_body import StreamingRequestBody
+from .core.ttl_cache import TTLCache
 from .environment import RekaEnvironment
 from .models.client import AsyncModelsClient, ModelsClient
 
+# Same as the httpx defaults.
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+# Comfortably inside DEFAULT_KEEPALIVE_EXPIRY, so that pooled connections never sit idle long enough to expire.
+DEFAULT_KEEPALIVE_INTERVAL = 4.0
+
 
 class Reka:
     """
@@ -37,9 +57,57 @@ class Reka:
     follow_redirects : typing.Optional[bool]
         Whether the default httpx client follows redirects or not, this is irrelevant if a custom httpx client is passed in.
 
+    http2 : bool
+        Whether the default httpx client negotiates HTTP/2, multiplexing concurrent requests over a single connection. Requires the `h2` package (`pip install httpx[http2]`). This is irrelevant if a custom httpx client is passed in.
+
+    max_connections : typing.Optional[int]
+        The maximum number of concurrent connections the default httpx client opens, defaults to 100. This is irrelevant if a custom httpx client is passed in.
+
+    max_keepalive_connections : typing.Optional[int]
+        The maximum number of idle connections the default httpx client keeps in its pool, defaults to 20. This is irrelevant if a custom httpx client is passed in.
+
+    keepalive_expiry : typing.Optional[float]
+        The number of seconds an idle pooled connection is kept open by the default httpx client, defaults to 5 seconds. This is irrelevant if a custom httpx client is passed in.
+
     httpx_client : typing.Optional[httpx.Client]
         The httpx client to use for making requests, a preconfigured client is used by default, however this is useful should you want to pass in any custom httpx configuration.
 
+    retry_budget : typing.Optional[RetryBudget]
+        A retry budget shared by every call made through this client, bounding retries to a fraction of recent requests so that an API outage does not turn into a retry storm. By default each call retries independently, up to its max_retries.
+
+    rate_limiter : typing.Optional[AdaptiveRateLimiter]
+        A rate limiter shared by every call made through this client. It lowers the request rate when the API responds with 429, pauses all calls for the duration of a retry-after header, and ramps back up afterwards. Share one instance between clients to limit them together.
+
+    hedging_policy : typing.Optional[HedgingPolicy]
+        Hedges chat.create calls: once a call has been outstanding for longer than the policy's delay (by default the observed p95 latency), a second copy is sent and whichever answers first is used. Both copies are sent from the policy's thread pool, and calls are sent from the calling thread without hedging while it is full. Hedges are limited to a fraction of calls by the policy's budget. Streaming calls are never hedged.
+
+    circuit_breaker : typing.Optional[CircuitBreaker]
+        Tracks failures per API endpoint and per model. Once a circuit opens, calls routed through it raise CircuitOpenError immediately instead of waiting out their timeout, until a probe request succeeds again. Its states() can back a health check.
+
+    load_balancer : typing.Optional[LoadBalancer]
+        Spreads calls over several API endpoints, sending each attempt to the endpoint with the fewest requests in flight or the lowest latency. Endpoints that keep failing are ejected and probed again later. Requests are built against base_url, which defaults to the balancer's first endpoint.
+
+    request_coalescer : typing.Optional[RequestCoalescer]
+        Coalesces identical chat.create calls that are in flight at the same time, so that they share one HTTP request and one parsed ChatResponse. Calls are identical when their encoded request bodies and request options are.
+
+    response_cache : typing.Optional[ResponseCache]
+        Caches the responses of deterministic chat.create calls, i.e. calls with a seed or with temperature=0. The key is a hash of the request body, the base URL and the API key, so per-call options such as timeouts and retries do not affect it. Use InMemoryResponseCache, or SQLiteResponseCache to share the cache between processes.
+
+    models_cache : typing.Optional[TTLCache]
+        Caches the result of models.get for the cache's ttl, after which it is still returned while a background request refreshes it. Call models.invalidate() to drop it early.
+
+    request_compression : typing.Optional[RequestCompression]
+        Compresses the JSON bodies of chat.create and chat.create_stream calls once they exceed the policy's threshold, e.g. requests with inline base64 media. Only use this with an API endpoint that accepts compressed requests.
+
+    streaming_request_body : typing.Optional[StreamingRequestBody]
+        Streams the JSON bodies of chat.create and chat.create_stream calls in chunks as they are sent, rather than encoding them in memory first. Required to send MediaFile inline media.
+
+    json_codec : typing.Optional[JSONCodec]
+        The JSON library used to decode responses and stream chunks and to encode request bodies, e.g. JSONCodec() to use orjson or msgspec when installed. Defaults to the standard library.
+
+    response_format : ResponseFormat
+        What chat.create, chat.create_stream and models.get return. "models", the default, returns the typed models. "raw" returns the decoded JSON, and "slots" returns read-only ResponseViews with the fields of the models as attributes. Both skip constructing the models. A call can override it with request_options={"response_format": ...}. Type checkers only see the format of a call's request_options, and otherwise assume the typed models.
+
     Examples
     --------
     from reka.client import Reka
@@ -57,24 +125,118 @@ class Reka:
         api_key: typing.Optional[str] = os.getenv("REKA_API_KEY"),
         timeout: typing.Optional[float] = None,
         follow_redirects: typing.Optional[bool] = True,
-        httpx_client: typing.Optional[httpx.Client] = None
+        http2: bool = False,
+        max_connections: typing.Optional[int] = None,
+        max_keepalive_connections: typing.Optional[int] = None,
+        keepalive_expiry: typing.Optional[float] = None,
+        httpx_client: typing.Optional[httpx.Client] = None,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_coalescer: typing.Optional[RequestCoalescer] = None,
+        response_cache: typing.Optional[ResponseCache] = None,
+        models_cache: typing.Optional[TTLCache] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+        response_format: ResponseFormat = "models"
     ):
         _defaulted_timeout = timeout if timeout is not None else 300 if httpx_client is None else None
         if api_key is None:
             raise ApiError(body="The client must be instantiated be either passing in api_key or setting REKA_API_KEY")
+        if base_url is None and load_balancer is not None:
+            base_url = load_balancer.base_urls[0]
+        _limits = _get_limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
         self._client_wrapper = SyncClientWrapper(
             base_url=_get_base_url(base_url=base_url, environment=environment),
             api_key=api_key,
             httpx_client=httpx_client
             if httpx_client is not None
-            else httpx.Client(timeout=_defaulted_timeout, follow_redirects=follow_redirects)
+            else httpx.Client(
+                timeout=_defaulted_timeout, follow_redirects=follow_redirects, http2=http2, limits=_limits
+            )
             if follow_redirects is not None
-            else httpx.Client(timeout=_defaulted_timeout),
+            else httpx.Client(timeout=_defaulted_timeout, http2=http2, limits=_limits),
             timeout=_defaulted_timeout,
+            retry_budget=retry_budget,
+            rate_limiter=rate_limiter,
+            hedging_policy=hedging_policy,
+            circuit_breaker=circuit_breaker,
+            load_balancer=load_balancer,
+            request_coalescer=request_coalescer,
+            response_cache=response_cache,
+            models_cache=models_cache,
+            request_compression=request_compression,
+            streaming_request_body=streaming_request_body,
+            json_codec=json_codec,
+            response_format=response_format,
         )
         self.chat = ChatClient(client_wrapper=self._client_wrapper)
         self.models = ModelsClient(client_wrapper=self._client_wrapper)
 
+    def warmup(self, n_connections: int = 1) -> int:
+        """
+        Opens pooled connections ahead of traffic, so that the first calls after startup or an idle period do not pay
+        for the TCP and TLS handshakes.
+
+        Parameters
+        ----------
+        n_connections : int
+            The number of connections to open, per endpoint if the client has a load_balancer. Connections beyond
+            the pool's max_keepalive_connections are closed again once the warmup requests complete.
+
+        Returns
+        -------
+        int
+            The number of warmup requests that succeeded.
+
+        Examples
+        --------
+        from reka.client import Reka
+
+        client = Reka(
+            api_key="YOUR_API_KEY",
+        )
+        client.warmup(n_connections=8)
+        """
+        return self._client_wrapper.httpx_client.warmup(
+            url=self._client_wrapper.get_base_url(),
+            headers=self._client_wrapper.get_headers(),
+            n_connections=n_connections,
+        )
+
+    def start_keepalive(self, n_connections: int = 1, interval: float = DEFAULT_KEEPALIVE_INTERVAL) -> None:
+        """
+        Keeps pooled connections open during quiet periods by re-warming the pool every `interval` seconds from a
+        background thread. The interval should be shorter than the pool's keepalive_expiry.
+
+        Parameters
+        ----------
+        n_connections : int
+            The number of connections to keep open, per endpoint if the client has a load_balancer.
+
+        interval : float
+            The number of seconds between two rounds of keep-alive requests.
+        """
+        self._client_wrapper.httpx_client.start_keepalive(
+            url=self._client_wrapper.get_base_url(),
+            headers=self._client_wrapper.get_headers(),
+            n_connections=n_connections,
+            interval=interval,
+        )
+
+    def stop_keepalive(self) -> None:
+        """
+        Stops the background keep-alive started by `start_keepalive`, if any.
+        """
+        self._client_wrapper.httpx_client.stop_keepalive()
+
 
 class AsyncReka:
     """
@@ -101,9 +263,60 @@ class AsyncReka:
     follow_redirects : typing.Optional[bool]
         Whether the default httpx client follows redirects or not, this is irrelevant if a custom httpx client is passed in.
 
+    http2 : bool
+        Whether the default httpx client negotiates HTTP/2, multiplexing concurrent requests over a single connection. Requires the `h2` package (`pip install httpx[http2]`). This is irrelevant if a custom httpx client is passed in.
+
+    max_connections : typing.Optional[int]
+        The maximum number of concurrent connections the default httpx client opens, defaults to 100. This is irrelevant if a custom httpx client is passed in.
+
+    max_keepalive_connections : typing.Optional[int]
+        The maximum number of idle connections the default httpx client keeps in its pool, defaults to 20. This is irrelevant if a custom httpx client is passed in.
+
+    keepalive_expiry : typing.Optional[float]
+        The number of seconds an idle pooled connection is kept open by the default httpx client, defaults to 5 seconds. This is irrelevant if a custom httpx client is passed in.
+
     httpx_client : typing.Optional[httpx.AsyncClient]
         The httpx client to use for making requests, a preconfigured client is used by default, however this is useful should you want to pass in any custom httpx configuration.
 
+    retry_budget : typing.Optional[RetryBudget]
+        A retry budget shared by every call made through this client, bounding retries to a fraction of recent requests so that an API outage does not turn into a retry storm. By default each call retries independently, up to its max_retries.
+
+    rate_limiter : typing.Optional[AdaptiveRateLimiter]
+        A rate limiter shared by every call made through this client. It lowers the request rate when the API responds with 429, pauses all calls for the duration of a retry-after header, and ramps back up afterwards. Share one instance between clients to limit them together.
+
+    concurrency_limiter : typing.Optional[GradientConcurrencyLimiter]
+        Limits how many requests this client has in flight at once, waiting for a permit before each one. The limit grows while latency stays flat and backs off as soon as requests start queueing. Its limit, queue_depth and min_rtt can be read at any time.
+
+    hedging_policy : typing.Optional[HedgingPolicy]
+        Hedges chat.create calls: once a call has been outstanding for longer than the policy's delay (by default the observed p95 latency), a second copy is sent and whichever answers first is used. Hedges are limited to a fraction of calls by the policy's budget. Streaming calls are never hedged.
+
+    circuit_breaker : typing.Optional[CircuitBreaker]
+        Tracks failures per API endpoint and per model. Once a circuit opens, calls routed through it raise CircuitOpenError immediately instead of waiting out their timeout, until a probe request succeeds again. Its states() can back a health check.
+
+    load_balancer : typing.Optional[LoadBalancer]
+        Spreads calls over several API endpoints, sending each attempt to the endpoint with the fewest requests in flight or the lowest latency. Endpoints that keep failing are ejected and probed again later. Requests are built against base_url, which defaults to the balancer's first endpoint.
+
+    request_coalescer : typing.Optional[RequestCoalescer]
+        Coalesces identical chat.create calls that are in flight at the same time, so that they share one HTTP request and one parsed ChatResponse. Calls are identical when their encoded request bodies and request options are.
+
+    response_cache : typing.Optional[ResponseCache]
+        Caches the responses of deterministic chat.create calls, i.e. calls with a seed or with temperature=0. The key is a hash of the request body, the base URL and the API key, so per-call options such as timeouts and retries do not affect it. Use InMemoryResponseCache, or SQLiteResponseCache to share the cache between processes.
+
+    models_cache : typing.Optional[TTLCache]
+        Caches the result of models.get for the cache's ttl, after which it is still returned while a background request refreshes it. Call models.invalidate() to drop it early.
+
+    request_compression : typing.Optional[RequestCompression]
+        Compresses the JSON bodies of chat.create and chat.create_stream calls once they exceed the policy's threshold, e.g. requests with inline base64 media. Only use this with an API endpoint that accepts compressed requests.
+
+    streaming_request_body : typing.Optional[StreamingRequestBody]
+        Streams the JSON bodies of chat.create and chat.create_stream calls in chunks as they are sent, rather than encoding them in memory first. Required to send MediaFile inline media.
+
+    json_codec : typing.Optional[JSONCodec]
+        The JSON library used to decode responses and stream chunks and to encode request bodies, e.g. JSONCodec() to use orjson or msgspec when installed. Defaults to the standard library.
+
+    response_format : ResponseFormat
+        What chat.create, chat.create_stream and models.get return. "models", the default, returns the typed models. "raw" returns the decoded JSON, and "slots" returns read-only ResponseViews with the fields of the models as attributes. Both skip constructing the models. A call can override it with request_options={"response_format": ...}. Type checkers only see the format of a call's request_options, and otherwise assume the typed models.
+
     Examples
     --------
     from reka.client import AsyncReka
@@ -121,24 +334,136 @@ class AsyncReka:
         api_key: typing.Optional[str] = os.getenv("REKA_API_KEY"),
         timeout: typing.Optional[float] = None,
         follow_redirects: typing.Optional[bool] = True,
-        httpx_client: typing.Optional[httpx.AsyncClient] = None
+        http2: bool = False,
+        max_connections: typing.Optional[int] = None,
+        max_keepalive_connections: typing.Optional[int] = None,
+        keepalive_expiry: typing.Optional[float] = None,
+        httpx_client: typing.Optional[httpx.AsyncClient] = None,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        concurrency_limiter: typing.Optional[GradientConcurrencyLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_coalescer: typing.Optional[RequestCoalescer] = None,
+        response_cache: typing.Optional[ResponseCache] = None,
+        models_cache: typing.Optional[TTLCache] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+        response_format: ResponseFormat = "models"
     ):
         _defaulted_timeout = timeout if timeout is not None else 300 if httpx_client is None else None
         if api_key is None:
             raise ApiError(body="The client must be instantiated be either passing in api_key or setting REKA_API_KEY")
+        if base_url is None and load_balancer is not None:
+            base_url = load_balancer.base_urls[0]
+        _limits = _get_limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
         self._client_wrapper = AsyncClientWrapper(
             base_url=_get_base_url(base_url=base_url, environment=environment),
             api_key=api_key,
             httpx_client=httpx_client
             if httpx_client is not None
-            else httpx.AsyncClient(timeout=_defaulted_timeout, follow_redirects=follow_redirects)
+            else httpx.AsyncClient(
+                timeout=_defaulted_timeout, follow_redirects=follow_redirects, http2=http2, limits=_limits
+            )
             if follow_redirects is not None
-            else httpx.AsyncClient(timeout=_defaulted_timeout),
+            else httpx.AsyncClient(timeout=_defaulted_timeout, http2=http2, limits=_limits),
             timeout=_defaulted_timeout,
+            retry_budget=retry_budget,
+            rate_limiter=rate_limiter,
+            concurrency_limiter=concurrency_limiter,
+            hedging_policy=hedging_policy,
+            circuit_breaker=circuit_breaker,
+            load_balancer=load_balancer,
+            request_coalescer=request_coalescer,
+            response_cache=response_cache,
+            models_cache=models_cache,
+            request_compression=request_compression,
+            streaming_request_body=streaming_request_body,
+            json_codec=json_codec,
+            response_format=response_format,
         )
         self.chat = AsyncChatClient(client_wrapper=self._client_wrapper)
         self.models = AsyncModelsClient(client_wrapper=self._client_wrapper)
 
+    async def warmup(self, n_connections: int = 1) -> int:
+        """
+        Opens pooled connections ahead of traffic, so that the first calls after startup or an idle period do not pay
+        for the TCP and TLS handshakes.
+
+        Parameters
+        ----------
+        n_connections : int
+            The number of connections to open, per endpoint if the client has a load_balancer. Connections beyond
+            the pool's max_keepalive_connections are closed again once the warmup requests complete.
+
+        Returns
+        -------
+        int
+            The number of warmup requests that succeeded.
+
+        Examples
+        --------
+        from reka.client import AsyncReka
+
+        client = AsyncReka(
+            api_key="YOUR_API_KEY",
+        )
+        await client.warmup(n_connections=8)
+        """
+        return await self._client_wrapper.httpx_client.warmup(
+            url=self._client_wrapper.get_base_url(),
+            headers=self._client_wrapper.get_headers(),
+            n_connections=n_connections,
+        )
+
+    def start_keepalive(self, n_connections: int = 1, interval: float = DEFAULT_KEEPALIVE_INTERVAL) -> None:
+        """
+        Keeps pooled connections open during quiet periods by re-warming the pool every `interval` seconds from a
+        task on the running event loop. The interval should be shorter than the pool's keepalive_expiry.
+
+        Parameters
+        ----------
+        n_connections : int
+            The number of connections to keep open, per endpoint if the client has a load_balancer.
+
+        interval : float
+            The number of seconds between two rounds of keep-alive requests.
+        """
+        self._client_wrapper.httpx_client.start_keepalive(
+            url=self._client_wrapper.get_base_url(),
+            headers=self._client_wrapper.get_headers(),
+            n_connections=n_connections,
+            interval=interval,
+        )
+
+    async def stop_keepalive(self) -> None:
+        """
+        Stops the keep-alive task started by `start_keepalive`, if any.
+        """
+        await self._client_wrapper.httpx_client.stop_keepalive()
+
+
+def _get_limits(
+    *,
+    max_connections: typing.Optional[int] = None,
+    max_keepalive_connections: typing.Optional[int] = None,
+    keepalive_expiry: typing.Optional[float] = None,
+) -> httpx.Limits:
+    # httpx reads None as "unlimited", so fall back to its defaults explicitly.
+    return httpx.Limits(
+        max_connections=max_connections if max_connections is not None else DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=max_keepalive_connections
+        if max_keepalive_connections is not None
+        else DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else DEFAULT_KEEPALIVE_EXPIRY,
+    )
+
 
 def _get_base_url(*, base_url: typing.Optional[str] = None, environment: RekaEnvironment) -> str:
     if base_url is not None:
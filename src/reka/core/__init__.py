@@ -1,26 +1,63 @@
 # This file was auto-generated by Fern from our API Definition.
 
 from .api_error import ApiError
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .circuit_open_error import CircuitOpenError
 from .client_wrapper import AsyncClientWrapper, BaseClientWrapper, SyncClientWrapper
+from .concurrency_limiter import GradientConcurrencyLimiter
 from .datetime_utils import serialize_datetime
 from .file import File, convert_file_dict_to_httpx_tuples
+from .hedging import HedgingPolicy
 from .http_client import AsyncHttpClient, HttpClient
+from .json_codec import JSONCodec
 from .jsonable_encoder import jsonable_encoder
+from .load_balancer import LoadBalancer
 from .pydantic_utilities import deep_union_pydantic_dicts, pydantic_v1
 from .query_encoder import encode_query
+from .rate_limiter import AdaptiveRateLimiter
 from .remove_none_from_dict import remove_none_from_dict
-from .request_options import RequestOptions
+from .request_coalescer import RequestCoalescer
+from .request_compression import RequestCompression
+from .request_options import RawRequestOptions, RequestOptions, SlotsRequestOptions
+from .response_cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+from .response_format import ResponseFormat, ResponseView
+from .retry_budget import RetryBudget
+from .stream_interrupted_error import StreamInterruptedError
+from .streaming_request_body import MediaFile, StreamingRequestBody
+from .ttl_cache import TTLCache
 from .unchecked_base_model import UncheckedBaseModel, UnionMetadata, construct_type
 
 __all__ = [
+    "AdaptiveRateLimiter",
     "ApiError",
     "AsyncClientWrapper",
     "AsyncHttpClient",
     "BaseClientWrapper",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
     "File",
+    "GradientConcurrencyLimiter",
+    "HedgingPolicy",
     "HttpClient",
+    "InMemoryResponseCache",
+    "JSONCodec",
+    "LoadBalancer",
+    "MediaFile",
+    "RequestCoalescer",
+    "RawRequestOptions",
+    "RequestCompression",
     "RequestOptions",
+    "ResponseCache",
+    "ResponseFormat",
+    "ResponseView",
+    "RetryBudget",
+    "SQLiteResponseCache",
+    "SlotsRequestOptions",
+    "StreamInterruptedError",
+    "StreamingRequestBody",
     "SyncClientWrapper",
+    "TTLCache",
     "UncheckedBaseModel",
     "UnionMetadata",
     "construct_type",
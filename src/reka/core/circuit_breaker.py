@@ -0,0 +1,219 @@
+import enum
+import threading
+import time
+import typing
+from contextlib import contextmanager
+
+import httpx
+
+from .circuit_open_error import CircuitOpenError
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitAttempt:
+    """
+    One attempt admitted by a circuit breaker. Call `record` once the outcome of the attempt is known; an attempt
+    that ends without a recorded outcome (e.g. because it was cancelled) frees its probe slot without a verdict.
+    """
+
+    def __init__(self, breaker: typing.Optional["CircuitBreaker"], keys: typing.List[str], probes: typing.List[str]):
+        self._breaker = breaker
+        self._keys = keys
+        self._probes = probes
+        self._recorded = False
+
+    def record(self, *, failed: bool, model_failed: bool = False) -> None:
+        """
+        Records the outcome of the attempt. With `model_failed=True` the failure is the model's rather than the
+        endpoint's, which answered, so it only counts against the model's circuit.
+        """
+        if self._recorded or self._breaker is None:
+            return
+        self._recorded = True
+        if failed and model_failed and len(self._keys) > 1:
+            self._breaker._record(self._keys[:1], self._probes, False)
+            self._breaker._record(self._keys[1:], self._probes, True)
+        else:
+            self._breaker._record(self._keys, self._probes, failed)
+
+    def _release(self) -> None:
+        if not self._recorded and self._breaker is not None:
+            self._breaker._release(self._probes)
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to an endpoint or model that keeps failing, so that callers fail fast instead of each
+    waiting out its own timeout.
+
+    Every request is tracked under two circuits: one for the API endpoint it is sent to (scheme, host and port) and
+    one for the model named in its body, e.g. `https://api.reka.ai [reka-core]`. A circuit starts closed. After
+    `failure_threshold` consecutive failures (transport errors, including timeouts, and 5xx responses) it opens, and
+    calls routed through it raise `CircuitOpenError` without being sent. Once `recovery_timeout` seconds have passed
+    it becomes half-open and lets up to `half_open_max_calls` probe requests through: `success_threshold` successful
+    probes close it again, while a single failed probe re-opens it for another `recovery_timeout`.
+
+    A 5xx response whose error names the requested model is a failure of that model only, and counts against its
+    circuit but not the endpoint's, so that one failing model does not cut off the others.
+
+    4xx responses, including 429, are answers from a healthy API and count as successes; pair the breaker with an
+    `AdaptiveRateLimiter` to handle throttling. One breaker can be shared between threads and between clients.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        The number of consecutive failures that opens a circuit.
+
+    recovery_timeout : float
+        The number of seconds an open circuit rejects calls before letting probes through.
+
+    half_open_max_calls : int
+        The number of probe requests a half-open circuit allows in flight at once.
+
+    success_threshold : int
+        The number of successful probes needed to close a half-open circuit.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+    ) -> None:
+        if failure_threshold < 1 or half_open_max_calls < 1 or success_threshold < 1:
+            raise ValueError("failure_threshold, half_open_max_calls and success_threshold must be >= 1")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self._circuits: typing.Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+        self._rejected = 0
+
+    @staticmethod
+    def keys_for(url: typing.Union[str, httpx.URL], model: typing.Optional[str] = None) -> typing.List[str]:
+        """
+        Returns the circuits a request to `url` for `model` is tracked under, the endpoint's first.
+        """
+        url = httpx.URL(url)
+        endpoint = f"{url.scheme}://{url.netloc.decode('ascii')}"
+        return [endpoint] if model is None else [endpoint, f"{endpoint} [{model}]"]
+
+    def _current_state(self, circuit: _Circuit, now: float) -> CircuitState:
+        if circuit.state is CircuitState.OPEN and now - circuit.opened_at >= self.recovery_timeout:
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probes = 0
+            circuit.probe_successes = 0
+        return circuit.state
+
+    def _admit(self, keys: typing.List[str]) -> typing.List[str]:
+        with self._lock:
+            now = time.monotonic()
+            circuits = [(key, self._circuits.setdefault(key, _Circuit())) for key in keys]
+            # Check every circuit before taking any probe slot, so that a rejected call holds none.
+            for key, circuit in circuits:
+                state = self._current_state(circuit, now)
+                if state is CircuitState.OPEN or (
+                    state is CircuitState.HALF_OPEN and circuit.probes >= self.half_open_max_calls
+                ):
+                    self._rejected += 1
+                    retry_after = max(circuit.opened_at + self.recovery_timeout - now, 0)
+                    raise CircuitOpenError(key=key, retry_after=retry_after)
+            probes = []
+            for key, circuit in circuits:
+                if circuit.state is CircuitState.HALF_OPEN:
+                    circuit.probes += 1
+                    probes.append(key)
+            return probes
+
+    def _record(self, keys: typing.List[str], probes: typing.List[str], failed: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                circuit = self._circuits.setdefault(key, _Circuit())
+                is_probe = key in probes
+                if is_probe:
+                    circuit.probes = max(circuit.probes - 1, 0)
+                if failed:
+                    circuit.consecutive_failures += 1
+                    # A circuit that is already open keeps its original timer, late failures do not extend it.
+                    if circuit.state is not CircuitState.OPEN and (
+                        is_probe or circuit.consecutive_failures >= self.failure_threshold
+                    ):
+                        circuit.state = CircuitState.OPEN
+                        circuit.opened_at = now
+                else:
+                    circuit.consecutive_failures = 0
+                    if is_probe:
+                        circuit.probe_successes += 1
+                        if circuit.probe_successes >= self.success_threshold:
+                            circuit.state = CircuitState.CLOSED
+
+    def _release(self, probes: typing.List[str]) -> None:
+        with self._lock:
+            for key in probes:
+                circuit = self._circuits.get(key)
+                if circuit is not None:
+                    circuit.probes = max(circuit.probes - 1, 0)
+
+    @contextmanager
+    def attempt(self, keys: typing.List[str]) -> typing.Iterator[CircuitAttempt]:
+        """
+        Admits one attempt through the circuits named by `keys`, raising `CircuitOpenError` if any of them is open.
+        """
+        attempt = CircuitAttempt(self, keys, self._admit(keys))
+        try:
+            yield attempt
+        finally:
+            attempt._release()
+
+    def state(self, key: str) -> CircuitState:
+        """
+        Returns the state of the circuit named `key`, which is closed if no request has been tracked under it yet.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return CircuitState.CLOSED if circuit is None else self._current_state(circuit, time.monotonic())
+
+    def states(self) -> typing.Dict[str, CircuitState]:
+        """
+        Returns the state of every circuit seen so far, e.g. for a health check.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {key: self._current_state(circuit, now) for key, circuit in self._circuits.items()}
+
+    def reset(self) -> None:
+        """
+        Closes every circuit.
+        """
+        with self._lock:
+            self._circuits.clear()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns how many circuits are in each state and how many calls were rejected.
+        """
+        states = self.states()
+        return {
+            "closed": sum(state is CircuitState.CLOSED for state in states.values()),
+            "open": sum(state is CircuitState.OPEN for state in states.values()),
+            "half_open": sum(state is CircuitState.HALF_OPEN for state in states.values()),
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,17 @@
+import typing
+
+from .api_error import ApiError
+
+
+class CircuitOpenError(ApiError):
+    """
+    Raised instead of sending a request while the circuit breaker for its endpoint or model is open.
+
+    `key` names the circuit that rejected the call and `retry_after` is the number of seconds until the circuit lets
+    a probe request through again.
+    """
+
+    def __init__(self, *, key: str, retry_after: float):
+        super().__init__(body=f"Circuit for {key} is open, retry in {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
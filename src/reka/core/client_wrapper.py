@@ -1,10 +1,27 @@
 # This file was auto-generated by Fern from our API Definition.
 
 import typing
+import urllib.parse
 
 import httpx
 
+from .circuit_breaker import CircuitBreaker
+from .concurrency_limiter import GradientConcurrencyLimiter
+from .hedging import HedgingPolicy
+from .json_codec import STDLIB_JSON_CODEC, JSONCodec
+from .load_balancer import LoadBalancer
 from .http_client import AsyncHttpClient, HttpClient
+from .jsonable_encoder import jsonable_encoder
+from .rate_limiter import AdaptiveRateLimiter
+from .remove_none_from_dict import remove_none_from_dict
+from .request_coalescer import RequestCoalescer
+from .request_compression import RequestCompression
+from .request_envelope import RequestEnvelope
+from .response_format import ResponseFormat
+from .response_cache import ResponseCache
+from .retry_budget import RetryBudget
+from .streaming_request_body import StreamingRequestBody
+from .ttl_cache import TTLCache
 
 
 class BaseClientWrapper:
@@ -13,6 +30,16 @@ class BaseClientWrapper:
         self._base_url = base_url
         self._timeout = timeout
 
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: str) -> None:
+        self._api_key = api_key
+        # The headers of the envelopes carry the api key.
+        self._request_envelopes: typing.Dict[str, RequestEnvelope] = {}
+
     def get_headers(self) -> typing.Dict[str, str]:
         headers: typing.Dict[str, str] = {
             "X-Fern-Language": "Python",
@@ -28,18 +55,100 @@ class BaseClientWrapper:
     def get_timeout(self) -> typing.Optional[float]:
         return self._timeout
 
+    def get_request_envelope(self, path: str) -> RequestEnvelope:
+        """
+        Returns the URL, headers and timeout of the calls to `path`, computed on the first call.
+        """
+        try:
+            return self._request_envelopes[path]
+        except KeyError:
+            pass
+        headers: typing.Dict[str, typing.Any] = self.get_headers()
+        envelope = self._request_envelopes[path] = RequestEnvelope(
+            url=urllib.parse.urljoin(f"{self.get_base_url()}/", path),
+            headers=jsonable_encoder(remove_none_from_dict(headers)),
+            timeout=self.get_timeout(),
+        )
+        return envelope
+
 
 class SyncClientWrapper(BaseClientWrapper):
     def __init__(
-        self, *, api_key: str, base_url: str, timeout: typing.Optional[float] = None, httpx_client: httpx.Client
+        self,
+        *,
+        api_key: str,
+        base_url: str,
+        timeout: typing.Optional[float] = None,
+        httpx_client: httpx.Client,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_coalescer: typing.Optional[RequestCoalescer] = None,
+        response_cache: typing.Optional[ResponseCache] = None,
+        models_cache: typing.Optional[TTLCache] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+        response_format: ResponseFormat = "models",
     ):
         super().__init__(api_key=api_key, base_url=base_url, timeout=timeout)
-        self.httpx_client = HttpClient(httpx_client=httpx_client)
+        self.request_coalescer = request_coalescer
+        self.response_cache = response_cache
+        self.models_cache = models_cache
+        self.json_codec = json_codec if json_codec is not None else STDLIB_JSON_CODEC
+        self.response_format = response_format
+        self.httpx_client = HttpClient(
+            httpx_client=httpx_client,
+            retry_budget=retry_budget,
+            rate_limiter=rate_limiter,
+            hedging_policy=hedging_policy,
+            circuit_breaker=circuit_breaker,
+            load_balancer=load_balancer,
+            request_compression=request_compression,
+            streaming_request_body=streaming_request_body,
+            json_codec=json_codec,
+        )
 
 
 class AsyncClientWrapper(BaseClientWrapper):
     def __init__(
-        self, *, api_key: str, base_url: str, timeout: typing.Optional[float] = None, httpx_client: httpx.AsyncClient
+        self,
+        *,
+        api_key: str,
+        base_url: str,
+        timeout: typing.Optional[float] = None,
+        httpx_client: httpx.AsyncClient,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        concurrency_limiter: typing.Optional[GradientConcurrencyLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_coalescer: typing.Optional[RequestCoalescer] = None,
+        response_cache: typing.Optional[ResponseCache] = None,
+        models_cache: typing.Optional[TTLCache] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+        response_format: ResponseFormat = "models",
     ):
         super().__init__(api_key=api_key, base_url=base_url, timeout=timeout)
-        self.httpx_client = AsyncHttpClient(httpx_client=httpx_client)
+        self.request_coalescer = request_coalescer
+        self.response_cache = response_cache
+        self.models_cache = models_cache
+        self.json_codec = json_codec if json_codec is not None else STDLIB_JSON_CODEC
+        self.response_format = response_format
+        self.httpx_client = AsyncHttpClient(
+            httpx_client=httpx_client,
+            retry_budget=retry_budget,
+            rate_limiter=rate_limiter,
+            concurrency_limiter=concurrency_limiter,
+            hedging_policy=hedging_policy,
+            circuit_breaker=circuit_breaker,
+            load_balancer=load_balancer,
+            request_compression=request_compression,
+            streaming_request_body=streaming_request_body,
+            json_codec=json_codec,
+        )
@@ -0,0 +1,191 @@
+import asyncio
+import collections
+import math
+import time
+import typing
+from contextlib import asynccontextmanager
+
+
+class ConcurrencyPermit:
+    """
+    A slot held by one in-flight request. Call `record` once the latency of the request is known, e.g. when the
+    response headers arrive for a stream, otherwise the time the permit is released at is used.
+    """
+
+    def __init__(self, *, started_at: float, in_flight: int):
+        self.started_at = started_at
+        self.in_flight = in_flight
+        self.rtt: typing.Optional[float] = None
+        self.overloaded = False
+
+    def record(self, *, overloaded: bool = False) -> None:
+        if self.rtt is None:
+            self.rtt = time.monotonic() - self.started_at
+        self.overloaded = self.overloaded or overloaded
+
+
+class GradientConcurrencyLimiter:
+    """
+    Finds the number of requests that can be in flight at once by watching how latency responds to concurrency.
+
+    The limit grows while latency stays close to the lowest latency seen so far, and shrinks in proportion once
+    latency rises above it, which is the sign that requests are queueing somewhere. This is the gradient algorithm
+    used by Netflix's concurrency-limits library:
+
+        gradient = clamp(tolerance * min_rtt / rtt, 0.5, 1)
+        limit = (1 - smoothing) * limit + smoothing * (limit * gradient + sqrt(limit))
+
+    Responses that signal overload (429s, 5xx, transport errors) cut the limit by `backoff_ratio` directly. The
+    lowest latency is re-measured every `min_rtt_probe_interval` samples so that the limiter follows the API when
+    its baseline latency changes.
+
+    Calls that cannot get a permit wait in FIFO order. The limiter is meant for a single event loop.
+
+    Parameters
+    ----------
+    initial_limit : int
+        The number of concurrent requests allowed before any latency has been measured.
+
+    min_limit : int
+        The limit never drops below this.
+
+    max_limit : int
+        The limit never grows beyond this.
+
+    tolerance : float
+        How much latency may grow over the minimum before it is treated as queueing.
+
+    smoothing : float
+        How quickly the limit moves towards the value suggested by each sample, between 0 and 1.
+
+    backoff_ratio : float
+        The factor the limit is multiplied by when a request signals overload.
+
+    min_rtt_probe_interval : int
+        Number of samples after which the minimum latency is measured afresh.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        backoff_ratio: float = 0.9,
+        min_rtt_probe_interval: int = 1000,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if tolerance < 1:
+            raise ValueError("tolerance must be >= 1")
+        if not 0 < smoothing <= 1 or not 0 < backoff_ratio < 1:
+            raise ValueError("smoothing must be in (0, 1] and backoff_ratio in (0, 1)")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self.min_rtt_probe_interval = min_rtt_probe_interval
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: typing.Deque[asyncio.Future] = collections.deque()
+        self._min_rtt: typing.Optional[float] = None
+        self._samples_since_probe = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def min_rtt(self) -> typing.Optional[float]:
+        return self._min_rtt
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The permit was handed over just as we were cancelled, pass it on.
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self, permit: ConcurrencyPermit) -> None:
+        self._in_flight -= 1
+        if permit.overloaded:
+            self._limit = max(self._limit * self.backoff_ratio, self.min_limit)
+        elif permit.rtt is not None:
+            self._update_limit(permit.rtt, permit.in_flight)
+        self._wake_waiters()
+
+    def _update_limit(self, rtt: float, in_flight: int) -> None:
+        self._samples_since_probe += 1
+        if self._min_rtt is None or rtt < self._min_rtt or self._samples_since_probe >= self.min_rtt_probe_interval:
+            self._min_rtt = rtt
+            self._samples_since_probe = 0
+        gradient = max(0.5, min(1.0, self.tolerance * self._min_rtt / rtt)) if rtt > 0 else 1.0
+        # A caller that is not using half its permits tells us nothing about whether more would help.
+        if gradient == 1.0 and in_flight < self._limit / 2:
+            return
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        limit = (1 - self.smoothing) * self._limit + self.smoothing * new_limit
+        self._limit = max(self.min_limit, min(limit, self.max_limit))
+
+    @asynccontextmanager
+    async def permit(self) -> typing.AsyncIterator[ConcurrencyPermit]:
+        """
+        Waits for a permit and holds it for the duration of the block. Raising out of the block before `record` was
+        called counts as overload, except for cancellation, which releases the permit without recording a sample.
+        """
+        await self._acquire()
+        permit = ConcurrencyPermit(started_at=time.monotonic(), in_flight=self._in_flight)
+        try:
+            yield permit
+        except asyncio.CancelledError:
+            permit.rtt = None
+            permit.overloaded = False
+            raise
+        except Exception:
+            # Failures after the latency was recorded (e.g. while reading a stream) say nothing about overload.
+            if permit.rtt is None:
+                permit.record(overloaded=True)
+            raise
+        else:
+            permit.record()
+        finally:
+            self._release(permit)
+
+    def stats(self) -> typing.Dict[str, typing.Optional[float]]:
+        """
+        Returns the current limit, the number of requests in flight and waiting, and the minimum latency seen.
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "min_rtt": self._min_rtt,
+        }
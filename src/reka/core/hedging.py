@@ -0,0 +1,245 @@
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import math
+import threading
+import time
+import typing
+
+import httpx
+
+from .retry_budget import RetryBudget
+
+# Recomputing the percentile sorts the whole window, so only do it every so often.
+DELAY_RECOMPUTE_INTERVAL = 32
+
+
+def _is_usable(response: httpx.Response) -> bool:
+    return response.status_code != 429 and response.status_code < 500
+
+
+class HedgingPolicy:
+    """
+    Sends a duplicate of a slow request and uses whichever copy finishes first, trimming the latency tail caused by
+    requests that land on a slow backend.
+
+    The duplicate (the "hedge") is sent once the original has been outstanding for `delay` seconds or, if no
+    delay is given, for the `percentile` latency observed over the last `window` calls. Hedges are paid for out of
+    a budget that allows at most `max_hedge_ratio` hedges per call, so hedging can never double the load on the API.
+
+    Both copies race and the first usable response, i.e. one that is not an error, a 429 or a 5xx, is used. With
+    `AsyncReka` the losing request is cancelled. With `Reka` both copies are sent from a bounded thread pool while
+    the calling thread waits for them; a thread blocked in httpx cannot be interrupted, so the losing request is left
+    to finish in the background and its response is discarded. Calls are sent on the calling thread without hedging
+    while the pool is full.
+
+    Parameters
+    ----------
+    delay : typing.Optional[float]
+        A fixed number of seconds to wait before hedging. Takes precedence over `percentile`.
+
+    percentile : float
+        Which percentile of recent latencies to use as the hedging delay, e.g. 0.95 for p95.
+
+    window : int
+        The number of recent latencies the percentile is computed over.
+
+    min_samples : int
+        Calls are not hedged until this many latencies have been observed, unless `delay` is set.
+
+    max_hedge_ratio : float
+        The maximum number of hedges per call, e.g. 0.1 allows one hedge for every ten calls.
+
+    max_workers : int
+        The size of the thread pool that sends both copies of a call for the synchronous client. Calls never wait for
+        it: while it is full they are sent on the calling thread and not hedged.
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: typing.Optional[float] = None,
+        percentile: float = 0.95,
+        window: int = 1000,
+        min_samples: int = 20,
+        max_hedge_ratio: float = 0.1,
+        max_workers: int = 64,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self._fixed_delay = delay
+        self._latencies: typing.Deque[float] = collections.deque(maxlen=window)
+        self._delay: typing.Optional[float] = delay
+        self._samples_since_recompute = 0
+        self._budget = RetryBudget(retry_ratio=max_hedge_ratio, min_retries_per_second=0, max_tokens=1)
+        self._lock = threading.Lock()
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._workers = threading.BoundedSemaphore(max_workers)
+        self._requests = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._budget_exhausted = 0
+
+    def delay(self) -> typing.Optional[float]:
+        """
+        Returns how long to wait before hedging, or None if there is not enough data to decide yet.
+        """
+        return self._delay
+
+    def _record_latency(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._samples_since_recompute += 1
+            if self._fixed_delay is not None or len(self._latencies) < self.min_samples:
+                return
+            if self._delay is None or self._samples_since_recompute >= DELAY_RECOMPUTE_INTERVAL:
+                ordered = sorted(self._latencies)
+                self._delay = ordered[min(math.ceil(self.percentile * len(ordered)) - 1, len(ordered) - 1)]
+                self._samples_since_recompute = 0
+
+    def _start(self) -> typing.Optional[float]:
+        self._budget.record_request()
+        with self._lock:
+            self._requests += 1
+        return self._delay
+
+    def _try_hedge(self) -> bool:
+        acquired = self._budget.try_acquire_retry()
+        with self._lock:
+            if acquired:
+                self._hedges += 1
+            else:
+                self._budget_exhausted += 1
+        return acquired
+
+    def _record_winner(self, hedge_won: bool) -> None:
+        if hedge_won:
+            with self._lock:
+                self._hedge_wins += 1
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="reka-hedge"
+                )
+            return self._executor
+
+    def send(self, send: typing.Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Calls `send` on the thread pool, calling it a second time if the first call is slower than the hedging delay,
+        and returns whichever response is usable first. Falls back to calling `send` on the current thread without
+        hedging while the pool is full.
+        """
+        started_at = time.monotonic()
+        delay = self._start()
+        primary = self._submit(send) if delay is not None else None
+        if primary is None:
+            response = send()
+            self._record_latency(time.monotonic() - started_at)
+            return response
+
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        hedge = None if done else self._submit(send, hedge=True)
+        winner: typing.Optional["concurrent.futures.Future[httpx.Response]"] = None
+        pending = {primary} if hedge is None else {primary, hedge}
+        while pending and winner is None:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for finished in done:
+                if finished.exception() is None and _is_usable(finished.result()):
+                    winner = finished
+                    break
+        # A copy that is still running cannot be interrupted; its response is read in full by the time it finishes,
+        # so there is nothing to close and it is simply dropped.
+        if winner is None:
+            # Neither copy produced a usable response, surface what the original request got.
+            return primary.result()
+        self._record_winner(hedge_won=winner is hedge)
+        self._record_latency(time.monotonic() - started_at)
+        return winner.result()
+
+    def _submit(
+        self, send: typing.Callable[[], httpx.Response], *, hedge: bool = False
+    ) -> typing.Optional["concurrent.futures.Future[httpx.Response]"]:
+        """
+        Calls `send` on the thread pool with the current context, or returns None if every worker is busy or, for a
+        hedge, if the budget does not allow one.
+        """
+        if not self._workers.acquire(blocking=False):
+            return None
+        if hedge and not self._try_hedge():
+            self._workers.release()
+            return None
+        try:
+            return self._get_executor().submit(self._run, contextvars.copy_context(), send)
+        except BaseException:
+            self._workers.release()
+            raise
+
+    def _run(self, context: contextvars.Context, send: typing.Callable[[], httpx.Response]) -> httpx.Response:
+        try:
+            return context.run(send)
+        finally:
+            self._workers.release()
+
+    async def send_async(self, send: typing.Callable[[], typing.Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Awaits `send`, racing it against a second call if the first is slower than the hedging delay. The slower
+        call is cancelled.
+        """
+        started_at = time.monotonic()
+        delay = self._start()
+        if delay is None:
+            response = await send()
+            self._record_latency(time.monotonic() - started_at)
+            return response
+
+        primary = asyncio.ensure_future(send())
+        hedge: typing.Optional["asyncio.Future[httpx.Response]"] = None
+        winner: typing.Optional["asyncio.Future[httpx.Response]"] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._try_hedge():
+                response = await primary
+                self._record_latency(time.monotonic() - started_at)
+                return response
+
+            hedge = asyncio.ensure_future(send())
+            pending = {primary, hedge}
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    if finished.exception() is None and _is_usable(finished.result()):
+                        winner = finished
+                        break
+        finally:
+            # Also reached when the caller is cancelled, in which case neither copy should keep running.
+            losers = [task for task in (primary, hedge) if task is not None and not task.done()]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+
+        if winner is None:
+            # Neither copy produced a usable response, surface what the original request got.
+            return primary.result()
+        self._record_winner(hedge_won=winner is hedge)
+        self._record_latency(time.monotonic() - started_at)
+        return winner.result()
+
+    def stats(self) -> typing.Dict[str, typing.Optional[float]]:
+        """
+        Returns how many calls were made, how many were hedged, how often the hedge won, how many hedges the budget
+        denied, and the current hedging delay.
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+                "budget_exhausted": self._budget_exhausted,
+                "delay": self._delay,
+            }
@@ -1,19 +1,35 @@
 # This file was auto-generated by Fern from our API Definition.
 
 import asyncio
+import collections
 import email.utils
 import re
+import threading
 import time
 import typing
-from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
 from functools import wraps
 from random import random
 
 import httpx
 
+from .circuit_breaker import CircuitAttempt, CircuitBreaker
+from .concurrency_limiter import ConcurrencyPermit, GradientConcurrencyLimiter
+from .hedging import HedgingPolicy
+from .json_codec import STDLIB_JSON_CODEC, JSONCodec, with_json_content
+from .load_balancer import EndpointLease, LoadBalancer
+from .rate_limiter import AdaptiveRateLimiter
+from .request_compression import RequestCompression
+from .retry_budget import RetryBudget
+from .streaming_request_body import StreamingRequestBody
+from .stream_interrupted_error import StreamInterruptedError
+
 INITIAL_RETRY_DELAY_SECONDS = 0.5
 MAX_RETRY_DELAY_SECONDS = 10
 MAX_RETRY_DELAY_SECONDS_FROM_HEADER = 30
+WARMUP_BARRIER_TIMEOUT_SECONDS = 5
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
 
 
 def _parse_retry_after(response_headers: httpx.Headers) -> typing.Optional[float]:
@@ -25,7 +41,8 @@ def _parse_retry_after(response_headers: httpx.Headers) -> typing.Optional[float
     retry_after_ms = response_headers.get("retry-after-ms")
     if retry_after_ms is not None:
         try:
-            return int(retry_after_ms) / 1000 if retry_after_ms > 0 else 0
+            retry_after_ms_int = int(retry_after_ms)
+            return retry_after_ms_int / 1000 if retry_after_ms_int > 0 else 0
         except Exception:
             pass
 
@@ -57,6 +74,15 @@ def _parse_retry_after(response_headers: httpx.Headers) -> typing.Optional[float
     return seconds
 
 
+def _backoff_timeout(retries: int) -> float:
+    # Apply exponential backoff, capped at MAX_RETRY_DELAY_SECONDS.
+    retry_delay = min(INITIAL_RETRY_DELAY_SECONDS * pow(2.0, retries), MAX_RETRY_DELAY_SECONDS)
+
+    # Add a randomness / jitter to the retry delay to avoid overwhelming the server with retries.
+    timeout = retry_delay * (1 - 0.25 * random())
+    return timeout if timeout >= 0 else 0
+
+
 def _retry_timeout(response: httpx.Response, retries: int) -> float:
     """
     Determine the amount of time to wait before retrying a request.
@@ -69,12 +95,7 @@ def _retry_timeout(response: httpx.Response, retries: int) -> float:
     if retry_after is not None and retry_after <= MAX_RETRY_DELAY_SECONDS_FROM_HEADER:
         return retry_after
 
-    # Apply exponential backoff, capped at MAX_RETRY_DELAY_SECONDS.
-    retry_delay = min(INITIAL_RETRY_DELAY_SECONDS * pow(2.0, retries), MAX_RETRY_DELAY_SECONDS)
-
-    # Add a randomness / jitter to the retry delay to avoid overwhelming the server with retries.
-    timeout = retry_delay * (1 - 0.25 * random())
-    return timeout if timeout >= 0 else 0
+    return _backoff_timeout(retries)
 
 
 def _should_retry(response: httpx.Response) -> bool:
@@ -82,49 +103,616 @@ def _should_retry(response: httpx.Response) -> bool:
     return response.status_code >= 500 or response.status_code in retriable_400s
 
 
+def _is_stale_connection_error(error: httpx.TransportError) -> bool:
+    """
+    Errors raised when a pooled keep-alive socket turns out to have been closed by the server (or a middlebox)
+    while it sat idle in the pool.
+    """
+    return isinstance(error, (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError))
+
+
+def _should_retry_transport_error(error: httpx.TransportError, method: str) -> bool:
+    # The request never made it to the server (this includes DNS failures), so sending it again is always safe.
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    # Once the request went out, the server may already be acting on it, be it that the connection then broke or
+    # that the response was too slow, so only replay methods that are safe to repeat.
+    if _is_stale_connection_error(error) or isinstance(error, (httpx.ReadTimeout, httpx.WriteTimeout)):
+        return method.upper() in IDEMPOTENT_METHODS
+    return False
+
+
+def _is_model_error(response: httpx.Response, model: typing.Optional[str]) -> bool:
+    """
+    Whether the error body of `response` names `model`. The body of a stream is not read yet and is not looked at.
+    """
+    if model is None:
+        return False
+    try:
+        return model in response.text
+    except httpx.ResponseNotRead:
+        return False
+
+
+def _get_method(args: typing.Tuple[typing.Any, ...], kwargs: typing.Dict[str, typing.Any]) -> str:
+    return str(kwargs["method"] if "method" in kwargs else args[0])
+
+
+def _get_model(kwargs: typing.Dict[str, typing.Any]) -> typing.Optional[str]:
+    body = kwargs.get("json")
+    model = body.get("model") if isinstance(body, dict) else None
+    return model if isinstance(model, str) else None
+
+
+def _encode_body(
+    streaming_request_body: typing.Optional[StreamingRequestBody],
+    request_compression: typing.Optional[RequestCompression],
+    json_codec: typing.Optional[JSONCodec],
+    kwargs: typing.Dict[str, typing.Any],
+) -> typing.Dict[str, typing.Any]:
+    """
+    Encodes and compresses the JSON body once per call, so that retries and hedges send the same bytes, or sets it
+    up to be streamed.
+    """
+    if kwargs.get("json") is None:
+        return kwargs
+    if streaming_request_body is not None:
+        return streaming_request_body.apply(kwargs, request_compression)
+    if request_compression is None and json_codec is None:
+        return kwargs
+    body = (json_codec if json_codec is not None else STDLIB_JSON_CODEC).dumps(kwargs["json"])
+    if request_compression is None:
+        return with_json_content(kwargs, body)
+    return request_compression.apply(kwargs, body, request_compression.compress(body))
+
+
+async def _encode_body_async(
+    streaming_request_body: typing.Optional[StreamingRequestBody],
+    request_compression: typing.Optional[RequestCompression],
+    json_codec: typing.Optional[JSONCodec],
+    kwargs: typing.Dict[str, typing.Any],
+) -> typing.Dict[str, typing.Any]:
+    """
+    Like `_encode_body`, compressing bodies above the threshold and producing streamed bodies on a worker thread so
+    that the event loop keeps running.
+    """
+    if kwargs.get("json") is None:
+        return kwargs
+    if streaming_request_body is not None:
+        return await streaming_request_body.apply_async(kwargs, request_compression)
+    if request_compression is None and json_codec is None:
+        return kwargs
+    body = (json_codec if json_codec is not None else STDLIB_JSON_CODEC).dumps(kwargs["json"])
+    if request_compression is None:
+        return with_json_content(kwargs, body)
+    if len(body) < request_compression.threshold:
+        return request_compression.apply(kwargs, body, request_compression.compress(body))
+    compressed = await asyncio.get_running_loop().run_in_executor(None, request_compression.compress, body)
+    return request_compression.apply(kwargs, body, compressed)
+
+
+class _Route:
+    """
+    Where one attempt is sent: the request arguments rewritten onto the endpoint picked by the load balancer, and the
+    circuit breaker and load balancer bookkeeping for it.
+    """
+
+    def __init__(
+        self,
+        args: typing.Tuple[typing.Any, ...],
+        kwargs: typing.Dict[str, typing.Any],
+        lease: EndpointLease,
+        circuit: CircuitAttempt,
+        model: typing.Optional[str] = None,
+    ):
+        self.args = args
+        self.kwargs = kwargs
+        self._lease = lease
+        self._circuit = circuit
+        self._model = model
+
+    def record(self, *, failed: bool, sent_at: float) -> None:
+        self._circuit.record(failed=failed)
+        self._lease.record(failed=failed, sent_at=sent_at)
+
+    def record_response(self, response: httpx.Response, *, sent_at: float) -> None:
+        failed = response.status_code >= 500
+        self._circuit.record(failed=failed, model_failed=failed and _is_model_error(response, self._model))
+        self._lease.record(failed=failed, sent_at=sent_at)
+
+
+@contextmanager
+def _route(
+    load_balancer: typing.Optional[LoadBalancer],
+    circuit_breaker: typing.Optional[CircuitBreaker],
+    args: typing.Tuple[typing.Any, ...],
+    kwargs: typing.Dict[str, typing.Any],
+    model: typing.Optional[str],
+) -> typing.Iterator[_Route]:
+    """
+    Picks the endpoint for one attempt and admits the attempt through the circuits for that endpoint and for
+    `model`, the model named in the request's JSON body.
+    """
+    if load_balancer is None and circuit_breaker is None:
+        yield _Route(args, kwargs, EndpointLease(None, None, ""), CircuitAttempt(None, [], []))
+        return
+    with ExitStack() as stack:
+        if "url" in kwargs:
+            url = str(kwargs["url"])
+        else:
+            url = str(args[1])
+            args = (args[0],) + args[2:]
+        lease = (
+            stack.enter_context(load_balancer.route(url))
+            if load_balancer is not None
+            else EndpointLease(None, None, url)
+        )
+        kwargs = {**kwargs, "url": lease.url}
+        circuit = CircuitAttempt(None, [], [])
+        if circuit_breaker is not None:
+            keys = CircuitBreaker.keys_for(lease.url, model)
+            circuit = stack.enter_context(circuit_breaker.attempt(keys))
+        yield _Route(args, kwargs, lease, circuit, model)
+
+
+class _RetryState:
+    """
+    Tracks the retry decisions for a single call, shared by the sync and async clients.
+    """
+
+    def __init__(
+        self, *, method: str, max_retries: int, retries: int, retry_budget: typing.Optional[RetryBudget] = None
+    ):
+        self.method = method
+        self.max_retries = max_retries
+        self.retries = retries
+        self.attempts = 1
+        self._reconnected = False
+        self._retry_budget = retry_budget
+        if retry_budget is not None:
+            retry_budget.record_request()
+
+    def _can_retry(self) -> bool:
+        if self.max_retries <= self.retries:
+            return False
+        return self._retry_budget is None or self._retry_budget.try_acquire_retry()
+
+    def transport_error_timeout(self, error: httpx.TransportError) -> typing.Optional[float]:
+        """
+        Returns how long to wait before sending the request again, or None if the error should be raised.
+        """
+        if not _should_retry_transport_error(error, self.method):
+            return None
+        if _is_stale_connection_error(error) and not self._reconnected:
+            # The pool hands out a fresh connection on the next attempt, so there is nothing to wait for. This single
+            # reconnect does not count against max_retries, it is part of using pooled connections at all.
+            self._reconnected = True
+            self.attempts += 1
+            return 0
+        if not self._can_retry():
+            return None
+        timeout = _backoff_timeout(self.retries)
+        self.retries += 1
+        self.attempts += 1
+        return timeout
+
+    def response_timeout(self, response: httpx.Response) -> typing.Optional[float]:
+        """
+        Returns how long to wait before sending the request again, or None if the response should be returned.
+        """
+        if not (_should_retry(response=response) and self._can_retry()):
+            return None
+        timeout = _retry_timeout(response=response, retries=self.retries)
+        self.retries += 1
+        self.attempts += 1
+        return timeout
+
+
+class _AttemptCounter:
+    """
+    Histogram of how many attempts each call needed, keyed by attempt count.
+    """
+
+    def __init__(self) -> None:
+        self._counts: typing.Counter[int] = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, response: typing.Optional[httpx.Response], attempts: int) -> None:
+        if response is not None:
+            response.extensions["reka_attempts"] = attempts  # type: ignore
+        with self._lock:
+            self._counts[attempts] += 1
+
+    def snapshot(self) -> typing.Dict[int, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+def _is_overloaded(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _feed_rate_limiter(
+    rate_limiter: typing.Optional[AdaptiveRateLimiter], response: httpx.Response, sent_at: float
+) -> None:
+    if rate_limiter is not None:
+        # Like _retry_timeout, ignore unreasonable retry-after values, since they would stall every call.
+        retry_after = _parse_retry_after(response.headers)
+        if retry_after is not None and retry_after > MAX_RETRY_DELAY_SECONDS_FROM_HEADER:
+            retry_after = None
+        rate_limiter.on_response(status_code=response.status_code, retry_after=retry_after, sent_at=sent_at)
+
+
+def _warmup_urls(url: str, load_balancer: typing.Optional[LoadBalancer], n_connections: int) -> typing.List[str]:
+    """
+    Returns the URL of every warmup request: `n_connections` for each endpoint, since the pool keeps connections per
+    origin.
+    """
+    if n_connections < 1:
+        raise ValueError("n_connections must be >= 1")
+    base_urls = load_balancer.base_urls if load_balancer is not None else [url]
+    return [base_url for base_url in base_urls for _ in range(n_connections)]
+
+
 class HttpClient:
-    def __init__(self, *, httpx_client: httpx.Client):
+    def __init__(
+        self,
+        *,
+        httpx_client: httpx.Client,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+    ):
         self.httpx_client = httpx_client
+        self.retry_budget = retry_budget
+        self.rate_limiter = rate_limiter
+        self.hedging_policy = hedging_policy
+        self.circuit_breaker = circuit_breaker
+        self.load_balancer = load_balancer
+        self.request_compression = request_compression
+        self.streaming_request_body = streaming_request_body
+        self.json_codec = json_codec
+        self.attempts = _AttemptCounter()
+        self._keepalive: typing.Optional[typing.Tuple[threading.Thread, threading.Event]] = None
+
+    def _acquire(self) -> float:
+        return self.rate_limiter.acquire() if self.rate_limiter is not None else time.monotonic()
+
+    def warmup(self, *, url: str, headers: typing.Dict[str, str], n_connections: int) -> int:
+        """
+        Opens up to `n_connections` pooled connections by sending that many concurrent HEAD requests to `url`, or to
+        each of the load balancer's endpoints, returning how many of them succeeded. Requests that overlap in time
+        need a connection each, so the pool is left holding that many warm connections (up to its keep-alive limit).
+        """
+        urls = _warmup_urls(url, self.load_balancer, n_connections)
+        barrier = threading.Barrier(len(urls))
+
+        def ping(target: str) -> bool:
+            try:
+                barrier.wait(timeout=WARMUP_BARRIER_TIMEOUT_SECONDS)
+            except threading.BrokenBarrierError:
+                pass
+            try:
+                self.httpx_client.head(target, headers=headers)
+            except httpx.HTTPError:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="reka-warmup") as executor:
+            return sum(executor.map(ping, urls))
+
+    def start_keepalive(self, *, url: str, headers: typing.Dict[str, str], n_connections: int, interval: float) -> None:
+        """
+        Re-warms the pool every `interval` seconds from a daemon thread, replacing any keep-alive already running.
+        """
+        _warmup_urls(url, self.load_balancer, n_connections)
+        self.stop_keepalive()
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                self.warmup(url=url, headers=headers, n_connections=n_connections)
+
+        thread = threading.Thread(target=run, name="reka-keepalive", daemon=True)
+        self._keepalive = (thread, stop)
+        thread.start()
+
+    def stop_keepalive(self) -> None:
+        if self._keepalive is None:
+            return
+        thread, stop = self._keepalive
+        self._keepalive = None
+        stop.set()
+        thread.join()
 
     # Ensure that the signature of the `request` method is the same as the `httpx.Client.request` method
     @wraps(httpx.Client.request)
     def request(
-        self, *args: typing.Any, max_retries: int = 0, retries: int = 0, **kwargs: typing.Any
+        self,
+        *args: typing.Any,
+        max_retries: int = 0,
+        retries: int = 0,
+        hedge: bool = False,
+        encode_body: bool = False,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        """
+        Sends the request, retrying it as needed. With `hedge=True` and a hedging policy configured, a slow call is
+        raced against a second copy of itself. With `encode_body=True`, the JSON body is compressed if it is large
+        and request compression is configured, and streamed if streaming request bodies are configured.
+        """
+        model = _get_model(kwargs)
+        if encode_body:
+            kwargs = _encode_body(self.streaming_request_body, self.request_compression, self.json_codec, kwargs)
+        if hedge and self.hedging_policy is not None:
+            return self.hedging_policy.send(
+                lambda: self._send(args, kwargs, model, max_retries=max_retries, retries=retries)
+            )
+        return self._send(args, kwargs, model, max_retries=max_retries, retries=retries)
+
+    def _send(
+        self,
+        args: typing.Tuple[typing.Any, ...],
+        kwargs: typing.Dict[str, typing.Any],
+        model: typing.Optional[str],
+        *,
+        max_retries: int,
+        retries: int,
     ) -> httpx.Response:
-        response = self.httpx_client.request(*args, **kwargs)
-        if _should_retry(response=response):
-            if max_retries > retries:
-                time.sleep(_retry_timeout(response=response, retries=retries))
-                return self.request(max_retries=max_retries, retries=retries + 1, *args, **kwargs)
-        return response
+        state = _RetryState(
+            method=_get_method(args, kwargs), max_retries=max_retries, retries=retries, retry_budget=self.retry_budget
+        )
+        while True:
+            with _route(self.load_balancer, self.circuit_breaker, args, kwargs, model) as route:
+                sent_at = self._acquire()
+                try:
+                    response = self.httpx_client.request(*route.args, **route.kwargs)
+                except httpx.TransportError as e:
+                    route.record(failed=True, sent_at=sent_at)
+                    timeout = state.transport_error_timeout(e)
+                    if timeout is None:
+                        self.attempts.record(None, state.attempts)
+                        raise
+                else:
+                    route.record_response(response, sent_at=sent_at)
+                    _feed_rate_limiter(self.rate_limiter, response, sent_at)
+                    timeout = state.response_timeout(response)
+                    if timeout is None:
+                        self.attempts.record(response, state.attempts)
+                        return response
+            time.sleep(timeout)
 
     @wraps(httpx.Client.stream)
     @contextmanager
-    def stream(self, *args: typing.Any, max_retries: int = 0, retries: int = 0, **kwargs: typing.Any) -> typing.Any:
-        with self.httpx_client.stream(*args, **kwargs) as stream:
-            yield stream
+    def stream(
+        self, *args: typing.Any, max_retries: int = 0, retries: int = 0, encode_body: bool = False, **kwargs: typing.Any
+    ) -> typing.Any:
+        model = _get_model(kwargs)
+        if encode_body:
+            kwargs = _encode_body(self.streaming_request_body, self.request_compression, self.json_codec, kwargs)
+        state = _RetryState(
+            method=_get_method(args, kwargs), max_retries=max_retries, retries=retries, retry_budget=self.retry_budget
+        )
+        while True:
+            with ExitStack() as stack:
+                route = stack.enter_context(_route(self.load_balancer, self.circuit_breaker, args, kwargs, model))
+                sent_at = self._acquire()
+                try:
+                    stream = stack.enter_context(self.httpx_client.stream(*route.args, **route.kwargs))
+                except httpx.TransportError as e:
+                    route.record(failed=True, sent_at=sent_at)
+                    timeout = state.transport_error_timeout(e)
+                    if timeout is None:
+                        self.attempts.record(None, state.attempts)
+                        raise
+                else:
+                    route.record_response(stream, sent_at=sent_at)
+                    _feed_rate_limiter(self.rate_limiter, stream, sent_at)
+                    # Nothing has been handed to the caller yet, so the request can still be replayed.
+                    timeout = state.response_timeout(stream)
+                    if timeout is None:
+                        self.attempts.record(stream, state.attempts)
+                        try:
+                            yield stream
+                        except httpx.TransportError as e:
+                            raise StreamInterruptedError(status_code=stream.status_code, body=str(e)) from e
+                        return
+            time.sleep(timeout)
 
 
 class AsyncHttpClient:
-    def __init__(self, *, httpx_client: httpx.AsyncClient):
+    def __init__(
+        self,
+        *,
+        httpx_client: httpx.AsyncClient,
+        retry_budget: typing.Optional[RetryBudget] = None,
+        rate_limiter: typing.Optional[AdaptiveRateLimiter] = None,
+        concurrency_limiter: typing.Optional[GradientConcurrencyLimiter] = None,
+        hedging_policy: typing.Optional[HedgingPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        load_balancer: typing.Optional[LoadBalancer] = None,
+        request_compression: typing.Optional[RequestCompression] = None,
+        streaming_request_body: typing.Optional[StreamingRequestBody] = None,
+        json_codec: typing.Optional[JSONCodec] = None,
+    ):
         self.httpx_client = httpx_client
+        self.retry_budget = retry_budget
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.hedging_policy = hedging_policy
+        self.circuit_breaker = circuit_breaker
+        self.load_balancer = load_balancer
+        self.request_compression = request_compression
+        self.streaming_request_body = streaming_request_body
+        self.json_codec = json_codec
+        self.attempts = _AttemptCounter()
+        self._keepalive: typing.Optional["asyncio.Task[None]"] = None
+
+    async def _acquire(self) -> float:
+        return await self.rate_limiter.acquire_async() if self.rate_limiter is not None else time.monotonic()
+
+    async def _ping(self, url: str, headers: typing.Dict[str, str]) -> bool:
+        try:
+            await self.httpx_client.head(url, headers=headers)
+        except httpx.HTTPError:
+            return False
+        return True
+
+    async def warmup(self, *, url: str, headers: typing.Dict[str, str], n_connections: int) -> int:
+        """
+        Opens up to `n_connections` pooled connections by sending that many concurrent HEAD requests to `url`, or to
+        each of the load balancer's endpoints, returning how many of them succeeded. Requests that overlap in time
+        need a connection each, so the pool is left holding that many warm connections (up to its keep-alive limit).
+        """
+        urls = _warmup_urls(url, self.load_balancer, n_connections)
+        results = await asyncio.gather(*(self._ping(target, headers) for target in urls))
+        return sum(results)
+
+    def start_keepalive(self, *, url: str, headers: typing.Dict[str, str], n_connections: int, interval: float) -> None:
+        """
+        Re-warms the pool every `interval` seconds from a task on the running event loop, replacing any keep-alive
+        already running.
+        """
+        _warmup_urls(url, self.load_balancer, n_connections)
+        if self._keepalive is not None:
+            self._keepalive.cancel()
+
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.warmup(url=url, headers=headers, n_connections=n_connections)
+
+        self._keepalive = asyncio.ensure_future(run())
+
+    async def stop_keepalive(self) -> None:
+        if self._keepalive is None:
+            return
+        task = self._keepalive
+        self._keepalive = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    @asynccontextmanager
+    async def _attempt(self) -> typing.AsyncIterator[ConcurrencyPermit]:
+        """
+        Holds a concurrency permit for the duration of one attempt, once the rate limiter lets it through.
+        """
+        # Wait on the rate limiter first, so that calls it delays do not hold a permit that other calls could use.
+        sent_at = await self._acquire()
+        if self.concurrency_limiter is None:
+            yield ConcurrencyPermit(started_at=sent_at, in_flight=0)
+            return
+        async with self.concurrency_limiter.permit() as permit:
+            yield permit
 
     # Ensure that the signature of the `request` method is the same as the `httpx.Client.request` method
     @wraps(httpx.AsyncClient.request)
     async def request(
-        self, *args: typing.Any, max_retries: int = 0, retries: int = 0, **kwargs: typing.Any
+        self,
+        *args: typing.Any,
+        max_retries: int = 0,
+        retries: int = 0,
+        hedge: bool = False,
+        encode_body: bool = False,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        """
+        Sends the request, retrying it as needed. With `hedge=True` and a hedging policy configured, a slow call is
+        raced against a second copy of itself and whichever copy loses is cancelled. With `encode_body=True`, the
+        JSON body is compressed on a worker thread if it is large and request compression is configured, and
+        streamed if streaming request bodies are configured.
+        """
+        model = _get_model(kwargs)
+        if encode_body:
+            kwargs = await _encode_body_async(
+                self.streaming_request_body, self.request_compression, self.json_codec, kwargs
+            )
+        if hedge and self.hedging_policy is not None:
+            return await self.hedging_policy.send_async(
+                lambda: self._send(args, kwargs, model, max_retries=max_retries, retries=retries)
+            )
+        return await self._send(args, kwargs, model, max_retries=max_retries, retries=retries)
+
+    async def _send(
+        self,
+        args: typing.Tuple[typing.Any, ...],
+        kwargs: typing.Dict[str, typing.Any],
+        model: typing.Optional[str],
+        *,
+        max_retries: int,
+        retries: int,
     ) -> httpx.Response:
-        response = await self.httpx_client.request(*args, **kwargs)
-        if _should_retry(response=response):
-            if max_retries > retries:
-                await asyncio.sleep(_retry_timeout(response=response, retries=retries))
-                return await self.request(max_retries=max_retries, retries=retries + 1, *args, **kwargs)
-        return response
+        state = _RetryState(
+            method=_get_method(args, kwargs), max_retries=max_retries, retries=retries, retry_budget=self.retry_budget
+        )
+        while True:
+            with _route(self.load_balancer, self.circuit_breaker, args, kwargs, model) as route:
+                async with self._attempt() as attempt:
+                    try:
+                        response = await self.httpx_client.request(*route.args, **route.kwargs)
+                    except httpx.TransportError as e:
+                        route.record(failed=True, sent_at=attempt.started_at)
+                        timeout = state.transport_error_timeout(e)
+                        if timeout is None:
+                            self.attempts.record(None, state.attempts)
+                            raise
+                        attempt.record(overloaded=True)
+                    else:
+                        route.record_response(response, sent_at=attempt.started_at)
+                        attempt.record(overloaded=_is_overloaded(response))
+                        _feed_rate_limiter(self.rate_limiter, response, attempt.started_at)
+                        timeout = state.response_timeout(response)
+                        if timeout is None:
+                            self.attempts.record(response, state.attempts)
+                            return response
+            await asyncio.sleep(timeout)
 
     @wraps(httpx.AsyncClient.stream)
     @asynccontextmanager
     async def stream(
-        self, *args: typing.Any, max_retries: int = 0, retries: int = 0, **kwargs: typing.Any
+        self, *args: typing.Any, max_retries: int = 0, retries: int = 0, encode_body: bool = False, **kwargs: typing.Any
     ) -> typing.Any:
-        async with self.httpx_client.stream(*args, **kwargs) as stream:
-            yield stream
+        model = _get_model(kwargs)
+        if encode_body:
+            kwargs = await _encode_body_async(
+                self.streaming_request_body, self.request_compression, self.json_codec, kwargs
+            )
+        state = _RetryState(
+            method=_get_method(args, kwargs), max_retries=max_retries, retries=retries, retry_budget=self.retry_budget
+        )
+        while True:
+            async with AsyncExitStack() as stack:
+                route = stack.enter_context(_route(self.load_balancer, self.circuit_breaker, args, kwargs, model))
+                # The permit is held until the stream is closed, the latency sample is taken once headers arrive.
+                attempt = await stack.enter_async_context(self._attempt())
+                try:
+                    stream = await stack.enter_async_context(self.httpx_client.stream(*route.args, **route.kwargs))
+                except httpx.TransportError as e:
+                    route.record(failed=True, sent_at=attempt.started_at)
+                    timeout = state.transport_error_timeout(e)
+                    if timeout is None:
+                        self.attempts.record(None, state.attempts)
+                        raise
+                    attempt.record(overloaded=True)
+                else:
+                    route.record_response(stream, sent_at=attempt.started_at)
+                    attempt.record(overloaded=_is_overloaded(stream))
+                    _feed_rate_limiter(self.rate_limiter, stream, attempt.started_at)
+                    # Nothing has been handed to the caller yet, so the request can still be replayed.
+                    timeout = state.response_timeout(stream)
+                    if timeout is None:
+                        self.attempts.record(stream, state.attempts)
+                        try:
+                            yield stream
+                        except httpx.TransportError as e:
+                            raise StreamInterruptedError(status_code=stream.status_code, body=str(e)) from e
+                        return
+            await asyncio.sleep(timeout)
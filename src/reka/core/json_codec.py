@@ -0,0 +1,82 @@
+import json
+import typing
+
+BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+
+def _stdlib_loads(data: typing.Union[str, bytes]) -> typing.Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(value: typing.Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _orjson() -> typing.Tuple[typing.Callable[[typing.Any], typing.Any], typing.Callable[[typing.Any], bytes]]:
+    import orjson  # type: ignore
+
+    def dumps(value: typing.Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    return orjson.loads, dumps
+
+
+def _msgspec() -> typing.Tuple[typing.Callable[[typing.Any], typing.Any], typing.Callable[[typing.Any], bytes]]:
+    import msgspec  # type: ignore
+
+    return msgspec.json.Decoder().decode, msgspec.json.Encoder().encode
+
+
+_IMPORTERS = {"orjson": _orjson, "msgspec": _msgspec}
+
+
+class JSONCodec:
+    """
+    The JSON library used to decode responses and stream chunks, and to encode request bodies.
+
+    orjson and msgspec decode several times faster than the standard library, which adds up over the many small
+    chunks of a long stream. Unlike the standard library, both encode NaN and infinity as null rather than failing.
+
+    Parameters
+    ----------
+    backend : str
+        "orjson", "msgspec" or "json" for the standard library. "auto" picks the first of these that is installed.
+    """
+
+    def __init__(self, backend: str = "auto") -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(BACKENDS)}")
+        self.loads: typing.Callable[[typing.Union[str, bytes]], typing.Any] = _stdlib_loads
+        self.dumps: typing.Callable[[typing.Any], bytes] = _stdlib_dumps
+        self.backend = "json"
+        candidates = ("orjson", "msgspec") if backend == "auto" else () if backend == "json" else (backend,)
+        for name in candidates:
+            try:
+                self.loads, self.dumps = _IMPORTERS[name]()
+            except ImportError as e:
+                if backend == "auto":
+                    continue
+                raise ImportError(
+                    f"The {name} JSON backend requires the {name} package, install it with `pip install {name}`"
+                ) from e
+            self.backend = name
+            break
+
+    def __repr__(self) -> str:
+        return f"JSONCodec(backend={self.backend!r})"
+
+
+STDLIB_JSON_CODEC = JSONCodec("json")
+
+
+def with_json_content(
+    kwargs: typing.Dict[str, typing.Any], content: typing.Any, content_encoding: typing.Optional[str] = None
+) -> typing.Dict[str, typing.Any]:
+    """
+    Returns the request arguments `kwargs` with the `json` argument replaced by `content`, its already encoded form.
+    """
+    headers = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+    rest = {name: value for name, value in kwargs.items() if name != "json"}
+    return {**rest, "headers": headers, "content": content}
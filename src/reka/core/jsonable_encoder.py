@@ -16,8 +16,11 @@ from pathlib import PurePath
 from types import GeneratorType
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
+import pydantic
+
 from .datetime_utils import serialize_datetime
-from .pydantic_utilities import pydantic_v1
+from .pydantic_utilities import IS_PYDANTIC_V2, pydantic_v1
+from .unchecked_base_model import UncheckedBaseModel
 
 SetIntStr = Set[Union[int, str]]
 DictIntStrAny = Dict[Union[int, str], Any]
@@ -52,6 +55,13 @@ def jsonable_encoder(obj: Any, custom_encoder: Optional[Dict[Any, Callable[[Any]
         if "__root__" in obj_dict:
             obj_dict = obj_dict["__root__"]
         return jsonable_encoder(obj_dict, custom_encoder=encoder)
+    if IS_PYDANTIC_V2 and isinstance(obj, pydantic.BaseModel):
+        encoder = dict(obj.model_config.get("json_encoders") or {})
+        if custom_encoder:
+            encoder.update(custom_encoder)
+        # The generated models leave out what was not set, other models are dumped the way pydantic 2 does.
+        obj_dict = obj.dict(by_alias=True) if isinstance(obj, UncheckedBaseModel) else obj.model_dump(by_alias=True)
+        return jsonable_encoder(obj_dict, custom_encoder=encoder)
     if dataclasses.is_dataclass(obj):
         obj_dict = dataclasses.asdict(obj)
         return jsonable_encoder(obj_dict, custom_encoder=custom_encoder)
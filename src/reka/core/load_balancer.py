@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+import typing
+from contextlib import contextmanager
+
+# Weight of each new latency sample in the moving average.
+DEFAULT_EWMA_ALPHA = 0.3
+
+
+class _Endpoint:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.outstanding = 0
+        self.latency: typing.Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until: typing.Optional[float] = None
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+
+class EndpointLease:
+    """
+    One attempt routed to an endpoint. `url` is the request URL rewritten onto the chosen endpoint; call `record`
+    once the outcome of the attempt is known.
+    """
+
+    def __init__(
+        self,
+        balancer: typing.Optional["LoadBalancer"],
+        endpoint: typing.Optional[_Endpoint],
+        url: str,
+        probe: bool = False,
+    ):
+        self.url = url
+        self._balancer = balancer
+        self._endpoint = endpoint
+        self._probe = probe
+        self._recorded = False
+
+    @property
+    def base_url(self) -> typing.Optional[str]:
+        return self._endpoint.base_url if self._endpoint is not None else None
+
+    def record(self, *, failed: bool, sent_at: float) -> None:
+        if self._recorded or self._balancer is None or self._endpoint is None:
+            return
+        self._recorded = True
+        self._balancer._record(self._endpoint, self._probe, failed, time.monotonic() - sent_at)
+
+
+class LoadBalancer:
+    """
+    Spreads the calls of a client over several API endpoints, e.g. regional or private deployments.
+
+    Each attempt, including each retry, goes to the healthy endpoint with the fewest requests in flight
+    (`strategy="least_outstanding"`), or with the lowest moving average latency weighted by its requests in flight
+    (`strategy="ewma"`). An endpoint that fails `failure_threshold` times in a row (transport errors and 5xx
+    responses) is ejected for `ejection_time` seconds. After that a single probe request is routed to it: if it
+    succeeds the endpoint rejoins the rotation, otherwise it is ejected again. When every endpoint is ejected, calls
+    go to the one whose ejection ends first rather than failing outright.
+
+    Requests are built against the first endpoint and rewritten onto the chosen one, so every endpoint must serve
+    the API under the same path. One balancer can be shared between threads and between clients.
+
+    Parameters
+    ----------
+    base_urls : typing.Sequence[str]
+        The base URLs of the endpoints, e.g. "https://api.reka.ai/v1".
+
+    strategy : str
+        Either "least_outstanding" or "ewma".
+
+    failure_threshold : int
+        The number of consecutive failures that ejects an endpoint.
+
+    ejection_time : float
+        The number of seconds an ejected endpoint is left out of the rotation before it is probed again.
+    """
+
+    def __init__(
+        self,
+        base_urls: typing.Sequence[str],
+        *,
+        strategy: typing.Literal["least_outstanding", "ewma"] = "least_outstanding",
+        failure_threshold: int = 3,
+        ejection_time: float = 30.0,
+    ) -> None:
+        if not base_urls:
+            raise ValueError("At least one base URL is required")
+        if strategy not in ("least_outstanding", "ewma"):
+            raise ValueError('strategy must be "least_outstanding" or "ewma"')
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self._endpoints = [_Endpoint(base_url.rstrip("/")) for base_url in base_urls]
+        self._lock = threading.Lock()
+
+    @property
+    def base_urls(self) -> typing.List[str]:
+        return [endpoint.base_url for endpoint in self._endpoints]
+
+    def _match(self, url: str) -> typing.Optional[str]:
+        for endpoint in self._endpoints:
+            if url == endpoint.base_url or url.startswith(endpoint.base_url + "/"):
+                return url[len(endpoint.base_url) :]
+        return None
+
+    def _cost(self, endpoint: _Endpoint) -> float:
+        if self.strategy == "ewma":
+            # Endpoints without a latency sample yet are tried first.
+            return (endpoint.latency or 0.0) * (endpoint.outstanding + 1)
+        return endpoint.outstanding
+
+    def _pick(self, now: float) -> typing.Tuple[_Endpoint, bool]:
+        """
+        Returns the endpoint for the next attempt and whether the attempt probes an ejected endpoint.
+        """
+        available = []
+        for endpoint in self._endpoints:
+            if endpoint.ejected_until is None:
+                available.append(endpoint)
+            elif endpoint.ejected_until <= now and not endpoint.probing:
+                # The ejection is over, send this request as the probe that decides whether the endpoint is back.
+                endpoint.probing = True
+                return endpoint, True
+        if not available:
+            return min(self._endpoints, key=lambda endpoint: typing.cast(float, endpoint.ejected_until)), False
+        lowest = min(self._cost(endpoint) for endpoint in available)
+        return random.choice([endpoint for endpoint in available if self._cost(endpoint) == lowest]), False
+
+    def _record(self, endpoint: _Endpoint, probe: bool, failed: bool, latency: float) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            if probe:
+                endpoint.probing = False
+            if not failed:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = None
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else DEFAULT_EWMA_ALPHA * latency + (1 - DEFAULT_EWMA_ALPHA) * endpoint.latency
+                )
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if probe or (endpoint.ejected_until is None and endpoint.consecutive_failures >= self.failure_threshold):
+                endpoint.ejected_until = time.monotonic() + self.ejection_time
+                endpoint.ejections += 1
+
+    @contextmanager
+    def route(self, url: str) -> typing.Iterator[EndpointLease]:
+        """
+        Picks an endpoint for one attempt to `url`, holding it as outstanding for the duration of the block. URLs
+        that do not start with one of the balancer's base URLs are passed through untouched.
+        """
+        path = self._match(url)
+        if path is None:
+            yield EndpointLease(None, None, url)
+            return
+        with self._lock:
+            endpoint, probe = self._pick(time.monotonic())
+            endpoint.outstanding += 1
+        lease = EndpointLease(self, endpoint, endpoint.base_url + path, probe)
+        try:
+            yield lease
+        finally:
+            with self._lock:
+                endpoint.outstanding -= 1
+                if probe and not lease._recorded:
+                    # Cancelled or failed before an outcome was known, let the next request probe instead.
+                    endpoint.probing = False
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """
+        Returns, per base URL, whether the endpoint is healthy along with its requests in flight, latency average,
+        and request, failure and ejection counts.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                endpoint.base_url: {
+                    "healthy": endpoint.ejected_until is None,
+                    "ejected_for": max(endpoint.ejected_until - now, 0) if endpoint.ejected_until is not None else 0,
+                    "outstanding": endpoint.outstanding,
+                    "latency": endpoint.latency,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "ejections": endpoint.ejections,
+                }
+                for endpoint in self._endpoints
+            }
@@ -1,16 +1,151 @@
 # This file was auto-generated by Fern from our API Definition.
 
+import functools
+import os
 import typing
 
 import pydantic
+import typing_extensions
 
 IS_PYDANTIC_V2 = pydantic.VERSION.startswith("2.")
+# Whether the models are built on pydantic 2 itself, rather than on the `pydantic.v1` compatibility layer it ships.
+# Models built on pydantic 2 lose the `pydantic.v1` APIs, e.g. `.Config`, and raise pydantic 2's validation errors, so
+# they are opt-in: setting REKA_PYDANTIC_V2 builds them on pydantic 2.
+USE_PYDANTIC_V2 = IS_PYDANTIC_V2 and bool(os.environ.get("REKA_PYDANTIC_V2"))
 
 if IS_PYDANTIC_V2:
     import pydantic.v1 as pydantic_v1  # type: ignore  # nopycln: import
 else:
     import pydantic as pydantic_v1  # type: ignore  # nopycln: import
 
+if typing.TYPE_CHECKING or USE_PYDANTIC_V2:
+    BaseModel = pydantic.BaseModel
+else:
+    BaseModel = pydantic_v1.BaseModel
+
+# The base classes of the models of either version, which can be mixed when pydantic 2 is installed.
+PYDANTIC_MODEL_TYPES: typing.Tuple[type, ...] = (
+    (pydantic_v1.BaseModel, pydantic.BaseModel) if IS_PYDANTIC_V2 else (pydantic_v1.BaseModel,)
+)
+
+
+def is_pydantic_v2_model(type_: typing.Any) -> bool:
+    """
+    Whether `type_` is a model class of pydantic 2 itself, as opposed to one of `pydantic.v1`.
+    """
+    return IS_PYDANTIC_V2 and isinstance(type_, type) and issubclass(type_, pydantic.BaseModel)
+
+
+class ModelFieldInfo(typing.NamedTuple):
+    """
+    What the SDK needs to know about a field of a model of either version.
+    """
+
+    name: str
+    # The key of the field in JSON, the name if the field has no alias.
+    alias: str
+    # The type of the field, without the `Optional` around it, as `pydantic.v1` has it in `outer_type_`.
+    type_: typing.Any
+    required: bool
+    # None for required fields.
+    default: typing.Any
+    get_default: typing.Callable[[], typing.Any]
+    # The `pydantic.v1` `ModelField` or pydantic 2 `FieldInfo`.
+    field: typing.Any
+
+
+def get_model_fields(model: typing.Type[typing.Any]) -> typing.Mapping[str, typing.Any]:
+    """
+    Returns the fields of `model` as pydantic has them. Pydantic 2 replaces the mapping when it rebuilds the model,
+    `pydantic.v1` updates the fields in place.
+    """
+    if is_pydantic_v2_model(model):
+        # `model_fields` became a property in pydantic 2.10.
+        fields = model.__dict__.get("__pydantic_fields__")
+        return fields if fields is not None else model.model_fields
+    return model.__fields__
+
+
+def get_fields(model: typing.Type[typing.Any]) -> typing.List[ModelFieldInfo]:
+    """
+    Returns the fields of `model`, a model class of either version.
+    """
+    fields = []
+    for name, field in get_model_fields(model).items():
+        if isinstance(field, pydantic_v1.fields.ModelField):
+            fields.append(
+                ModelFieldInfo(
+                    name=name,
+                    alias=field.alias,
+                    type_=field.outer_type_,
+                    required=bool(field.required),
+                    default=field.default,
+                    get_default=field.get_default,
+                    field=field,
+                )
+            )
+        else:
+            required = field.is_required()
+            default = None if required or field.default_factory is not None else field.default
+            get_default: typing.Callable[[], typing.Any] = functools.partial(
+                field.get_default, call_default_factory=True
+            )
+            if required and _allows_none(field.annotation):
+                # `pydantic.v1` does not require the fields of `Optional` and `Any` types, they default to None.
+                required, get_default = False, _none
+            fields.append(
+                ModelFieldInfo(
+                    name=name,
+                    alias=field.alias or name,
+                    type_=_outer_type(field),
+                    required=required,
+                    default=default,
+                    get_default=get_default,
+                    field=field,
+                )
+            )
+    return fields
+
+
+def _allows_none(type_: typing.Any) -> bool:
+    if pydantic_v1.typing.is_union(pydantic_v1.typing.get_origin(type_)):
+        return any(_allows_none(arg) for arg in pydantic_v1.typing.get_args(type_))
+    return type_ is typing.Any or type_ is object or pydantic_v1.typing.is_none_type(type_)
+
+
+def _none() -> None:
+    return None
+
+
+def _outer_type(field: typing.Any) -> typing.Any:
+    type_ = field.annotation
+    # Pydantic 2 moves the metadata of an `Annotated` type onto the field, it is put back for the `UnionMetadata`.
+    if field.metadata:
+        type_ = typing_extensions.Annotated[(type_, *field.metadata)]  # type: ignore
+    if pydantic_v1.typing.is_union(pydantic_v1.typing.get_origin(type_)):
+        members = [arg for arg in pydantic_v1.typing.get_args(type_) if arg is not type(None)]
+        if len(members) == 1:
+            return members[0]
+    return type_
+
+
+_type_adapters: typing.Dict[typing.Any, typing.Any] = {}
+
+
+def parse_obj_as(type_: typing.Any, object_: typing.Any) -> typing.Any:
+    """
+    Validates `object_` as a `type_`, with pydantic 2's `TypeAdapter`s when the models are built on it.
+    """
+    if not USE_PYDANTIC_V2 or (isinstance(type_, type) and issubclass(type_, pydantic_v1.BaseModel)):
+        return pydantic_v1.parse_obj_as(type_, object_)
+    try:
+        adapter = _type_adapters[type_]
+    except KeyError:
+        adapter = _type_adapters[type_] = pydantic.TypeAdapter(type_)
+    except TypeError:
+        adapter = pydantic.TypeAdapter(type_)
+    return adapter.validate_python(object_)
+
 
 def deep_union_pydantic_dicts(
     source: typing.Dict[str, typing.Any], destination: typing.Dict[str, typing.Any]
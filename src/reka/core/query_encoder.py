@@ -1,9 +1,9 @@
 # This file was auto-generated by Fern from our API Definition.
 
 from collections import ChainMap
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, cast
 
-from .pydantic_utilities import pydantic_v1
+from .pydantic_utilities import PYDANTIC_MODEL_TYPES
 
 
 # Flattens dicts to be of the form {"key[subkey][subkey2]": value} where value is not a dict
@@ -19,9 +19,9 @@ def traverse_query_dict(dict_flat: Dict[str, Any], key_prefix: Optional[str] = N
 
 
 def single_query_encoder(query_key: str, query_value: Any) -> Dict[str, Any]:
-    if isinstance(query_value, pydantic_v1.BaseModel) or isinstance(query_value, dict):
-        if isinstance(query_value, pydantic_v1.BaseModel):
-            obj_dict = query_value.dict(by_alias=True)
+    if isinstance(query_value, PYDANTIC_MODEL_TYPES) or isinstance(query_value, dict):
+        if isinstance(query_value, PYDANTIC_MODEL_TYPES):
+            obj_dict = cast(Any, query_value).dict(by_alias=True)
         else:
             obj_dict = query_value
         return traverse_query_dict(obj_dict, query_key)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+import typing
+
+# A success only counts towards raising the rate if some call had to wait for the limiter this recently.
+SATURATION_WINDOW_SECONDS = 1.0
+
+
+class AdaptiveRateLimiter:
+    """
+    A client-side rate limiter shared by every call made through a client, adapting its rate to the API's 429s.
+
+    Requests are paced through a token bucket refilled at the current rate. The rate follows AIMD (additive
+    increase, multiplicative decrease): every 429 multiplies it by `decrease_factor`, while successful responses
+    raise it by roughly `additive_increase` requests per second, each second, for as long as the limiter is what
+    holds traffic back. A `retry-after` or `retry-after-ms` header on a 429 pauses all calls, not just the one
+    that was throttled.
+
+    The limiter only does bookkeeping under its lock and waits outside of it, so one instance can be shared by
+    threads using `Reka` as well as tasks using `AsyncReka`.
+
+    Parameters
+    ----------
+    initial_rate : float
+        Requests per second allowed before any feedback from the API has been seen.
+
+    min_rate : float
+        The rate never drops below this, however many 429s are received.
+
+    max_rate : float
+        The rate never grows beyond this.
+
+    additive_increase : float
+        How many requests per second the rate grows by per second of saturated, successful traffic.
+
+    decrease_factor : float
+        The factor the rate is multiplied by on a 429.
+
+    burst : float
+        How many requests may be sent back to back after a quiet period.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 1000.0,
+        additive_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        burst: float = 1.0,
+    ) -> None:
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("Expected 0 < min_rate <= initial_rate <= max_rate")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+        self._rate = initial_rate
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._last_delayed = float("-inf")
+        self._lock = threading.Lock()
+        self._throttled = 0
+        self._delayed = 0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        # Nothing accrues while calls are paused by a retry-after, so that the calls queued up during the pause are
+        # released at the current rate once it ends, rather than all at once.
+        start = max(self._last_refill, self._blocked_until)
+        if now > start:
+            self._tokens = min(self._tokens + (now - start) * self._rate, self.burst)
+        self._last_refill = max(now, self._last_refill)
+
+    def reserve(self) -> float:
+        """
+        Reserves a slot for one request, returning how many seconds the caller has to wait before sending it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(self._blocked_until - now, 0) + max(-self._tokens / self._rate, 0)
+            if delay > 0:
+                self._delayed += 1
+                self._last_delayed = now
+            return delay
+
+    def acquire(self) -> float:
+        """
+        Blocks the current thread until a request may be sent, returning the time it was sent at.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """
+        Waits without blocking the event loop until a request may be sent, returning the time it was sent at.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return time.monotonic()
+
+    def on_response(self, *, status_code: int, retry_after: typing.Optional[float], sent_at: float) -> None:
+        """
+        Feeds a response back into the limiter. `retry_after` is the parsed `retry-after` header, in seconds, and
+        `sent_at` is the value returned by `acquire` for that request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if status_code == 429:
+                self._throttled += 1
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                # Requests already in flight when the rate was last cut carry no new information, so a burst of
+                # 429s only counts as a single congestion signal.
+                if sent_at > self._last_decrease:
+                    self._rate = max(self._rate * self.decrease_factor, self.min_rate)
+                    self._tokens = min(self._tokens, 0)
+                    self._last_decrease = now
+            elif status_code < 400 and now - self._last_delayed <= SATURATION_WINDOW_SECONDS:
+                # Only grow while the limiter is actually holding traffic back, otherwise the rate would drift
+                # upwards without ever having been tested against the API. Dividing by the rate means the rate grows
+                # by `additive_increase` per second of such traffic.
+                self._rate = min(self._rate + self.additive_increase / self._rate, self.max_rate)
+
+    def stats(self) -> typing.Dict[str, float]:
+        """
+        Returns the current rate along with how many 429s were seen and how many requests had to wait.
+        """
+        with self._lock:
+            return {
+                "rate": self._rate,
+                "throttled": self._throttled,
+                "delayed": self._delayed,
+                "blocked_for": max(self._blocked_until - time.monotonic(), 0),
+            }
@@ -0,0 +1,108 @@
+import asyncio
+import concurrent.futures
+import threading
+import typing
+
+from .request_key import request_key
+
+T = typing.TypeVar("T")
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future[typing.Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    Collapses identical calls that are in flight at the same time into one, so that every caller shares a single
+    HTTP request and a single parsed response (or the same exception).
+
+    Calls are identified by a hash of their canonically encoded request, see `key`. Only calls that overlap in time
+    are coalesced; a call that starts after an identical one has returned is sent again. Coalesce only requests
+    whose duplicates are meant to get the same answer, e.g. with a fixed `seed` or `temperature=0`.
+
+    One coalescer can be shared between threads using `Reka`; calls made with `AsyncReka` are coalesced per event
+    loop. If every caller waiting on an async call is cancelled, the shared request is cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: typing.Dict[str, "concurrent.futures.Future[typing.Any]"] = {}
+        self._flights: typing.Dict[typing.Tuple[int, str], _Flight] = {}
+        self._sent = 0
+        self._coalesced = 0
+
+    @staticmethod
+    def key(*parts: typing.Any) -> str:
+        """
+        Returns the canonical hash identifying a call made with `parts`, see `request_key`.
+        """
+        return request_key(*parts)
+
+    def do(self, key: str, call: typing.Callable[[], T]) -> T:
+        """
+        Runs `call`, unless an identical call is already in flight, in which case its outcome is waited for instead.
+        """
+        with self._lock:
+            in_flight = self._calls.get(key)
+            if in_flight is not None:
+                self._coalesced += 1
+            else:
+                future: "concurrent.futures.Future[T]" = concurrent.futures.Future()
+                self._calls[key] = future
+                self._sent += 1
+        if in_flight is not None:
+            return in_flight.result()
+        try:
+            result = call()
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    async def do_async(self, key: str, call: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """
+        Awaits `call`, unless an identical call is already in flight, in which case its outcome is awaited instead.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._flights.pop(flight_key, None))
+            with self._lock:
+                self._sent += 1
+        else:
+            with self._lock:
+                self._coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Nobody else is waiting for the result, so there is no point in finishing the request.
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns how many requests were sent, how many calls shared another call's request, and how many requests
+        are in flight.
+        """
+        with self._lock:
+            return {
+                "sent": self._sent,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls) + len(self._flights),
+            }
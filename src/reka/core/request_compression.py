@@ -0,0 +1,151 @@
+import gzip
+import threading
+import typing
+import zlib
+
+from .json_codec import STDLIB_JSON_CODEC, with_json_content
+
+ENCODINGS = ("gzip", "zstd")
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+class RequestCompression:
+    """
+    Compresses large JSON request bodies, which mostly matters for inline media: a `data:` URL holding a base64
+    encoded image, video, audio file or PDF makes for a request body of many megabytes.
+
+    Bodies smaller than `threshold` bytes are sent as they are, since compressing them costs more time than sending
+    the bytes it saves. Base64 only uses 6 of every 8 bits, so even already compressed media such as JPEG or MP4
+    shrinks by about a quarter. Only use this with an API endpoint that accepts a `Content-Encoding` on requests.
+
+    zstd needs the `zstandard` package (`pip install zstandard`), it compresses faster than gzip at a similar ratio.
+
+    Parameters
+    ----------
+    encoding : str
+        "gzip" or "zstd".
+
+    threshold : int
+        The size of the encoded JSON body, in bytes, from which on it is compressed.
+
+    level : typing.Optional[int]
+        The compression level, 1-9 for gzip and 1-22 for zstd. Defaults to 6 for gzip and 3 for zstd. Lower levels
+        are faster, which is usually what pays off on all but the slowest links.
+    """
+
+    def __init__(
+        self, *, encoding: str = "gzip", threshold: int = 64 * 1024, level: typing.Optional[int] = None
+    ) -> None:
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {', '.join(ENCODINGS)}")
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level if level is not None else DEFAULT_LEVELS[encoding]
+        self._compress: typing.Callable[[bytes], bytes]
+        self._compressobj: typing.Callable[[], typing.Any]
+        if encoding == "gzip":
+            self._compress = self._gzip
+            self._compressobj = self._gzipobj
+        else:
+            self._compress, self._compressobj = _zstd_compressor(self.level)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._compressed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def _gzip(self, body: bytes) -> bytes:
+        # mtime=0 keeps the output deterministic, which also keeps hedged and retried copies identical.
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def _gzipobj(self) -> typing.Any:
+        # A gzip header written by zlib always has mtime 0.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def encode(self, body: typing.Any) -> bytes:
+        """
+        Encodes `body` as compact JSON, the way recent httpx versions do for the `json` argument of a request.
+        """
+        return STDLIB_JSON_CODEC.dumps(body)
+
+    def compress(self, body: bytes) -> typing.Optional[bytes]:
+        """
+        Returns `body` compressed, or None if it is below the threshold.
+        """
+        with self._lock:
+            self._requests += 1
+        if len(body) < self.threshold:
+            return None
+        compressed = self._compress(body)
+        with self._lock:
+            self._compressed += 1
+            self._bytes_in += len(body)
+            self._bytes_out += len(compressed)
+        return compressed
+
+    def compress_chunks(self, chunks: typing.Iterable[bytes]) -> typing.Iterator[bytes]:
+        """
+        Compresses a body that is produced in `chunks`, without ever holding all of it, regardless of the threshold.
+        """
+        compressor = self._compressobj()
+        bytes_in = 0
+        bytes_out = 0
+        for chunk in chunks:
+            bytes_in += len(chunk)
+            compressed = compressor.compress(chunk)
+            if compressed:
+                bytes_out += len(compressed)
+                yield compressed
+        compressed = compressor.flush()
+        bytes_out += len(compressed)
+        with self._lock:
+            self._requests += 1
+            self._compressed += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+        yield compressed
+
+    def apply(
+        self, kwargs: typing.Dict[str, typing.Any], body: bytes, compressed: typing.Optional[bytes]
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the request arguments `kwargs` with the `json` argument replaced by the encoded `body`, or by its
+        `compressed` form if there is one.
+        """
+        if compressed is None:
+            return with_json_content(kwargs, body)
+        return with_json_content(kwargs, compressed, self.encoding)
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns how many bodies were seen and compressed, and the total size of the compressed bodies before and
+        after compression.
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "compressed": self._compressed,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+            }
+
+
+def _zstd_compressor(
+    level: int,
+) -> typing.Tuple[typing.Callable[[bytes], bytes], typing.Callable[[], typing.Any]]:
+    try:
+        import zstandard  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "zstd request compression requires the zstandard package, install it with `pip install zstandard`"
+        ) from e
+
+    def compress(body: bytes) -> bytes:
+        # A ZstdCompressor must not be shared between threads, and creating one is cheap next to compressing a body
+        # this large.
+        return zstandard.ZstdCompressor(level=level).compress(body)
+
+    def compressobj() -> typing.Any:
+        return zstandard.ZstdCompressor(level=level).compressobj()
+
+    return compress, compressobj
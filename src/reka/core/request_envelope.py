@@ -0,0 +1,41 @@
+import typing
+
+from .jsonable_encoder import jsonable_encoder
+from .query_encoder import encode_query
+from .remove_none_from_dict import remove_none_from_dict
+from .request_options import RequestOptions
+
+
+class RequestEnvelope:
+    """
+    The URL, headers and timeout of the calls to one endpoint, which only depend on the client and are computed once
+    per client and endpoint. The `get_*` methods merge in the `RequestOptions` of a call the way the generated
+    clients do, and hand out the precomputed values as they are when there are none.
+
+    The headers are shared by all the calls and must not be modified.
+    """
+
+    __slots__ = ("url", "headers", "timeout")
+
+    def __init__(self, *, url: str, headers: typing.Dict[str, typing.Any], timeout: typing.Optional[float]):
+        self.url = url
+        self.headers = headers
+        self.timeout = timeout
+
+    def get_params(
+        self, request_options: typing.Optional[RequestOptions]
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        if request_options is None:
+            return None
+        return encode_query(jsonable_encoder(request_options.get("additional_query_parameters")))
+
+    def get_headers(self, request_options: typing.Optional[RequestOptions]) -> typing.Dict[str, typing.Any]:
+        additional_headers = request_options.get("additional_headers") if request_options is not None else None
+        if not additional_headers:
+            return self.headers
+        return jsonable_encoder(remove_none_from_dict({**self.headers, **additional_headers}))
+
+    def get_timeout(self, request_options: typing.Optional[RequestOptions]) -> typing.Optional[float]:
+        if request_options is not None and request_options.get("timeout_in_seconds") is not None:
+            return request_options.get("timeout_in_seconds")
+        return self.timeout
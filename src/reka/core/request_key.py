@@ -0,0 +1,12 @@
+import hashlib
+import json
+import typing
+
+
+def request_key(*parts: typing.Any) -> str:
+    """
+    Returns a hash of `parts` encoded as canonical JSON, i.e. with sorted keys and no insignificant whitespace.
+    The parts must already be JSON-compatible, e.g. the output of `jsonable_encoder`.
+    """
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
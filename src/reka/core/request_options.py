@@ -2,10 +2,23 @@
 
 import typing
 
+from .response_format import ResponseFormat
+
 try:
-    from typing import NotRequired  # type: ignore
+    from typing import NotRequired, Required  # type: ignore
 except ImportError:
-    from typing_extensions import NotRequired  # type: ignore
+    from typing_extensions import NotRequired, Required  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import ReadOnly
+else:
+    try:
+        from typing_extensions import ReadOnly
+    except ImportError:
+        # typing_extensions < 4.9, where the qualifier only matters to type checkers anyway.
+        class ReadOnly:
+            def __class_getitem__(cls, item: typing.Any) -> typing.Any:
+                return item
 
 
 class RequestOptions(typing.TypedDict):
@@ -23,6 +36,8 @@ class RequestOptions(typing.TypedDict):
         - additional_query_parameters: typing.Dict[str, typing.Any]. A dictionary containing additional parameters to spread into the request's query parameters dict
 
         - additional_body_parameters: typing.Dict[str, typing.Any]. A dictionary containing additional parameters to spread into the request's body parameters dict
+
+        - response_format: ResponseFormat. What the response is returned as, overriding the client's response_format: "models", "raw" or "slots".
     """
 
     timeout_in_seconds: NotRequired[int]
@@ -30,3 +45,20 @@ class RequestOptions(typing.TypedDict):
     additional_headers: NotRequired[typing.Dict[str, typing.Any]]
     additional_query_parameters: NotRequired[typing.Dict[str, typing.Any]]
     additional_body_parameters: NotRequired[typing.Dict[str, typing.Any]]
+    response_format: NotRequired[ReadOnly[ResponseFormat]]
+
+
+class RawRequestOptions(RequestOptions):
+    """
+    `RequestOptions` with `response_format="raw"`, for which type checkers know that a call returns the decoded JSON.
+    """
+
+    response_format: ReadOnly[Required[typing.Literal["raw"]]]
+
+
+class SlotsRequestOptions(RequestOptions):
+    """
+    `RequestOptions` with `response_format="slots"`, for which type checkers know that a call returns `ResponseView`s.
+    """
+
+    response_format: ReadOnly[Required[typing.Literal["slots"]]]
@@ -0,0 +1,299 @@
+import abc
+import asyncio
+import collections
+import sqlite3
+import threading
+import time
+import typing
+
+from .request_key import request_key
+
+
+class ResponseCache(abc.ABC):
+    """
+    Base class for caches of raw response bodies, keyed by the canonical hash of a request (see `key`).
+
+    Subclasses implement `_get`, `_set`, `_clear` and `_size`; hit, miss, eviction and error counting is shared. A
+    cache can be shared between threads and between `Reka` and `AsyncReka` clients. A backend that fails to read or
+    write an entry never fails the call using it: the failure counts as an error and a miss.
+    """
+
+    # Whether `_get` and `_set` may block, e.g. on disk I/O, in which case `AsyncReka` calls them from a thread.
+    blocking = True
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._errors = 0
+
+    @staticmethod
+    def key(*parts: typing.Any) -> str:
+        """
+        Returns the canonical hash identifying a request made with `parts`, see `request_key`.
+        """
+        return request_key(*parts)
+
+    def get(self, key: str) -> typing.Optional[bytes]:
+        """
+        Returns the cached body for `key`, or None if it is missing or has expired.
+        """
+        try:
+            value = self._get(key)
+        except Exception:
+            self._record_error()
+            value = None
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Caches `value` under `key`, evicting other entries if the cache is full.
+        """
+        try:
+            self._set(key, value)
+        except Exception:
+            self._record_error()
+
+    async def get_async(self, key: str) -> typing.Optional[bytes]:
+        """
+        Like `get`, without blocking the event loop.
+        """
+        if not self.blocking:
+            return self.get(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    async def set_async(self, key: str, value: bytes) -> None:
+        """
+        Like `set`, without blocking the event loop.
+        """
+        if not self.blocking:
+            self.set(key, value)
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.set, key, value)
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        self._clear()
+
+    def _record_evictions(self, count: int) -> None:
+        if count:
+            with self._stats_lock:
+                self._evictions += count
+
+    def _record_error(self) -> None:
+        with self._stats_lock:
+            self._errors += 1
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> typing.Optional[bytes]:
+        ...
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _clear(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _size(self) -> typing.Tuple[int, int]:
+        """
+        Returns the number of entries and the number of bytes they hold.
+        """
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns the hit, miss, eviction and error counts along with the number of entries and the bytes they hold.
+        Entries dropped because they expired count as evictions.
+        """
+        try:
+            entries, size = self._size()
+        except Exception:
+            entries, size = 0, 0
+        with self._stats_lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "errors": self._errors,
+                "entries": entries,
+                "bytes": size,
+            }
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    An LRU cache held in memory, bounded by the total size of the cached bodies.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The total size of the cached bodies. The least recently used entries are evicted to stay within it.
+
+    ttl : typing.Optional[float]
+        The number of seconds an entry stays valid, or None to keep entries until they are evicted.
+    """
+
+    blocking = False
+
+    def __init__(self, *, max_bytes: int = 64 * 1024 * 1024, ttl: typing.Optional[float] = None) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[str, typing.Tuple[bytes, float]]" = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> typing.Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+                self._remove(key)
+                self._record_evictions(1)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def _set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic())
+            self._bytes += len(value)
+            evicted = 0
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        self._record_evictions(evicted)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _size(self) -> typing.Tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    A cache stored in a SQLite database, which several worker processes can share by pointing at the same file.
+
+    The database runs in WAL mode so that readers do not block each other. Expired entries are removed when they
+    are read and by `purge`. The hit, miss and eviction counts are per instance, not per database.
+
+    Parameters
+    ----------
+    path : str
+        The path of the database file, created if it does not exist.
+
+    ttl : typing.Optional[float]
+        The number of seconds an entry stays valid, or None to keep entries until they are cleared.
+
+    timeout : float
+        How many seconds to wait for another process to release its lock on the database.
+
+    max_entries : typing.Optional[int]
+        The number of entries the database holds. The oldest entries are evicted to stay within it when an entry is
+        added. With None, the default, the database grows without bound unless `ttl` is set and `purge` is called.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl: typing.Optional[float] = None,
+        timeout: float = 30.0,
+        max_entries: typing.Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections may only be used by the thread that created them.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> typing.Optional[bytes]:
+        connection = self._connect()
+        row = connection.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        # Wall clock time, so that entries written by other processes can be compared.
+        if self.ttl is not None and time.time() - stored_at >= self.ttl:
+            with connection:
+                deleted = connection.execute(
+                    "DELETE FROM responses WHERE key = ? AND stored_at = ?", (key, stored_at)
+                ).rowcount
+            self._record_evictions(deleted)
+            return None
+        return bytes(value)
+
+    def _set(self, key: str, value: bytes) -> None:
+        evicted = 0
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)", (key, value, time.time())
+            )
+            if self.max_entries is not None:
+                evicted = connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        self._record_evictions(evicted)
+
+    def _clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def _size(self) -> typing.Tuple[int, int]:
+        row = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses").fetchone()
+        return row[0], row[1]
+
+    def purge(self) -> int:
+        """
+        Removes every expired entry, returning how many were removed.
+        """
+        if self.ttl is None:
+            return 0
+        with self._connect() as connection:
+            deleted = connection.execute(
+                "DELETE FROM responses WHERE stored_at <= ?", (time.time() - self.ttl,)
+            ).rowcount
+        self._record_evictions(deleted)
+        return deleted
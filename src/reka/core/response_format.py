@@ -0,0 +1,134 @@
+"""
+What API responses are returned as. "models", the default, constructs the generated pydantic models. "raw" returns
+the decoded JSON as it is, and "slots" returns `ResponseView`s: read-only objects with the fields of the models as
+attributes, held in `__slots__`. Neither of them goes through `construct_type`.
+"""
+
+import typing
+
+from .pydantic_utilities import PYDANTIC_MODEL_TYPES, get_fields, pydantic_v1
+from .unchecked_base_model import construct_type
+
+ResponseFormat = typing.Literal["models", "raw", "slots"]
+RESPONSE_FORMATS: typing.Tuple[str, ...] = ("models", "raw", "slots")
+
+_Converter = typing.Callable[[typing.Any], typing.Any]
+
+
+class ResponseView:
+    """
+    A read-only view of a decoded response, with an attribute for each field of its model. Fields missing from the
+    response are None and fields the model does not have are dropped. Nested models, and lists of them, are views
+    too; anything else, such as message content, is left as decoded.
+    """
+
+    __slots__ = ()
+    # The name, alias and converter of each field, set on the view type of each model.
+    _fields: typing.ClassVar[typing.Tuple[typing.Tuple[str, str, typing.Optional[_Converter]], ...]] = ()
+
+    def __init__(self, values: typing.Mapping[str, typing.Any]) -> None:
+        for name, alias, convert in self._fields:
+            value = values.get(alias)
+            if value is None and alias != name:
+                value = values.get(name)
+            object.__setattr__(self, name, value if value is None or convert is None else convert(value))
+
+    if typing.TYPE_CHECKING:
+        # The fields are only known at runtime, from the model each view type is made for.
+        def __getattr__(self, name: str) -> typing.Any: ...
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _, _ in self._fields)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, _, _ in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+_view_types: typing.Dict[type, typing.Type[ResponseView]] = {}
+_converters: typing.Dict[typing.Any, typing.Optional[_Converter]] = {}
+
+
+def _view_type(model: typing.Type[typing.Any]) -> typing.Type[ResponseView]:
+    view_type = _view_types.get(model)
+    if view_type is None:
+        fields = get_fields(model)
+        names = tuple(field.name for field in fields)
+        view_type = _view_types[model] = typing.cast(
+            typing.Type[ResponseView], type(f"{model.__name__}View", (ResponseView,), {"__slots__": names})
+        )
+        # Set once the type is registered, so that models nesting themselves end up with one view type.
+        view_type._fields = tuple((field.name, field.alias, _converter(field.type_)) for field in fields)
+    return view_type
+
+
+def _converter(type_: typing.Any) -> typing.Optional[_Converter]:
+    """
+    Returns the function turning a decoded value of `type_` into views, or None if the value is left as it is.
+    """
+    try:
+        return _converters[type_]
+    except KeyError:
+        pass
+    converter: typing.Optional[_Converter] = None
+    origin = pydantic_v1.typing.get_origin(type_)
+    args = pydantic_v1.typing.get_args(type_)
+    if isinstance(type_, type) and issubclass(type_, PYDANTIC_MODEL_TYPES):
+        model = type_
+
+        def convert_model(value: typing.Any) -> typing.Any:
+            return _view_type(model)(value) if isinstance(value, dict) else value
+
+        converter = convert_model
+    elif origin == list and args:
+        convert_item = _converter(args[0])
+        if convert_item is not None:
+            convert = convert_item
+
+            def convert_list(value: typing.Any) -> typing.Any:
+                return [convert(item) for item in value] if isinstance(value, list) else value
+
+            converter = convert_list
+    elif pydantic_v1.typing.is_union(origin):
+        # Optional fields only, other unions are ambiguous without validating the value.
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            converter = _converter(members[0])
+    _converters[type_] = converter
+    return converter
+
+
+def get_response_format(
+    default: ResponseFormat, request_options: typing.Optional[typing.Mapping[str, typing.Any]]
+) -> ResponseFormat:
+    """
+    Returns the response format of a call: the one in its request options, or else the client's.
+    """
+    response_format = request_options.get("response_format") if request_options is not None else None
+    if response_format is None:
+        response_format = default
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown response format {response_format!r}, expected one of {', '.join(RESPONSE_FORMATS)}")
+    return response_format
+
+
+def decode_response(type_: typing.Any, object_: typing.Any, response_format: ResponseFormat) -> typing.Any:
+    """
+    Returns the decoded JSON `object_` of a response of type `type_` in `response_format`.
+    """
+    if response_format == "raw":
+        return object_
+    if response_format == "slots":
+        convert = _converter(type_)
+        return object_ if object_ is None or convert is None else convert(object_)
+    return construct_type(type_=type_, object_=object_)
@@ -0,0 +1,82 @@
+import threading
+import time
+import typing
+
+
+class RetryBudget:
+    """
+    A token bucket shared by every call made through a client, bounding retries to a fraction of recent traffic.
+
+    Every call deposits `retry_ratio` tokens and every retry withdraws one, so that with the default ratio retries
+    make up at most 20% of requests. On top of that, `min_retries_per_second` tokens trickle in over time so that
+    a client with very little traffic can still retry. The balance is capped at `max_tokens`, which means only
+    recent traffic earns retries; a long quiet period cannot be saved up and spent during an outage.
+
+    When the bucket is empty, calls fail fast with whatever the last attempt produced instead of retrying.
+
+    Parameters
+    ----------
+    retry_ratio : float
+        The number of retries allowed per call made, e.g. 0.2 allows one retry for every five calls.
+
+    min_retries_per_second : float
+        Retries allowed per second regardless of traffic volume.
+
+    max_tokens : float
+        The maximum number of retries that can be banked, which is also the initial balance.
+    """
+
+    def __init__(
+        self, *, retry_ratio: float = 0.2, min_retries_per_second: float = 1.0, max_tokens: float = 10.0
+    ) -> None:
+        if retry_ratio < 0 or min_retries_per_second < 0 or max_tokens < 1:
+            raise ValueError("retry_ratio and min_retries_per_second must be >= 0 and max_tokens must be >= 1")
+        self.retry_ratio = retry_ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._balance = max_tokens
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._exhausted = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(self._balance + (now - self._last_refill) * self.min_retries_per_second, self.max_tokens)
+        self._last_refill = now
+
+    def record_request(self) -> None:
+        """
+        Records a new call, depositing `retry_ratio` tokens.
+        """
+        with self._lock:
+            self._requests += 1
+            self._refill()
+            self._balance = min(self._balance + self.retry_ratio, self.max_tokens)
+
+    def try_acquire_retry(self) -> bool:
+        """
+        Withdraws a token for a retry, returning False if the budget is exhausted.
+        """
+        with self._lock:
+            self._refill()
+            if self._balance < 1:
+                self._exhausted += 1
+                return False
+            self._balance -= 1
+            self._retries += 1
+            return True
+
+    def stats(self) -> typing.Dict[str, float]:
+        """
+        Returns the counters for this budget: calls made, retries granted, retries denied and the current balance.
+        """
+        with self._lock:
+            self._refill()
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "exhausted": self._exhausted,
+                "balance": self._balance,
+            }
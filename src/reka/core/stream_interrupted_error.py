@@ -0,0 +1,16 @@
+import typing
+
+from .api_error import ApiError
+
+
+class StreamInterruptedError(ApiError):
+    """
+    Raised when a streaming response fails after it has started being delivered to the caller.
+
+    Failures that happen before the response is handed over are retried like any other request; once chunks have
+    been yielded the request can no longer be replayed transparently, so the underlying transport error is surfaced
+    through this type instead.
+    """
+
+    def __init__(self, *, status_code: typing.Optional[int] = None, body: typing.Any = None):
+        super().__init__(status_code=status_code, body=body)
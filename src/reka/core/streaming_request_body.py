@@ -0,0 +1,251 @@
+import asyncio
+import base64
+import json
+import threading
+import typing
+import uuid
+
+from .json_codec import with_json_content
+from .request_compression import RequestCompression
+
+
+class MediaFile(str):
+    """
+    Inline media that is read from an open binary file while the request is sent, rather than being held in memory
+    as a base64 `data:` URL. Use it wherever a media URL goes, e.g.
+    `{"type": "video_url", "video_url": MediaFile(open("clip.mp4", "rb"), "video/mp4")}`.
+
+    It is only expanded by a client created with a `StreamingRequestBody`. Anywhere else it is an opaque placeholder
+    string that the API rejects. The file is read from its position at the time the `MediaFile` was created, so it
+    can be sent again when a request is retried or hedged, as long as the file is seekable. Closing the file is up to
+    the caller.
+
+    Parameters
+    ----------
+    file : typing.BinaryIO
+        The file to read the media from.
+
+    mime_type : str
+        The media type to put in the `data:` URL, e.g. "image/jpeg".
+    """
+
+    file: typing.BinaryIO
+    mime_type: str
+    _start: int
+    _lock: threading.Lock
+
+    def __new__(cls, file: typing.BinaryIO, mime_type: str) -> "MediaFile":
+        # Being a str lets a MediaFile pass validation of the generated models, which keep it as it is.
+        self = super().__new__(cls, f"media-file:{uuid.uuid4().hex}")
+        self.file = file
+        self.mime_type = mime_type
+        self._start = file.tell()
+        self._lock = threading.Lock()
+        return self
+
+    def __copy__(self) -> "MediaFile":
+        return self
+
+    def __deepcopy__(self, memo: typing.Dict[int, typing.Any]) -> "MediaFile":
+        return self
+
+    def iter_data_url(self, chunk_size: int) -> typing.Iterator[bytes]:
+        """
+        Yields the `data:` URL for the file's content, base64 encoding about `chunk_size` bytes at a time.
+        """
+        yield f"data:{self.mime_type};base64,".encode("ascii")
+        read_size = max(chunk_size // 4 * 3, 3)
+        position = self._start
+        pending = b""
+        while True:
+            # Concurrent copies of a hedged request read the same file, each from its own position.
+            with self._lock:
+                self.file.seek(position)
+                data = self.file.read(read_size)
+            if not data:
+                break
+            position += len(data)
+            pending += data
+            # Only encode whole groups of 3 bytes, so that no padding ends up in the middle of the URL.
+            usable = len(pending) - len(pending) % 3
+            yield base64.b64encode(pending[:usable])
+            pending = pending[usable:]
+        if pending:
+            yield base64.b64encode(pending)
+
+
+def _dumps(value: typing.Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _key(key: typing.Any) -> bytes:
+    # The same conversion json.dumps applies to keys that are not strings.
+    return _dumps(key if isinstance(key, str) else json.dumps(key))
+
+
+def _pieces(value: typing.Any, chunk_size: int) -> typing.Iterator[bytes]:
+    if isinstance(value, MediaFile):
+        yield b'"'
+        yield from value.iter_data_url(chunk_size)
+        yield b'"'
+    elif isinstance(value, str):
+        # A character encodes to at most 6 bytes (as a \uXXXX escape), so quarter-chunk slices stay near the chunk size.
+        slice_size = max(chunk_size // 4, 1)
+        if len(value) <= slice_size:
+            yield _dumps(value)
+            return
+        yield b'"'
+        for start in range(0, len(value), slice_size):
+            yield _dumps(value[start : start + slice_size])[1:-1]
+        yield b'"'
+    elif isinstance(value, dict):
+        yield b"{"
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                yield b","
+            yield _key(key)
+            yield b":"
+            yield from _pieces(item, chunk_size)
+        yield b"}"
+    elif isinstance(value, (list, tuple)):
+        yield b"["
+        for i, item in enumerate(value):
+            if i:
+                yield b","
+            yield from _pieces(item, chunk_size)
+        yield b"]"
+    else:
+        yield _dumps(value)
+
+
+def iter_json(value: typing.Any, chunk_size: int = 64 * 1024) -> typing.Iterator[bytes]:
+    """
+    Encodes `value`, the output of `jsonable_encoder`, as the same compact JSON that `RequestCompression.encode`
+    produces, in chunks of about `chunk_size` bytes. Long strings are encoded a slice at a time and `MediaFile`s are
+    read as they are encoded, so no more than a few chunks are held at once.
+    """
+    buffer = bytearray()
+    for piece in _pieces(value, chunk_size):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _Chunks:
+    """
+    A body that can be iterated more than once, so that it can be sent again on a retry.
+    """
+
+    def __init__(self, produce: typing.Callable[[], typing.Iterator[bytes]]) -> None:
+        self._produce = produce
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        return self._produce()
+
+
+class _AsyncChunks:
+    """
+    Produces the chunks of a `_Chunks` body on a worker thread, so that reading files and compressing never blocks
+    the event loop.
+    """
+
+    def __init__(self, chunks: _Chunks) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        chunks = iter(self._chunks)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+
+class StreamingRequestBody:
+    """
+    Sends the JSON bodies of chat requests as a stream of chunks, written while the request is sent, instead of
+    encoding each of them into one large string first. A request with a 50 MB base64 video would otherwise hold that
+    video several times over: as the base64 string, as the encoded JSON string and as the bytes sent. With streaming,
+    the memory a request needs on top of the caller's own objects stays at a few chunks, and with `MediaFile`s even
+    the base64 strings are never built.
+
+    Streamed bodies are sent with chunked transfer encoding. With `RequestCompression` as well, the first `threshold`
+    bytes are encoded up front to decide whether to compress, and larger bodies are then compressed chunk by chunk.
+
+    Parameters
+    ----------
+    chunk_size : int
+        The approximate size, in bytes, of the chunks the body is sent in.
+    """
+
+    def __init__(self, *, chunk_size: int = 64 * 1024) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._bytes = 0
+
+    def _iter_counted(self, body: typing.Any) -> typing.Iterator[bytes]:
+        sent = 0
+        for chunk in iter_json(body, self.chunk_size):
+            sent += len(chunk)
+            yield chunk
+        with self._lock:
+            self._requests += 1
+            self._bytes += sent
+
+    def iter_bytes(self, body: typing.Any) -> typing.Iterable[bytes]:
+        """
+        Returns the JSON encoding of `body` as an iterable of chunks, which can be iterated more than once.
+        """
+        return _Chunks(lambda: self._iter_counted(body))
+
+    def aiter_bytes(self, body: typing.Any) -> typing.AsyncIterable[bytes]:
+        """
+        Like `iter_bytes`, as an async iterable whose chunks are produced on a worker thread.
+        """
+        return _AsyncChunks(_Chunks(lambda: self._iter_counted(body)))
+
+    def apply(
+        self, kwargs: typing.Dict[str, typing.Any], compression: typing.Optional[RequestCompression] = None
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Returns the request arguments `kwargs` with the `json` argument replaced by its streamed encoding, compressed
+        with `compression` if the body reaches its threshold.
+        """
+        body = kwargs["json"]
+        chunks = _Chunks(lambda: self._iter_counted(body))
+        if compression is None:
+            return with_json_content(kwargs, chunks)
+        head = bytearray()
+        for chunk in iter_json(body, self.chunk_size):
+            head += chunk
+            if len(head) >= compression.threshold:
+                break
+        else:
+            # The whole body is below the threshold, so it is small enough to send in one piece.
+            return compression.apply(kwargs, bytes(head), compression.compress(bytes(head)))
+        return with_json_content(kwargs, _Chunks(lambda: compression.compress_chunks(chunks)), compression.encoding)
+
+    async def apply_async(
+        self, kwargs: typing.Dict[str, typing.Any], compression: typing.Optional[RequestCompression] = None
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Like `apply`, for an async client: the body's chunks are produced on a worker thread.
+        """
+        kwargs = await asyncio.get_running_loop().run_in_executor(None, self.apply, kwargs, compression)
+        if isinstance(kwargs["content"], _Chunks):
+            kwargs["content"] = _AsyncChunks(kwargs["content"])
+        return kwargs
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns how many bodies were streamed in full, and how many bytes of JSON they added up to.
+        """
+        with self._lock:
+            return {"requests": self._requests, "bytes": self._bytes}
@@ -0,0 +1,194 @@
+import asyncio
+import concurrent.futures
+import threading
+import typing
+from time import monotonic
+
+T = typing.TypeVar("T")
+
+
+class _Entry:
+    def __init__(self, value: typing.Any, fetched_at: float) -> None:
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class TTLCache:
+    """
+    Caches the results of calls that rarely change, such as listing models, for `ttl` seconds.
+
+    Once an entry is older than `ttl` but younger than `ttl + stale_while_revalidate`, it is still returned right
+    away while a single background fetch refreshes it, so callers never wait for the refresh. Only a missing entry,
+    or one past both windows, is fetched while the caller waits. Concurrent fetches of the same key are collapsed
+    into one. A failed background refresh leaves the stale entry in place.
+
+    One cache can be shared between threads using `Reka`; calls made with `AsyncReka` are fetched per event loop.
+
+    Parameters
+    ----------
+    ttl : float
+        The number of seconds an entry is returned without being refreshed.
+
+    stale_while_revalidate : float
+        The number of seconds past `ttl` during which an entry is still returned while it is refreshed in the
+        background. Set to 0 to always wait for the refresh.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, stale_while_revalidate: float = 300.0) -> None:
+        if ttl < 0 or stale_while_revalidate < 0:
+            raise ValueError("ttl and stale_while_revalidate must be >= 0")
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._lock = threading.Lock()
+        self._entries: typing.Dict[str, _Entry] = {}
+        self._fetches: typing.Dict[str, "concurrent.futures.Future[typing.Any]"] = {}
+        self._tasks: typing.Dict[typing.Tuple[int, str], "asyncio.Future[typing.Any]"] = {}
+        # Bumped by invalidate, so that fetches started before it do not store what they fetched.
+        self._generation = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._errors = 0
+
+    def _lookup(self, key: str) -> typing.Tuple[typing.Optional[_Entry], bool]:
+        """
+        Returns the entry for `key` if it can still be used, and whether it is fresh.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        age = monotonic() - entry.fetched_at
+        if age < self.ttl:
+            return entry, True
+        if age < self.ttl + self.stale_while_revalidate:
+            return entry, False
+        return None, False
+
+    def _store(self, key: str, value: typing.Any, generation: int) -> None:
+        with self._lock:
+            self._refreshes += 1
+            if generation == self._generation:
+                self._entries[key] = _Entry(value, monotonic())
+
+    def _record_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    def get(self, key: str, fetch: typing.Callable[[], T]) -> T:
+        """
+        Returns the cached value for `key`, calling `fetch` to fill or refresh it as described above.
+        """
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            if entry is not None and fresh:
+                self._hits += 1
+                return typing.cast(T, entry.value)
+            if entry is not None:
+                self._stale_hits += 1
+            else:
+                self._misses += 1
+            future = self._fetches.get(key)
+            owner = future is None
+            if future is None:
+                future = concurrent.futures.Future()
+                self._fetches[key] = future
+            generation = self._generation
+        if entry is not None:
+            if owner:
+                threading.Thread(
+                    target=self._fetch, args=(key, fetch, future, generation), name="reka-ttl-cache", daemon=True
+                ).start()
+            return typing.cast(T, entry.value)
+        if owner:
+            self._fetch(key, fetch, future, generation)
+        return typing.cast(T, future.result())
+
+    def _fetch(
+        self,
+        key: str,
+        fetch: typing.Callable[[], typing.Any],
+        future: "concurrent.futures.Future[typing.Any]",
+        generation: int,
+    ) -> None:
+        try:
+            value = fetch()
+        except BaseException as e:
+            self._record_error()
+            with self._lock:
+                del self._fetches[key]
+            future.set_exception(e)
+            return
+        self._store(key, value, generation)
+        with self._lock:
+            del self._fetches[key]
+        future.set_result(value)
+
+    async def get_async(self, key: str, fetch: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """
+        Returns the cached value for `key`, awaiting `fetch` to fill or refresh it as described above.
+        """
+        with self._lock:
+            entry, fresh = self._lookup(key)
+            if entry is not None and fresh:
+                self._hits += 1
+                return typing.cast(T, entry.value)
+            if entry is not None:
+                self._stale_hits += 1
+            else:
+                self._misses += 1
+            generation = self._generation
+        task_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_async(key, fetch, generation))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda finished: self._finish_async(task_key, finished))
+        if entry is not None:
+            return typing.cast(T, entry.value)
+        # Shielded, so that a cancelled caller does not cancel a fetch other callers are waiting for.
+        return typing.cast(T, await asyncio.shield(task))
+
+    async def _fetch_async(
+        self, key: str, fetch: typing.Callable[[], typing.Awaitable[typing.Any]], generation: int
+    ) -> typing.Any:
+        try:
+            value = await fetch()
+        except Exception:
+            self._record_error()
+            raise
+        self._store(key, value, generation)
+        return value
+
+    def _finish_async(self, task_key: typing.Tuple[int, str], task: "asyncio.Future[typing.Any]") -> None:
+        self._tasks.pop(task_key, None)
+        # Background refreshes have nobody awaiting them, so their errors are retrieved here.
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, key: typing.Optional[str] = None) -> None:
+        """
+        Drops the entry for `key`, or every entry if no key is given, so that the next call fetches it again.
+        Fetches already in flight are still shared, but what they return is not cached.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Returns how many calls were answered from a fresh entry, from a stale entry, or had to wait for a fetch,
+        along with the number of completed and failed fetches and the number of entries.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "errors": self._errors,
+                "entries": len(self._entries),
+            }
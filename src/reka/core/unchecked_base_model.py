@@ -1,35 +1,60 @@
 # This file was auto-generated by Fern from our API Definition.
 
 import datetime as dt
+import enum
 import inspect
 import typing
 import uuid
 
+import pydantic
 import typing_extensions
 
 from .datetime_utils import serialize_datetime
-from .pydantic_utilities import IS_PYDANTIC_V2, pydantic_v1
+from .pydantic_utilities import (
+    IS_PYDANTIC_V2,
+    PYDANTIC_MODEL_TYPES,
+    USE_PYDANTIC_V2,
+    BaseModel,
+    ModelFieldInfo,
+    deep_union_pydantic_dicts,
+    get_fields,
+    is_pydantic_v2_model,
+    parse_obj_as,
+    pydantic_v1,
+)
 
 
 class UnionMetadata:
     discriminant: str
+    tags: typing.Mapping[typing.Any, typing.Any]
 
-    def __init__(self, *, discriminant: str) -> None:
+    def __init__(
+        self, *, discriminant: str, tags: typing.Optional[typing.Mapping[typing.Any, typing.Any]] = None
+    ) -> None:
+        # `tags` names the member for values of the discriminant that the members' annotations do not spell out.
         self.discriminant = discriminant
+        self.tags = tags or {}
 
 
-Model = typing.TypeVar("Model", bound=pydantic_v1.BaseModel)
+Model = typing.TypeVar("Model", bound=BaseModel)
+_Decoder = typing.Callable[[typing.Any], typing.Any]
 
 
-class UncheckedBaseModel(pydantic_v1.BaseModel):
-    # Allow extra fields
-    class Config:
-        extra = pydantic_v1.Extra.allow
-        smart_union = True
-        allow_population_by_field_name = True
-        populate_by_name = True
-        extra = pydantic_v1.Extra.allow
-        json_encoders = {dt.datetime: serialize_datetime}
+class UncheckedBaseModel(BaseModel):
+    if USE_PYDANTIC_V2:
+        # Allow extra fields
+        model_config: typing.ClassVar[pydantic.ConfigDict] = pydantic.ConfigDict(  # type: ignore # Pydantic v2
+            extra="allow", populate_by_name=True
+        )
+    else:
+        # Allow extra fields
+        class Config:
+            extra = pydantic_v1.Extra.allow
+            smart_union = True
+            allow_population_by_field_name = True
+            populate_by_name = True
+            extra = pydantic_v1.Extra.allow
+            json_encoders = {dt.datetime: serialize_datetime}
 
     # Allow construct to not validate model
     # Implementation taken from: https://github.com/pydantic/pydantic/issues/1168#issuecomment-817742836
@@ -40,29 +65,26 @@ class UncheckedBaseModel(pydantic_v1.BaseModel):
         m = cls.__new__(cls)  # type: ignore
         fields_values = {}
 
-        config = cls.__config__
+        allow_population_by_field_name, has_private_attributes, fields = _get_construct_plan(cls)
 
         if _fields_set is None:
             _fields_set = set(values.keys())
 
-        for name, field in cls.__fields__.items():
-            key = field.alias
-            if (
-                key not in values and config.allow_population_by_field_name
-            ):  # Added this to allow population by field name
+        for name, key, required, decode, get_default in fields:
+            if key not in values and allow_population_by_field_name:  # Added this to allow population by field name
                 key = name
 
             if key in values:
+                value = values[key]
                 if (
-                    values[key] is None and not field.required
+                    value is None and not required
                 ):  # Moved this check since None value can be passed for Optional nested field
-                    fields_values[name] = field.get_default()
+                    fields_values[name] = get_default()
                 else:
-                    type_ = typing.cast(typing.Type, field.outer_type_)  # type: ignore
-                    fields_values[name] = construct_type(object_=values[key], type_=type_)
+                    fields_values[name] = decode(value)
                 _fields_set.add(name)
-            elif not field.required:
-                default = field.get_default()
+            elif not required:
+                default = get_default()
                 fields_values[name] = default
 
                 # If the default values are non-null act like they've been set
@@ -81,6 +103,17 @@ class UncheckedBaseModel(pydantic_v1.BaseModel):
                     _fields_set.add(key)
                     fields_values[key] = value
 
+        if USE_PYDANTIC_V2:
+            object.__setattr__(m, "__dict__", fields_values)
+            object.__setattr__(m, "__pydantic_fields_set__", _fields_set)
+            object.__setattr__(m, "__pydantic_extra__", _extra)
+            if has_private_attributes:
+                # As in `model_construct`, `model_post_init` sets up the private attributes.
+                m.model_post_init(None)
+            else:
+                object.__setattr__(m, "__pydantic_private__", None)
+            return m
+
         if IS_PYDANTIC_V2:
             object.__setattr__(m, "__pydantic_private__", None)
             object.__setattr__(m, "__pydantic_extra__", _extra)
@@ -88,57 +121,442 @@ class UncheckedBaseModel(pydantic_v1.BaseModel):
 
         object.__setattr__(m, "__dict__", fields_values)
         object.__setattr__(m, "__fields_set__", _fields_set)
-        m._init_private_attributes()
+        if has_private_attributes:
+            m._init_private_attributes()  # type: ignore # Pydantic v1
         return m
 
+    if USE_PYDANTIC_V2:
+
+        @classmethod
+        def model_construct(
+            cls: typing.Type["Model"], _fields_set: typing.Optional[typing.Set[str]] = None, **values: typing.Any
+        ) -> "Model":
+            return cls.construct(_fields_set, **values)  # type: ignore
+
+        @classmethod
+        def model_rebuild(cls, **kwargs: typing.Any) -> typing.Optional[bool]:
+            # Pydantic 2 replaces the fields of a model it rebuilds, e.g. once its forward references resolve.
+            _construct_plans.pop(cls, None)
+            return super().model_rebuild(**kwargs)
+
+        @pydantic.model_validator(mode="wrap")
+        @classmethod
+        def _keep_str_subclasses(cls, data: typing.Any, handler: typing.Any) -> typing.Any:
+            # Pydantic 2 validates instances of `str` subclasses, such as `MediaFile`, into plain strings, where
+            # `pydantic.v1` kept them as they are.
+            model = handler(data)
+            if type(data) is dict and isinstance(model, UncheckedBaseModel):
+                values = model.__dict__
+                for name, key, *_ in _get_construct_plan(type(model))[2]:
+                    value = data.get(key, data.get(name))
+                    if (
+                        isinstance(value, str)
+                        and type(value) is not str
+                        and not isinstance(value, enum.Enum)
+                        and values.get(name) == value
+                    ):
+                        values[name] = value
+            return model
+
+    def json(self, **kwargs: typing.Any) -> str:
+        kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        if USE_PYDANTIC_V2:
+            return super().model_dump_json(**{"warnings": False, **kwargs_with_defaults})
+        if not _is_single_pass(type(self)) or not _PYDANTIC_JSON_KWARGS.isdisjoint(kwargs):
+            return super().json(**kwargs_with_defaults)
+
+        by_alias = bool(kwargs_with_defaults.pop("by_alias"))
+        flags = _pass_flags(kwargs_with_defaults.pop("exclude_unset"), kwargs_with_defaults.pop("exclude_none", False))
+        data = _model_dict(self, flags, flags, by_alias)
+        return self.__config__.json_dumps(  # type: ignore # Pydantic v1
+            data, default=self.__json_encoder__, **kwargs_with_defaults  # type: ignore # Pydantic v1
+        )
+
+    def dict(self, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        kwargs_with_defaults_exclude_unset: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+        kwargs_with_defaults_exclude_none: typing.Any = {"by_alias": True, "exclude_none": True, **kwargs}
+
+        if _is_single_pass(type(self)) and kwargs.keys() <= _SINGLE_PASS_DICT_KWARGS:
+            # The union of both passes below, built in one
+            return _model_dict(
+                self,
+                _pass_flags(
+                    kwargs_with_defaults_exclude_unset["exclude_unset"],
+                    kwargs_with_defaults_exclude_unset.get("exclude_none", False),
+                ),
+                _pass_flags(
+                    kwargs_with_defaults_exclude_none.get("exclude_unset", False),
+                    kwargs_with_defaults_exclude_none["exclude_none"],
+                ),
+                bool(kwargs_with_defaults_exclude_unset["by_alias"]),
+            )
+        if USE_PYDANTIC_V2:
+            # Constructed models hold whatever the API returned, which pydantic would otherwise warn about.
+            return deep_union_pydantic_dicts(
+                super().model_dump(**{"warnings": False, **kwargs_with_defaults_exclude_unset}),
+                super().model_dump(**{"warnings": False, **kwargs_with_defaults_exclude_none}),
+            )
+        return deep_union_pydantic_dicts(
+            super().dict(**kwargs_with_defaults_exclude_unset), super().dict(**kwargs_with_defaults_exclude_none)
+        )
+
+
+# `dict()` merges an exclude_unset pass over a model into an exclude_none pass, and on `pydantic.v1` nested models
+# passed on to the `dict()` of their own do it again, which doubles the work at every level of nesting. `_model_dict`
+# builds the same output in one pass. A pass is described by its flags, and where the two passes differ a value is
+# built from both: nested models and dicts are merged, anything else, e.g. a list, is taken from the first pass.
+_EXCLUDE_UNSET = 1
+_EXCLUDE_NONE = 2
+
+_SINGLE_PASS_DICT_KWARGS = frozenset(("by_alias", "exclude_unset", "exclude_none"))
+# The arguments of `json()` other than the ones above, anything else is passed on to `json_dumps`.
+_PYDANTIC_JSON_KWARGS = frozenset(
+    ("include", "exclude", "skip_defaults", "exclude_defaults", "encoder", "models_as_dict")
+)
+
+
+def _pass_flags(exclude_unset: bool, exclude_none: bool) -> int:
+    return (_EXCLUDE_UNSET if exclude_unset else 0) | (_EXCLUDE_NONE if exclude_none else 0)
+
+
+# Whether each model class is serialized by `_model_dict`, and the aliases of its fields.
+_single_pass_aliases: typing.Dict[type, typing.Optional[typing.Dict[str, str]]] = {}
+
+
+def _get_single_pass_aliases(cls: typing.Any) -> typing.Optional[typing.Dict[str, str]]:
+    try:
+        return _single_pass_aliases[cls]
+    except KeyError:
+        pass
+    aliases: typing.Optional[typing.Dict[str, str]] = None
+    if not issubclass(cls, UncheckedBaseModel) or cls.dict is not UncheckedBaseModel.dict:
+        pass
+    elif USE_PYDANTIC_V2:
+        # Pydantic 2 serializes a model by its schema, which only adds to `model_dump` when it customizes it.
+        decorators = cls.__pydantic_decorators__
+        if (
+            cls.model_dump is pydantic.BaseModel.model_dump
+            and not cls.model_computed_fields
+            and not decorators.field_serializers
+            and not decorators.model_serializers
+            and not cls.model_config.get("use_enum_values")
+            and not any(field.exclude for field in cls.model_fields.values())
+        ):
+            aliases = {name: field.serialization_alias or name for name, field in cls.model_fields.items()}
+    elif (
+        cls.json is UncheckedBaseModel.json
+        and not cls.__custom_root_type__
+        and cls.__include_fields__ is None
+        and cls.__exclude_fields__ is None
+        and not getattr(cls.Config, "use_enum_values", False)
+    ):
+        aliases = {name: field.alias for name, field in cls.__fields__.items()}
+    _single_pass_aliases[cls] = aliases
+    return aliases
 
-def _convert_undiscriminated_union_type(union_type: typing.Type[typing.Any], object_: typing.Any) -> typing.Any:
-    inner_types = pydantic_v1.typing.get_args(union_type)
-    if typing.Any in inner_types:
-        return object_
 
-    for inner_type in inner_types:
-        try:
-            if inspect.isclass(inner_type) and issubclass(inner_type, pydantic_v1.BaseModel):
-                # Attempt a validated parse until one works
-                return pydantic_v1.parse_obj_as(inner_type, object_)
-        except Exception:
-            continue
+def _is_single_pass(cls: type) -> bool:
+    return _get_single_pass_aliases(cls) is not None
+
+
+def _model_dict(model: typing.Any, first: int, second: int, by_alias: bool) -> typing.Dict[str, typing.Any]:
+    """
+    Returns `deep_union_pydantic_dicts` of the `dict()` passes over `model` with the flags `first` and `second`.
+    """
+    aliases = _get_single_pass_aliases(type(model)) if by_alias else None
+    if USE_PYDANTIC_V2:
+        # Pydantic 2 keeps the extra fields apart, after the others, and always counts them as set.
+        extra = model.__pydantic_extra__
+        fields_set = model.__pydantic_fields_set__ | extra.keys() if extra else model.__pydantic_fields_set__
+        items = {**model.__dict__, **extra}.items() if extra else model.__dict__.items()
+    else:
+        fields_set = model.__fields_set__
+        items = model.__dict__.items()
+    result = {}
+    # `deep_union_pydantic_dicts` appends what only the first pass has, e.g. fields explicitly set to None.
+    first_only = []
+    for key, value in items:
+        dict_key = aliases.get(key, key) if aliases is not None else key
+        in_first = (not first & _EXCLUDE_UNSET or key in fields_set) and (
+            not first & _EXCLUDE_NONE or value is not None
+        )
+        if (not second & _EXCLUDE_UNSET or key in fields_set) and (not second & _EXCLUDE_NONE or value is not None):
+            if not in_first:
+                result[dict_key] = _dict_value(value, second, second, by_alias)
+            elif isinstance(value, (dict, BaseModel)):
+                result[dict_key] = _dict_value(value, first, second, by_alias)
+            else:
+                result[dict_key] = _dict_value(value, first, first, by_alias)
+        elif in_first:
+            first_only.append((dict_key, value))
+    for dict_key, value in first_only:
+        result[dict_key] = _dict_value(value, first, first, by_alias)
+    return result
+
+
+def _dict_value(value: typing.Any, first: int, second: int, by_alias: bool) -> typing.Any:
+    """
+    Returns what `dict()` makes of `value` in a model, for both passes.
+    """
+    cls = type(value)
+    if cls is str or cls is int or cls is float or cls is bool or value is None:
+        return value
+    if isinstance(value, BaseModel):
+        if _is_single_pass(cls):
+            return _model_dict(value, first, second, by_alias)
+        first_value = _nested_model_dict(value, first, by_alias)
+        if first == second or not isinstance(first_value, dict):
+            return first_value
+        return deep_union_pydantic_dicts(first_value, _nested_model_dict(value, second, by_alias))
+    if isinstance(value, dict):
+        if first == second:
+            return {key: _dict_value(item, first, first, by_alias) for key, item in value.items()}
+        return {
+            key: _dict_value(item, first, second if isinstance(item, (dict, BaseModel)) else first, by_alias)
+            for key, item in value.items()
+        }
+    if pydantic_v1.utils.sequence_like(value):
+        items = (_dict_value(item, first, first, by_alias) for item in value)
+        return cls(*items) if pydantic_v1.typing.is_namedtuple(cls) else cls(items)
+    return value
+
+
+def _nested_model_dict(model: typing.Any, flags: int, by_alias: bool) -> typing.Any:
+    # Any other model is serialized the way its parent's serializer would.
+    if USE_PYDANTIC_V2:
+        return model.model_dump(
+            by_alias=by_alias,
+            exclude_unset=bool(flags & _EXCLUDE_UNSET),
+            exclude_none=bool(flags & _EXCLUDE_NONE),
+            warnings=False,
+        )
+    value = model.dict(
+        by_alias=by_alias,
+        exclude_unset=bool(flags & _EXCLUDE_UNSET),
+        exclude_defaults=False,
+        include=None,
+        exclude=None,
+        exclude_none=bool(flags & _EXCLUDE_NONE),
+    )
+    return value[pydantic_v1.utils.ROOT_KEY] if pydantic_v1.utils.ROOT_KEY in value else value
+
+
+# What `construct` needs to know about a model: whether it can be populated by field name, whether it has private
+# attributes, and for each field its name, alias, whether it is required, its decoder and its default.
+_ConstructPlan = typing.Tuple[
+    bool, bool, typing.List[typing.Tuple[str, str, bool, _Decoder, typing.Callable[[], typing.Any]]]
+]
+_construct_plans: typing.Dict[type, _ConstructPlan] = {}
+
+
+def _get_construct_plan(cls: typing.Type[BaseModel]) -> _ConstructPlan:
+    try:
+        return _construct_plans[cls]
+    except KeyError:
+        pass
+    if is_pydantic_v2_model(cls):
+        config = typing.cast(typing.Any, cls).model_config
+        plan = _construct_plans[cls] = (
+            bool(config.get("populate_by_name") or config.get("validate_by_name")),
+            bool(typing.cast(typing.Any, cls).__pydantic_post_init__),
+            [
+                (field.name, field.alias, field.required, _get_decoder(field.type_), _field_default(field))
+                for field in get_fields(cls)
+            ],
+        )
+        return plan
+    plan = _construct_plans[cls] = (
+        bool(typing.cast(typing.Any, cls).__config__.allow_population_by_field_name),
+        bool(cls.__private_attributes__),
+        [
+            (field.name, field.alias, field.required, _field_decoder(field.field), _field_default(field))
+            for field in get_fields(cls)
+        ],
+    )
+    return plan
+
+
+def _field_decoder(field: pydantic_v1.fields.ModelField) -> _Decoder:
+    type_: typing.Any = None
+    decoder: _Decoder = _identity
+
+    def decode(value: typing.Any) -> typing.Any:
+        nonlocal type_, decoder
+        # The type is looked up on every call, since `update_forward_refs` replaces it in place.
+        if field.outer_type_ is not type_:
+            type_ = field.outer_type_
+            decoder = _get_decoder(type_)
+        return decoder(value)
+
+    return decode
+
+
+def _field_default(field: ModelFieldInfo) -> typing.Callable[[], typing.Any]:
+    if field.default is None and field.field.default_factory is None:
+        # `get_default` hands out a copy of the default, and a copy of None is None.
+        return _none
+    return field.get_default
+
+
+def _none() -> None:
+    return None
+
+
+def _identity(object_: typing.Any) -> typing.Any:
+    return object_
 
-    # If none of the types work, just return the first successful cast
+
+def _literal_values(type_: typing.Any) -> typing.List[typing.Any]:
+    if pydantic_v1.typing.is_literal_type(type_):
+        return list(pydantic_v1.typing.all_literal_values(type_))
+    if pydantic_v1.typing.is_union(pydantic_v1.typing.get_origin(type_)):
+        return [value for inner_type in pydantic_v1.typing.get_args(type_) for value in _literal_values(inner_type)]
+    return []
+
+
+def _discriminant_tags(
+    inner_types: typing.Sequence[typing.Any], discriminant: str
+) -> typing.Dict[typing.Any, typing.Any]:
+    """
+    Returns the member of the union each value of the discriminant stands for: the default of the member's
+    discriminant field, as well as the literals its type allows.
+    """
+    tags: typing.Dict[typing.Any, typing.Any] = {}
     for inner_type in inner_types:
-        try:
-            return construct_type(object_=object_, type_=inner_type)
-        except Exception:
+        if not (inspect.isclass(inner_type) and issubclass(inner_type, PYDANTIC_MODEL_TYPES)):
             continue
+        for field in get_fields(inner_type):
+            if field.name == discriminant:
+                values = [] if field.default is None else [field.default]
+                for value in values + _literal_values(field.type_):
+                    tags.setdefault(value, inner_type)
+    return tags
+
 
+def _union_tags(type_: typing.Any) -> typing.List[typing.Tuple[str, typing.Dict[typing.Any, typing.Any]]]:
+    """
+    Returns the discriminants of the union `type_` and their tags, if it is annotated with `UnionMetadata`.
+    """
+    if (pydantic_v1.typing.get_origin(type_) or type_) != typing_extensions.Annotated:
+        return []
+    union_type, *annotated_metadata = pydantic_v1.typing.get_args(type_)
+    inner_types = pydantic_v1.typing.get_args(union_type)
+    return [
+        (metadata.discriminant, {**_discriminant_tags(inner_types, metadata.discriminant), **metadata.tags})
+        for metadata in annotated_metadata
+        if isinstance(metadata, UnionMetadata)
+    ]
+
+
+def _compile_item_matcher(type_: typing.Any) -> typing.Callable[[typing.Any], bool]:
+    """
+    Returns whether a value could be an item of a `typing.List[type_]`, as far as that can be told without decoding
+    it: the tag of a discriminated union, the required fields of a model, or a string.
+    """
+    union_tags = _union_tags(type_)
+    if union_tags:
 
-def _convert_union_type(type_: typing.Type[typing.Any], object_: typing.Any) -> typing.Any:
+        def matches_tag(value: typing.Any) -> bool:
+            try:
+                return isinstance(value, typing.Mapping) and all(
+                    value.get(discriminant) in tags for discriminant, tags in union_tags
+                )
+            except TypeError:
+                # An unhashable tag
+                return False
+
+        return matches_tag
+
+    base_type = pydantic_v1.typing.get_origin(type_) or type_
+    if inspect.isclass(base_type) and issubclass(base_type, PYDANTIC_MODEL_TYPES):
+        required = [(field.alias, field.name) for field in get_fields(base_type) if field.required]
+
+        def matches_fields(value: typing.Any) -> bool:
+            return isinstance(value, typing.Mapping) and all(
+                alias in value or name in value for alias, name in required
+            )
+
+        return matches_fields
+
+    if base_type == str:
+        return lambda value: isinstance(value, str)
+    return lambda value: True
+
+
+def _compile_union_decoder(type_: typing.Any) -> _Decoder:
+    """
+    Returns the decoder for the union `type_`, with its members looked up once.
+    """
     base_type = pydantic_v1.typing.get_origin(type_) or type_
     union_type = type_
     if base_type == typing_extensions.Annotated:
         union_type = pydantic_v1.typing.get_args(type_)[0]
-        annotated_metadata = pydantic_v1.typing.get_args(type_)[1:]
-        for metadata in annotated_metadata:
-            if isinstance(metadata, UnionMetadata):
-                try:
-                    # Cast to the correct type, based on the discriminant
-                    for inner_type in pydantic_v1.typing.get_args(union_type):
-                        if inner_type.__fields__[metadata.discriminant].default == getattr(
-                            object_, metadata.discriminant
-                        ):
-                            return construct_type(object_=object_, type_=inner_type)
-                except Exception:
-                    # Allow to fall through to our regular union handling
-                    pass
-    return _convert_undiscriminated_union_type(union_type, object_)
+    union_tags = _union_tags(type_)
+    inner_types = pydantic_v1.typing.get_args(union_type)
+    has_any = typing.Any in inner_types
+    if has_any and not union_tags:
+        return _identity
 
+    model_types = []
+    list_types = []
+    for inner_type in inner_types:
+        try:
+            if inspect.isclass(inner_type) and issubclass(inner_type, PYDANTIC_MODEL_TYPES):
+                model_types.append(inner_type)
+        except Exception:
+            continue
+        if pydantic_v1.typing.get_origin(inner_type) == list and pydantic_v1.typing.get_args(inner_type):
+            list_types.append((inner_type, _compile_item_matcher(pydantic_v1.typing.get_args(inner_type)[0])))
+
+    def decode(object_: typing.Any) -> typing.Any:
+        for discriminant, tags in union_tags:
+            try:
+                # Cast to the correct type, based on the discriminant
+                if type(object_) is dict or isinstance(object_, typing.Mapping):
+                    inner_type = tags.get(object_.get(discriminant))
+                else:
+                    inner_type = tags.get(getattr(object_, discriminant))
+                if inner_type is not None:
+                    return construct_type(object_=object_, type_=inner_type)
+            except Exception:
+                # Allow to fall through to our regular union handling
+                pass
+
+        if has_any:
+            return object_
 
-def construct_type(*, type_: typing.Type[typing.Any], object_: typing.Any) -> typing.Any:
+        for inner_type in model_types:
+            try:
+                # Attempt a validated parse until one works
+                return parse_obj_as(inner_type, object_)
+            except Exception:
+                continue
+
+        if list_types and isinstance(object_, list):
+            # A member such as `str` takes any value as it is, so a list goes to the first list member its items
+            # fit, if there is one.
+            for inner_type, matches in list_types:
+                if all(matches(entry) for entry in object_):
+                    try:
+                        return construct_type(object_=object_, type_=inner_type)
+                    except Exception:
+                        continue
+
+        # If none of the types work, just return the first successful cast
+        for inner_type in inner_types:
+            try:
+                return construct_type(object_=object_, type_=inner_type)
+            except Exception:
+                continue
+        return None
+
+    return decode
+
+
+def _compile_decoder(type_: typing.Any) -> _Decoder:
     """
-    Here we are essentially creating the same `construct` method in spirit as the above, but for all types, not just
-    Pydantic models.
-    The idea is to essentially attempt to coerce object_ to type_ (recursively)
+    Returns a function coercing values to `type_` the way `construct_type` does, with everything that only depends on
+    `type_` worked out up front.
     """
     base_type = pydantic_v1.typing.get_origin(type_) or type_
     is_annotated = base_type == typing_extensions.Annotated
@@ -148,76 +566,143 @@ def construct_type(*, type_: typing.Type[typing.Any], object_: typing.Any) -> ty
     )
 
     if base_type == typing.Any:
-        return object_
+        return _identity
 
     if base_type == dict:
-        if not isinstance(object_, typing.Mapping):
-            return object_
+        type_args = pydantic_v1.typing.get_args(type_)
 
-        key_type, items_type = pydantic_v1.typing.get_args(type_)
-        d = {
-            construct_type(object_=key, type_=key_type): construct_type(object_=item, type_=items_type)
-            for key, item in object_.items()
-        }
-        return d
+        def decode_dict(object_: typing.Any) -> typing.Any:
+            if not isinstance(object_, typing.Mapping):
+                return object_
+
+            key_type, items_type = type_args
+            decode_key = _get_decoder(key_type)
+            decode_item = _get_decoder(items_type)
+            return {decode_key(key): decode_item(item) for key, item in object_.items()}
+
+        return decode_dict
 
     if base_type == list:
-        if not isinstance(object_, list):
-            return object_
+        type_args = pydantic_v1.typing.get_args(type_)
+
+        def decode_list(object_: typing.Any) -> typing.Any:
+            if not isinstance(object_, list):
+                return object_
+
+            decode_entry = _get_decoder(type_args[0])
+            return [decode_entry(entry) for entry in object_]
 
-        inner_type = pydantic_v1.typing.get_args(type_)[0]
-        return [construct_type(object_=entry, type_=inner_type) for entry in object_]
+        return decode_list
 
     if base_type == set:
-        if not isinstance(object_, set) and not isinstance(object_, list):
-            return object_
+        type_args = pydantic_v1.typing.get_args(type_)
+
+        def decode_set(object_: typing.Any) -> typing.Any:
+            if not isinstance(object_, set) and not isinstance(object_, list):
+                return object_
 
-        inner_type = pydantic_v1.typing.get_args(type_)[0]
-        return {construct_type(object_=entry, type_=inner_type) for entry in object_}
+            decode_entry = _get_decoder(type_args[0])
+            return {decode_entry(entry) for entry in object_}
+
+        return decode_set
 
     if pydantic_v1.typing.is_union(base_type) or is_annotated_union:
-        return _convert_union_type(type_, object_)
+        return _compile_union_decoder(type_)
 
     # Cannot do an `issubclass` with a literal type, let's also just confirm we have a class before this call
-    if (
-        object_ is not None
-        and not pydantic_v1.typing.is_literal_type(type_)
-        and (inspect.isclass(base_type) and issubclass(base_type, pydantic_v1.BaseModel))
+    if not pydantic_v1.typing.is_literal_type(type_) and (
+        inspect.isclass(base_type) and issubclass(base_type, PYDANTIC_MODEL_TYPES)
     ):
-        return type_.construct(**object_)
+        model_type: typing.Any = type_
+        if issubclass(base_type, UncheckedBaseModel) or not is_pydantic_v2_model(base_type):
+            construct = model_type.construct
+        else:
+            construct = model_type.model_construct
+
+        def decode_model(object_: typing.Any) -> typing.Any:
+            if object_ is None:
+                return object_
+            return construct(**object_)
+
+        return decode_model
 
     if base_type == dt.datetime:
-        try:
-            return pydantic_v1.datetime_parse.parse_datetime(object_)
-        except Exception:
-            return object_
+
+        def decode_datetime(object_: typing.Any) -> typing.Any:
+            try:
+                return pydantic_v1.datetime_parse.parse_datetime(object_)
+            except Exception:
+                return object_
+
+        return decode_datetime
 
     if base_type == dt.date:
-        try:
-            return pydantic_v1.datetime_parse.parse_date(object_)
-        except Exception:
-            return object_
+
+        def decode_date(object_: typing.Any) -> typing.Any:
+            try:
+                return pydantic_v1.datetime_parse.parse_date(object_)
+            except Exception:
+                return object_
+
+        return decode_date
 
     if base_type == uuid.UUID:
-        try:
-            return uuid.UUID(object_)
-        except Exception:
-            return object_
+
+        def decode_uuid(object_: typing.Any) -> typing.Any:
+            try:
+                return uuid.UUID(object_)
+            except Exception:
+                return object_
+
+        return decode_uuid
 
     if base_type == int:
-        try:
-            return int(object_)
-        except Exception:
-            return object_
+
+        def decode_int(object_: typing.Any) -> typing.Any:
+            try:
+                return int(object_)
+            except Exception:
+                return object_
+
+        return decode_int
 
     if base_type == bool:
-        try:
-            if isinstance(object_, str):
-                stringified_object = object_.lower()
-                return stringified_object == "true" or stringified_object == "1"
 
-            return bool(object_)
-        except Exception:
-            return object_
+        def decode_bool(object_: typing.Any) -> typing.Any:
+            try:
+                if isinstance(object_, str):
+                    stringified_object = object_.lower()
+                    return stringified_object == "true" or stringified_object == "1"
 
-    return object_
+                return bool(object_)
+            except Exception:
+                return object_
+
+        return decode_bool
+
+    return _identity
+
+
+# Decoders compiled so far, by type. Types are compared by equality, so `typing.List[int]` written in two places
+# shares one decoder.
+_decoders: typing.Dict[typing.Any, _Decoder] = {}
+
+
+def _get_decoder(type_: typing.Any) -> _Decoder:
+    try:
+        return _decoders[type_]
+    except KeyError:
+        decoder = _decoders[type_] = _compile_decoder(type_)
+        return decoder
+    except TypeError:
+        # Unhashable, e.g. a `Literal` of a list: compiled every time, as the type introspection used to be.
+        return _compile_decoder(type_)
+
+
+def construct_type(*, type_: typing.Type[typing.Any], object_: typing.Any) -> typing.Any:
+    """
+    Here we are essentially creating the same `construct` method in spirit as the above, but for all types, not just
+    Pydantic models.
+    The idea is to essentially attempt to coerce object_ to type_ (recursively)
+    """
+    return _get_decoder(type_)(object_)
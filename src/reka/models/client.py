@@ -1,16 +1,14 @@
 # This file was auto-generated by Fern from our API Definition.
 
 import typing
-import urllib.parse
 from json.decoder import JSONDecodeError
 
 from ..core.api_error import ApiError
 from ..core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
 from ..core.jsonable_encoder import jsonable_encoder
-from ..core.query_encoder import encode_query
-from ..core.remove_none_from_dict import remove_none_from_dict
-from ..core.request_options import RequestOptions
-from ..core.unchecked_base_model import construct_type
+from ..core.request_key import request_key
+from ..core.request_options import RawRequestOptions, RequestOptions, SlotsRequestOptions
+from ..core.response_format import ResponseView, decode_response, get_response_format
 from ..types.model import Model
 
 
@@ -18,7 +16,22 @@ class ModelsClient:
     def __init__(self, *, client_wrapper: SyncClientWrapper):
         self._client_wrapper = client_wrapper
 
-    def get(self, *, request_options: typing.Optional[RequestOptions] = None) -> typing.List[Model]:
+    @typing.overload
+    def get(  # type: ignore[overload-overlap]
+        self, *, request_options: RawRequestOptions
+    ) -> typing.List[typing.Dict[str, typing.Any]]: ...
+
+    @typing.overload
+    def get(  # type: ignore[overload-overlap]
+        self, *, request_options: SlotsRequestOptions
+    ) -> typing.List[ResponseView]: ...
+
+    @typing.overload
+    def get(self, *, request_options: typing.Optional[RequestOptions] = None) -> typing.List[Model]: ...
+
+    def get(
+        self, *, request_options: typing.Optional[RequestOptions] = None
+    ) -> typing.Union[typing.List[Model], typing.List[typing.Dict[str, typing.Any]], typing.List[ResponseView]]:
         """
         List models available to the user.
 
@@ -30,7 +43,7 @@ class ModelsClient:
         Returns
         -------
         typing.List[Model]
-            Successful Response
+            Successful Response. Dicts with the "raw" response format, or ResponseViews with the "slots" one.
 
         Examples
         --------
@@ -41,30 +54,53 @@ class ModelsClient:
         )
         client.models.get()
         """
+        _cache = self._client_wrapper.models_cache
+        if _cache is None:
+            return self._get(request_options)
+        return list(_cache.get(self._cache_key(request_options), lambda: self._get(request_options)))
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached model list, so that the next call to `get` fetches it again. Does nothing unless the
+        client was created with a `models_cache`.
+        """
+        if self._client_wrapper.models_cache is not None:
+            self._client_wrapper.models_cache.invalidate()
+
+    def _cache_key(self, request_options: typing.Optional[RequestOptions]) -> str:
+        # The api key is part of the key, so that clients sharing a cache never see each other's models.
+        return request_key(
+            "models",
+            self._client_wrapper.get_base_url(),
+            self._client_wrapper.api_key,
+            jsonable_encoder(
+                request_options.get("additional_query_parameters") if request_options is not None else None
+            ),
+            jsonable_encoder(request_options.get("additional_headers") if request_options is not None else None),
+            # Results in different formats are cached apart.
+            get_response_format(self._client_wrapper.response_format, request_options),
+        )
+
+    def _get(self, request_options: typing.Optional[RequestOptions]) -> typing.List[Model]:
+        _envelope = self._client_wrapper.get_request_envelope("models")
         _response = self._client_wrapper.httpx_client.request(
             method="GET",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "models"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
         )
         if 200 <= _response.status_code < 300:
-            return typing.cast(typing.List[Model], construct_type(type_=typing.List[Model], object_=_response.json()))  # type: ignore
+            return typing.cast(
+                typing.List[Model],
+                decode_response(
+                    typing.List[Model],
+                    self._client_wrapper.json_codec.loads(_response.content),
+                    get_response_format(self._client_wrapper.response_format, request_options),
+                ),
+            )
         try:
             _response_json = _response.json()
         except JSONDecodeError:
@@ -76,7 +112,22 @@ class AsyncModelsClient:
     def __init__(self, *, client_wrapper: AsyncClientWrapper):
         self._client_wrapper = client_wrapper
 
-    async def get(self, *, request_options: typing.Optional[RequestOptions] = None) -> typing.List[Model]:
+    @typing.overload
+    async def get(  # type: ignore[overload-overlap]
+        self, *, request_options: RawRequestOptions
+    ) -> typing.List[typing.Dict[str, typing.Any]]: ...
+
+    @typing.overload
+    async def get(  # type: ignore[overload-overlap]
+        self, *, request_options: SlotsRequestOptions
+    ) -> typing.List[ResponseView]: ...
+
+    @typing.overload
+    async def get(self, *, request_options: typing.Optional[RequestOptions] = None) -> typing.List[Model]: ...
+
+    async def get(
+        self, *, request_options: typing.Optional[RequestOptions] = None
+    ) -> typing.Union[typing.List[Model], typing.List[typing.Dict[str, typing.Any]], typing.List[ResponseView]]:
         """
         List models available to the user.
 
@@ -88,7 +139,7 @@ class AsyncModelsClient:
         Returns
         -------
         typing.List[Model]
-            Successful Response
+            Successful Response. Dicts with the "raw" response format, or ResponseViews with the "slots" one.
 
         Examples
         --------
@@ -99,30 +150,53 @@ class AsyncModelsClient:
         )
         await client.models.get()
         """
+        _cache = self._client_wrapper.models_cache
+        if _cache is None:
+            return await self._get(request_options)
+        return list(await _cache.get_async(self._cache_key(request_options), lambda: self._get(request_options)))
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached model list, so that the next call to `get` fetches it again. Does nothing unless the
+        client was created with a `models_cache`.
+        """
+        if self._client_wrapper.models_cache is not None:
+            self._client_wrapper.models_cache.invalidate()
+
+    def _cache_key(self, request_options: typing.Optional[RequestOptions]) -> str:
+        # The api key is part of the key, so that clients sharing a cache never see each other's models.
+        return request_key(
+            "models",
+            self._client_wrapper.get_base_url(),
+            self._client_wrapper.api_key,
+            jsonable_encoder(
+                request_options.get("additional_query_parameters") if request_options is not None else None
+            ),
+            jsonable_encoder(request_options.get("additional_headers") if request_options is not None else None),
+            # Results in different formats are cached apart.
+            get_response_format(self._client_wrapper.response_format, request_options),
+        )
+
+    async def _get(self, request_options: typing.Optional[RequestOptions]) -> typing.List[Model]:
+        _envelope = self._client_wrapper.get_request_envelope("models")
         _response = await self._client_wrapper.httpx_client.request(
             method="GET",
-            url=urllib.parse.urljoin(f"{self._client_wrapper.get_base_url()}/", "models"),
-            params=encode_query(
-                jsonable_encoder(
-                    request_options.get("additional_query_parameters") if request_options is not None else None
-                )
-            ),
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self._client_wrapper.get_headers(),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            timeout=request_options.get("timeout_in_seconds")
-            if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self._client_wrapper.get_timeout(),
+            url=_envelope.url,
+            params=_envelope.get_params(request_options),
+            headers=_envelope.get_headers(request_options),
+            timeout=_envelope.get_timeout(request_options),
             retries=0,
             max_retries=request_options.get("max_retries") if request_options is not None else 0,  # type: ignore
         )
         if 200 <= _response.status_code < 300:
-            return typing.cast(typing.List[Model], construct_type(type_=typing.List[Model], object_=_response.json()))  # type: ignore
+            return typing.cast(
+                typing.List[Model],
+                decode_response(
+                    typing.List[Model],
+                    self._client_wrapper.json_codec.loads(_response.content),
+                    get_response_format(self._client_wrapper.response_format, request_options),
+                ),
+            )
         try:
             _response_json = _response.json()
         except JSONDecodeError:
@@ -1,29 +1,76 @@
 # This file was auto-generated by Fern from our API Definition.
 
-from .chat_message import ChatMessage
-from .chat_message_chunk import ChatMessageChunk
-from .chat_message_chunk_content_item import ChatMessageChunkContentItem
-from .chat_message_input_content_item import ChatMessageInputContentItem
-from .chat_message_output_content_item import ChatMessageOutputContentItem
-from .chat_response import ChatResponse
-from .chat_role import ChatRole
-from .chunk_chat_response import ChunkChatResponse
-from .chunk_message_response import ChunkMessageResponse
-from .content import Content
-from .finish_reason import FinishReason
-from .http_validation_error import HttpValidationError
-from .media_type import MediaType
-from .message_response import MessageResponse
-from .model import Model
-from .tool import Tool
-from .tool_call import ToolCall
-from .tool_choice import ToolChoice
-from .tool_output import ToolOutput
-from .typed_media_content import TypedMediaContent
-from .typed_text import TypedText
-from .usage import Usage
-from .validation_error import ValidationError
-from .validation_error_loc_item import ValidationErrorLocItem
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .chat_message import ChatMessage
+    from .chat_message_chunk import ChatMessageChunk
+    from .chat_message_chunk_content_item import ChatMessageChunkContentItem
+    from .chat_message_input_content_item import ChatMessageInputContentItem
+    from .chat_message_output_content_item import ChatMessageOutputContentItem
+    from .chat_response import ChatResponse
+    from .chat_role import ChatRole
+    from .chunk_chat_response import ChunkChatResponse
+    from .chunk_message_response import ChunkMessageResponse
+    from .content import Content
+    from .finish_reason import FinishReason
+    from .http_validation_error import HttpValidationError
+    from .media_type import MediaType
+    from .message_response import MessageResponse
+    from .model import Model
+    from .tool import Tool
+    from .tool_call import ToolCall
+    from .tool_choice import ToolChoice
+    from .tool_output import ToolOutput
+    from .typed_media_content import TypedMediaContent
+    from .typed_text import TypedText
+    from .usage import Usage
+    from .validation_error import ValidationError
+    from .validation_error_loc_item import ValidationErrorLocItem
+
+# The module each type is imported from on first access (PEP 562), see `reka/__init__.py`.
+_LAZY_ATTRIBUTES = {
+    "ChatMessage": ".chat_message",
+    "ChatMessageChunk": ".chat_message_chunk",
+    "ChatMessageChunkContentItem": ".chat_message_chunk_content_item",
+    "ChatMessageInputContentItem": ".chat_message_input_content_item",
+    "ChatMessageOutputContentItem": ".chat_message_output_content_item",
+    "ChatResponse": ".chat_response",
+    "ChatRole": ".chat_role",
+    "ChunkChatResponse": ".chunk_chat_response",
+    "ChunkMessageResponse": ".chunk_message_response",
+    "Content": ".content",
+    "FinishReason": ".finish_reason",
+    "HttpValidationError": ".http_validation_error",
+    "MediaType": ".media_type",
+    "MessageResponse": ".message_response",
+    "Model": ".model",
+    "Tool": ".tool",
+    "ToolCall": ".tool_call",
+    "ToolChoice": ".tool_choice",
+    "ToolOutput": ".tool_output",
+    "TypedMediaContent": ".typed_media_content",
+    "TypedText": ".typed_text",
+    "Usage": ".usage",
+    "ValidationError": ".validation_error",
+    "ValidationErrorLocItem": ".validation_error_loc_item",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
 
 __all__ = [
     "ChatMessage",
@@ -2,7 +2,12 @@
 
 import typing
 
+import typing_extensions
+
+from ..core.unchecked_base_model import UnionMetadata
 from .typed_media_content import TypedMediaContent
 from .typed_text import TypedText
 
-ChatMessageChunkContentItem = typing.Union[TypedText, TypedMediaContent]
+ChatMessageChunkContentItem = typing_extensions.Annotated[
+    typing.Union[TypedText, TypedMediaContent], UnionMetadata(discriminant="type", tags={"text": TypedText})
+]
@@ -1,22 +1,55 @@
 """Reka API."""
 
-import importlib.metadata
+import importlib
 import os
+import typing
 
 # Grab it from an environment variable by default, but can be overriden
 API_KEY = os.getenv("REKA_API_KEY")
 # Default production server
 _SERVER = os.getenv("REKA_SERVER", "https://api.reka.ai")
 
-__version__ = importlib.metadata.version("reka-api")
-from reka.v2.api.chat import chat
-from reka.v2.api.dataset import add_dataset, delete_dataset, list_datasets
-from reka.v2.api.models import list_models
-from reka.v2.api.retrieval import (
-    PrepareRetrievalStatusResponse,
-    prepare_retrieval,
-    retrieval_job_status,
-)
+if typing.TYPE_CHECKING:
+    from reka.v2.api.chat import chat
+    from reka.v2.api.dataset import add_dataset, delete_dataset, list_datasets
+    from reka.v2.api.models import list_models
+    from reka.v2.api.retrieval import (
+        PrepareRetrievalStatusResponse,
+        prepare_retrieval,
+        retrieval_job_status,
+    )
+
+    __version__: str
+
+# Imported on first access (PEP 562), so that requests is only loaded once the API is used.
+_LAZY_ATTRIBUTES = {
+    "chat": "reka.v2.api.chat",
+    "add_dataset": "reka.v2.api.dataset",
+    "delete_dataset": "reka.v2.api.dataset",
+    "list_datasets": "reka.v2.api.dataset",
+    "list_models": "reka.v2.api.models",
+    "PrepareRetrievalStatusResponse": "reka.v2.api.retrieval",
+    "prepare_retrieval": "reka.v2.api.retrieval",
+    "retrieval_job_status": "reka.v2.api.retrieval",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name == "__version__":
+        from importlib import metadata
+
+        value: typing.Any = metadata.version("reka-api")
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, "__version__"})
+
 
 __all__ = [
     "chat",
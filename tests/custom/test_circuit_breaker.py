@@ -0,0 +1,182 @@
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, CircuitBreaker, CircuitOpenError, CircuitState
+from reka.core import circuit_breaker as circuit_breaker_module
+
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+ENDPOINT = "https://api.reka.ai"
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def _client(breaker: CircuitBreaker, statuses: typing.List[int]) -> typing.Tuple[Reka, typing.List[httpx.Request]]:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status = statuses[len(requests) - 1] if len(requests) <= len(statuses) else 200
+        return httpx.Response(status, json=CHAT_RESPONSE if status == 200 else {"detail": "down"})
+
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), circuit_breaker=breaker
+    )
+    return client, requests
+
+
+def test_circuit_opens_after_consecutive_failures(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    client, requests = _client(breaker, [503] * 3)
+
+    for _ in range(3):
+        with pytest.raises(ApiError):
+            client.chat.create(messages=MESSAGES, model="reka-core")
+    with pytest.raises(CircuitOpenError) as exc_info:
+        client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert len(requests) == 3
+    assert exc_info.value.key == ENDPOINT
+    assert exc_info.value.retry_after == 10
+    assert breaker.states() == {ENDPOINT: CircuitState.OPEN, f"{ENDPOINT} [reka-core]": CircuitState.OPEN}
+
+
+def test_half_open_probe_closes_the_circuit(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    client, requests = _client(breaker, [500])
+
+    with pytest.raises(ApiError):
+        client.chat.create(messages=MESSAGES, model="reka-core")
+    clock.now = 10
+
+    assert breaker.state(ENDPOINT) is CircuitState.HALF_OPEN
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    assert breaker.state(ENDPOINT) is CircuitState.CLOSED
+    assert len(requests) == 2
+
+
+def test_failed_probe_reopens_the_circuit(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    client, _ = _client(breaker, [500, 502])
+
+    with pytest.raises(ApiError):
+        client.chat.create(messages=MESSAGES, model="reka-core")
+    clock.now = 10
+    with pytest.raises(ApiError):
+        client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert breaker.state(ENDPOINT) is CircuitState.OPEN
+    clock.now = 15
+    with pytest.raises(CircuitOpenError) as exc_info:
+        client.chat.create(messages=MESSAGES, model="reka-core")
+    assert exc_info.value.retry_after == 5
+
+
+def test_half_open_limits_concurrent_probes(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    keys = CircuitBreaker.keys_for(f"{ENDPOINT}/v1/chat", "reka-core")
+    with breaker.attempt(keys) as attempt:
+        attempt.record(failed=True)
+    clock.now = 10
+
+    with breaker.attempt(keys):
+        with pytest.raises(CircuitOpenError):
+            with breaker.attempt(keys):
+                pass
+    # The probe ended without an outcome, so its slot is free again and the circuit stays half-open.
+    with breaker.attempt(keys) as attempt:
+        attempt.record(failed=False)
+    assert breaker.state(keys[0]) is CircuitState.CLOSED
+
+
+def test_failing_model_does_not_open_the_endpoint(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b"reka-flash" in request.content:
+            return httpx.Response(500, json={"detail": "Model reka-flash is unavailable"})
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), circuit_breaker=breaker
+    )
+    for _ in range(2):
+        with pytest.raises(ApiError):
+            client.chat.create(messages=MESSAGES, model="reka-flash")
+    with pytest.raises(CircuitOpenError):
+        client.chat.create(messages=MESSAGES, model="reka-flash")
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert breaker.state(ENDPOINT) is CircuitState.CLOSED
+    assert breaker.state(f"{ENDPOINT} [reka-flash]") is CircuitState.OPEN
+    assert breaker.state(f"{ENDPOINT} [reka-core]") is CircuitState.CLOSED
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_errors_that_do_not_name_the_model_count_against_the_endpoint(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, _ = _client(breaker, [500, 503])
+
+    for _ in range(2):
+        with pytest.raises(ApiError):
+            client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert breaker.state(ENDPOINT) is CircuitState.OPEN
+    assert breaker.state(f"{ENDPOINT} [reka-core]") is CircuitState.OPEN
+
+
+def test_4xx_responses_count_as_successes(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, _ = _client(breaker, [429, 400, 422])
+
+    for _ in range(3):
+        with pytest.raises(ApiError):
+            client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert breaker.state(ENDPOINT) is CircuitState.CLOSED
+
+
+async def test_async_transport_errors_open_the_circuit(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        circuit_breaker=breaker,
+    )
+
+    with pytest.raises(httpx.ConnectTimeout):
+        await client.chat.create(messages=MESSAGES, model="reka-core")
+    with pytest.raises(httpx.ConnectTimeout):
+        await client.chat.create(messages=MESSAGES, model="reka-core")
+    with pytest.raises(CircuitOpenError):
+        await client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert len(requests) == 2
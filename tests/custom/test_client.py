@@ -1,5 +1,32 @@
+import pytest
+
 import reka
+from reka.client import AsyncReka, Reka
 
 
 def test__version():
     assert isinstance(reka.__version__, str)
+
+
+def test__connection_pool_options() -> None:
+    client = Reka(api_key="test", max_connections=8, max_keepalive_connections=4, keepalive_expiry=1.5)
+    pool = client._client_wrapper.httpx_client.httpx_client._transport._pool  # type: ignore
+
+    assert pool._max_connections == 8
+    assert pool._max_keepalive_connections == 4
+    assert pool._keepalive_expiry == 1.5
+    assert not pool._http2
+
+    async_pool = AsyncReka(api_key="test")._client_wrapper.httpx_client.httpx_client._transport._pool  # type: ignore
+
+    assert async_pool._max_connections == 100
+    assert async_pool._max_keepalive_connections == 20
+    assert not async_pool._http2
+
+
+def test__http2() -> None:
+    # HTTP/2 support is an optional extra of httpx.
+    pytest.importorskip("h2")
+    pool = Reka(api_key="test", http2=True)._client_wrapper.httpx_client.httpx_client._transport._pool  # type: ignore
+
+    assert pool._http2
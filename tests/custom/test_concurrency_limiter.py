@@ -0,0 +1,146 @@
+import asyncio
+import typing
+
+import httpx
+import pytest
+
+from reka.client import AsyncReka
+from reka.core import AdaptiveRateLimiter, GradientConcurrencyLimiter
+
+
+async def _run_wave(limiter: GradientConcurrencyLimiter, size: int, rtt: float) -> None:
+    async def call() -> None:
+        async with limiter.permit() as permit:
+            await asyncio.sleep(0)
+            permit.rtt = rtt
+
+    await asyncio.gather(*(call() for _ in range(size)))
+
+
+async def test_limit_grows_while_latency_is_flat() -> None:
+    limiter = GradientConcurrencyLimiter(initial_limit=4, max_limit=100)
+
+    for _ in range(10):
+        await _run_wave(limiter, limiter.limit, rtt=0.1)
+
+    assert limiter.limit > 10
+    assert limiter.min_rtt == 0.1
+
+
+async def test_limit_shrinks_when_latency_shows_queueing() -> None:
+    limiter = GradientConcurrencyLimiter(initial_limit=50)
+    await _run_wave(limiter, 50, rtt=0.1)
+    grown = limiter.limit
+
+    for _ in range(10):
+        await _run_wave(limiter, limiter.limit, rtt=0.5)
+
+    assert limiter.limit < grown / 2
+    assert limiter.min_rtt == 0.1
+
+
+async def test_limit_does_not_grow_when_permits_are_unused() -> None:
+    limiter = GradientConcurrencyLimiter(initial_limit=20)
+
+    for _ in range(10):
+        await _run_wave(limiter, 2, rtt=0.1)
+
+    assert limiter.limit == 20
+
+
+async def test_failures_back_off_and_cancellation_does_not() -> None:
+    limiter = GradientConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+
+    with pytest.raises(RuntimeError):
+        async with limiter.permit():
+            raise RuntimeError("boom")
+    assert limiter.limit == 5
+
+    with pytest.raises(asyncio.CancelledError):
+        async with limiter.permit():
+            raise asyncio.CancelledError()
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
+
+
+async def test_client_calls_wait_for_permits() -> None:
+    release = asyncio.Event()
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await release.wait()
+        active -= 1
+        return httpx.Response(200, json=[])
+
+    limiter = GradientConcurrencyLimiter(initial_limit=3)
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        concurrency_limiter=limiter,
+    )
+
+    calls = [asyncio.ensure_future(client.models.get()) for _ in range(10)]
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert limiter.stats()["in_flight"] == 3
+    assert limiter.queue_depth == 7
+
+    release.set()
+    results: typing.List[typing.Any] = await asyncio.gather(*calls)
+
+    assert results == [[]] * 10
+    assert peak == 3
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+    assert limiter.min_rtt is not None
+
+
+async def test_calls_delayed_by_the_rate_limiter_hold_no_permit() -> None:
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, json=[])
+
+    limiter = GradientConcurrencyLimiter(initial_limit=3)
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        concurrency_limiter=limiter,
+        rate_limiter=AdaptiveRateLimiter(initial_rate=20),
+    )
+
+    calls = [asyncio.ensure_future(client.models.get()) for _ in range(3)]
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    # Only the first call got past the rate limiter, the others wait for it without a permit.
+    assert limiter.in_flight == 1
+
+    release.set()
+    results: typing.List[typing.Any] = await asyncio.gather(*calls)
+
+    assert results == [[]] * 3
+    assert limiter.in_flight == 0
+
+
+async def test_overloaded_responses_shrink_the_limit() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, json={"detail": "overloaded"})
+
+    limiter = GradientConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        concurrency_limiter=limiter,
+    )
+
+    with pytest.raises(Exception):
+        await client.models.get()
+
+    assert limiter.limit == 5
@@ -0,0 +1,334 @@
+import datetime as dt
+import inspect
+import typing
+import uuid
+
+import pytest
+import typing_extensions
+
+from reka.core import UncheckedBaseModel, UnionMetadata, construct_type, pydantic_v1
+from reka.core.pydantic_utilities import IS_PYDANTIC_V2, USE_PYDANTIC_V2
+from reka.types import ChatResponse, ChunkChatResponse, Model
+
+if USE_PYDANTIC_V2:
+    pytest.skip(
+        "Checks `pydantic.v1` models and the reference implementations, run without REKA_PYDANTIC_V2",
+        allow_module_level=True,
+    )
+
+
+# The implementations of `construct_type` and `UncheckedBaseModel.construct` before decoding plans were cached, kept
+# as the reference the current ones have to match.
+def reference_construct(cls: typing.Any, _fields_set: typing.Optional[typing.Set[str]] = None, **values: typing.Any):
+    m = cls.__new__(cls)
+    fields_values = {}
+    config = cls.__config__
+    if _fields_set is None:
+        _fields_set = set(values.keys())
+    for name, field in cls.__fields__.items():
+        key = field.alias
+        if key not in values and config.allow_population_by_field_name:
+            key = name
+        if key in values:
+            if values[key] is None and not field.required:
+                fields_values[name] = field.get_default()
+            else:
+                fields_values[name] = reference_construct_type(object_=values[key], type_=field.outer_type_)
+            _fields_set.add(name)
+        elif not field.required:
+            default = field.get_default()
+            fields_values[name] = default
+            if default != None:
+                _fields_set.add(key)
+    _extra = {}
+    for key, value in values.items():
+        if key not in _fields_set:
+            _extra[key] = value
+            if not IS_PYDANTIC_V2:
+                _fields_set.add(key)
+                fields_values[key] = value
+    if IS_PYDANTIC_V2:
+        object.__setattr__(m, "__pydantic_private__", None)
+        object.__setattr__(m, "__pydantic_extra__", _extra)
+        object.__setattr__(m, "__pydantic_fields_set__", _fields_set)
+    object.__setattr__(m, "__dict__", fields_values)
+    object.__setattr__(m, "__fields_set__", _fields_set)
+    m._init_private_attributes()
+    return m
+
+
+def reference_union(type_: typing.Any, object_: typing.Any) -> typing.Any:
+    base_type = pydantic_v1.typing.get_origin(type_) or type_
+    union_type = type_
+    if base_type == typing_extensions.Annotated:
+        union_type = pydantic_v1.typing.get_args(type_)[0]
+        for metadata in pydantic_v1.typing.get_args(type_)[1:]:
+            if isinstance(metadata, UnionMetadata):
+                try:
+                    for inner_type in pydantic_v1.typing.get_args(union_type):
+                        if inner_type.__fields__[metadata.discriminant].default == getattr(
+                            object_, metadata.discriminant
+                        ):
+                            return reference_construct_type(object_=object_, type_=inner_type)
+                except Exception:
+                    pass
+    inner_types = pydantic_v1.typing.get_args(union_type)
+    if typing.Any in inner_types:
+        return object_
+    for inner_type in inner_types:
+        try:
+            if inspect.isclass(inner_type) and issubclass(inner_type, pydantic_v1.BaseModel):
+                return pydantic_v1.parse_obj_as(inner_type, object_)
+        except Exception:
+            continue
+    for inner_type in inner_types:
+        try:
+            return reference_construct_type(object_=object_, type_=inner_type)
+        except Exception:
+            continue
+
+
+def reference_construct_type(*, type_: typing.Any, object_: typing.Any) -> typing.Any:
+    base_type = pydantic_v1.typing.get_origin(type_) or type_
+    is_annotated = base_type == typing_extensions.Annotated
+    maybe_annotation_members = pydantic_v1.typing.get_args(type_)
+    is_annotated_union = is_annotated and pydantic_v1.typing.is_union(
+        pydantic_v1.typing.get_origin(maybe_annotation_members[0])
+    )
+    if base_type == typing.Any:
+        return object_
+    if base_type == dict:
+        if not isinstance(object_, typing.Mapping):
+            return object_
+        key_type, items_type = pydantic_v1.typing.get_args(type_)
+        return {
+            reference_construct_type(object_=key, type_=key_type): reference_construct_type(
+                object_=item, type_=items_type
+            )
+            for key, item in object_.items()
+        }
+    if base_type == list:
+        if not isinstance(object_, list):
+            return object_
+        inner_type = pydantic_v1.typing.get_args(type_)[0]
+        return [reference_construct_type(object_=entry, type_=inner_type) for entry in object_]
+    if base_type == set:
+        if not isinstance(object_, set) and not isinstance(object_, list):
+            return object_
+        inner_type = pydantic_v1.typing.get_args(type_)[0]
+        return {reference_construct_type(object_=entry, type_=inner_type) for entry in object_}
+    if pydantic_v1.typing.is_union(base_type) or is_annotated_union:
+        return reference_union(type_, object_)
+    if (
+        object_ is not None
+        and not pydantic_v1.typing.is_literal_type(type_)
+        and (inspect.isclass(base_type) and issubclass(base_type, pydantic_v1.BaseModel))
+    ):
+        if issubclass(base_type, UncheckedBaseModel):
+            return reference_construct(type_, **object_)
+        return type_.construct(**object_)
+    if base_type == dt.datetime:
+        try:
+            return pydantic_v1.datetime_parse.parse_datetime(object_)
+        except Exception:
+            return object_
+    if base_type == dt.date:
+        try:
+            return pydantic_v1.datetime_parse.parse_date(object_)
+        except Exception:
+            return object_
+    if base_type == uuid.UUID:
+        try:
+            return uuid.UUID(object_)
+        except Exception:
+            return object_
+    if base_type == int:
+        try:
+            return int(object_)
+        except Exception:
+            return object_
+    if base_type == bool:
+        try:
+            if isinstance(object_, str):
+                return object_.lower() == "true" or object_.lower() == "1"
+            return bool(object_)
+        except Exception:
+            return object_
+    return object_
+
+
+class Cat(UncheckedBaseModel):
+    kind: typing.Literal["cat"] = "cat"
+    lives: int = 9
+
+
+class Dog(UncheckedBaseModel):
+    kind: typing.Literal["dog"] = "dog"
+    good: bool
+
+
+class Strict(pydantic_v1.BaseModel):
+    value: int
+
+
+class Everything(UncheckedBaseModel):
+    name: str = pydantic_v1.Field(alias="displayName")
+    when: typing.Optional[dt.datetime] = None
+    day: typing.Optional[dt.date] = None
+    id: typing.Optional[uuid.UUID] = None
+    count: typing.Optional[int] = 0
+    flag: typing.Optional[bool] = None
+    tags: typing.Set[str] = pydantic_v1.Field(default_factory=set)
+    scores: typing.Dict[str, int] = {}
+    pets: typing.List[typing.Union[Cat, Dog]] = []
+    pet: typing_extensions.Annotated[typing.Union[Cat, Dog], UnionMetadata(discriminant="kind")] = None  # type: ignore
+    anything: typing.Union[int, typing.Any] = None
+    strict: typing.Optional[Strict] = None
+    nested: typing.Optional["Everything"] = None
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+Everything.update_forward_refs()
+
+USAGE = {"input_tokens": 3, "output_tokens": "4"}
+
+CASES: typing.List[typing.Tuple[typing.Any, typing.Any]] = [
+    (
+        ChatResponse,
+        {
+            "id": "r",
+            "model": "reka-core",
+            "responses": [{"message": {"role": "assistant", "content": "Hi"}, "finish_reason": "stop"}],
+            "usage": USAGE,
+        },
+    ),
+    (
+        ChatResponse,
+        {
+            "id": "r",
+            "model": "reka-core",
+            "responses": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [{"id": "c", "name": "f", "parameters": {"a": [1, {"b": None}]}}],
+                    },
+                    "finish_reason": "tool_call",
+                    "unknown": True,
+                },
+                # Content parts with unknown tags are left as they are.
+                {"message": {"role": "assistant", "content": [{"type": "unknown", "text": "x"}, {"type": None}]}},
+            ],
+            "usage": USAGE,
+            "extra": {"nested": 1},
+        },
+    ),
+    (
+        ChunkChatResponse,
+        {
+            "id": "c",
+            "model": "reka-core",
+            "responses": [{"chunk": {"role": "assistant", "content": "the"}, "finish_reason": None}],
+            "usage": USAGE,
+        },
+    ),
+    (ChunkChatResponse, {"id": "c", "responses": None}),
+    (typing.List[Model], [{"id": "reka-core"}, {"id": "reka-flash", "owned_by": "reka"}]),
+    (typing.List[Model], {"not": "a list"}),
+    (
+        Everything,
+        {
+            "displayName": "a",
+            "when": "2024-05-01T12:30:00Z",
+            "day": "2024-05-01",
+            "id": "12345678-1234-5678-1234-567812345678",
+            "count": "12",
+            "flag": "True",
+            "tags": ["x", "y"],
+            "scores": {"a": "1", "b": "two"},
+            "pets": [{"kind": "dog", "good": "1"}, {"kind": "cat"}, {"lives": "x"}],
+            "pet": {"kind": "dog", "good": 0},
+            "anything": [1, 2],
+            "strict": {"value": "3"},
+            "nested": {"name": "b", "when": "not a date", "count": None, "nested": {"name": "c"}},
+        },
+    ),
+    (Everything, {"name": "by field name", "when": None, "flag": 1, "surprise": "extra"}),
+    (Everything, {"displayName": "defaults only"}),
+    (Everything, {"displayName": "bad", "strict": {"value": "x"}, "scores": "x", "tags": "x", "pet": "x"}),
+    (typing.Optional[typing.List[typing.Dict[str, typing.Set[int]]]], [{"a": [1, "2"]}, {"b": set()}, None]),
+    (typing.Union[int, str], "not an int"),
+    (typing.Union[Strict, Cat], {"value": "1"}),
+    (typing.Union[Strict, Cat], {"lives": 2}),
+    (typing.Literal["a", "b"], "c"),
+    (typing.Any, object),
+    (dt.datetime, 1714566600),
+    (bool, "yes"),
+    (uuid.UUID, 1),
+    (int, None),
+]
+
+
+def _snapshot(value: typing.Any) -> typing.Any:
+    """
+    Returns what can be compared with `==` of a constructed value, including the type and fields set of models.
+    """
+    if isinstance(value, pydantic_v1.BaseModel):
+        extra = getattr(value, "__pydantic_extra__", None)
+        return (
+            type(value),
+            {key: _snapshot(item) for key, item in value.__dict__.items()},
+            sorted(value.__fields_set__),
+            {key: _snapshot(item) for key, item in (extra or {}).items()},
+        )
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(item) for item in value]
+    return value
+
+
+@pytest.mark.parametrize("type_,object_", CASES)
+def test_output_is_identical_to_the_reference(type_: typing.Any, object_: typing.Any) -> None:
+    expected = reference_construct_type(type_=type_, object_=object_)
+
+    # The first call compiles the plans, the second one uses them.
+    for _ in range(2):
+        assert _snapshot(construct_type(type_=type_, object_=object_)) == _snapshot(expected)
+
+
+def test_construct_matches_the_reference_with_explicit_fields_set() -> None:
+    values = {"displayName": "a", "count": None, "other": 1}
+
+    actual = Everything.construct({"given"}, **values)
+    expected = reference_construct(Everything, {"given"}, **values)
+
+    assert _snapshot(actual) == _snapshot(expected)
+
+
+def test_defaults_are_not_shared_between_instances() -> None:
+    first = construct_type(type_=Everything, object_={"displayName": "a"})
+    second = construct_type(type_=Everything, object_={"displayName": "b"})
+
+    first.tags.add("x")
+    first.scores["x"] = 1
+
+    assert second.tags == set()
+    assert second.scores == {}
+
+
+def test_forward_references_resolved_after_the_first_construct() -> None:
+    class Node(UncheckedBaseModel):
+        child: typing.Optional["Child"] = None
+
+    Node.construct(child={"value": "1"})
+
+    class Child(UncheckedBaseModel):
+        value: int
+
+    Node.update_forward_refs(Child=Child)
+
+    assert Node.construct(child={"value": "1"}).child == Child.construct(value=1)
@@ -0,0 +1,98 @@
+import typing
+
+import pytest
+
+from reka import (
+    ChatMessage,
+    ChatMessageOutputContentItem,
+    ChatResponse,
+    ChunkChatResponse,
+    ToolOutput,
+    TypedMediaContent,
+    TypedText,
+)
+from reka.core import construct_type, unchecked_base_model
+
+PARTS = [
+    {"type": "text", "text": "Here is the picture:"},
+    {"type": "image_url", "image_url": "https://example.com/cat.png"},
+    {"type": "video_url", "video_url": "https://example.com/cat.mp4", "duration": 3},
+]
+
+
+def _response(content: typing.Any) -> typing.Dict[str, typing.Any]:
+    return {
+        "id": "response-id",
+        "model": "reka-core",
+        "responses": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+
+
+@pytest.fixture
+def no_validated_parse(monkeypatch: pytest.MonkeyPatch) -> None:
+    def parse_obj_as(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        raise AssertionError("content parts are dispatched on their type")
+
+    monkeypatch.setattr(unchecked_base_model, "parse_obj_as", parse_obj_as)
+
+
+def test_content_parts_are_dispatched_on_their_type(no_validated_parse: None) -> None:
+    response = construct_type(type_=ChatResponse, object_=_response(PARTS))
+
+    text, image, video = response.responses[0].message.content
+    assert text == TypedText.construct(type="text", text="Here is the picture:")
+    assert isinstance(image, TypedMediaContent) and image.image_url == "https://example.com/cat.png"
+    assert isinstance(video, TypedMediaContent) and video.video_url == "https://example.com/cat.mp4"
+
+
+def test_chunk_content_parts_are_dispatched_on_their_type(no_validated_parse: None) -> None:
+    chunk = {"id": "chunk-id", "model": "reka-core", "responses": [{"chunk": {"role": "assistant", "content": PARTS}}]}
+
+    response = construct_type(type_=ChunkChatResponse, object_=chunk)
+
+    assert [type(part) for part in response.responses[0].chunk.content] == [
+        TypedText,
+        TypedMediaContent,
+        TypedMediaContent,
+    ]
+
+
+def test_item_union_is_dispatched_on_its_type(no_validated_parse: None) -> None:
+    part = construct_type(
+        type_=typing.cast(typing.Any, ChatMessageOutputContentItem), object_={"type": "pdf_url", "pdf_url": "x.pdf"}
+    )
+
+    assert part == TypedMediaContent.construct(type="pdf_url", pdf_url="x.pdf")
+
+
+def test_tool_outputs_are_not_taken_for_content_parts() -> None:
+    content = [{"tool_call_id": "call-1", "output": "21 C"}]
+
+    response = construct_type(type_=ChatResponse, object_=_response(content))
+
+    assert response.responses[0].message.content == [ToolOutput.construct(tool_call_id="call-1", output="21 C")]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "Hello",
+        [],
+        [{"type": "text", "text": "known"}, {"type": "hologram_url", "hologram_url": "unknown"}],
+        [{"type": ["unhashable"]}],
+        [1, 2],
+    ],
+)
+def test_other_content_is_left_as_it_is(content: typing.Any) -> None:
+    response = construct_type(type_=ChatResponse, object_=_response(content))
+
+    assert response.responses[0].message.content == content
+
+
+def test_text_parts_keep_their_generated_annotation() -> None:
+    assert ChatMessage(role="user", content=[{"type": "text", "text": "Hi"}]).content == [
+        TypedText(type="text", text="Hi")
+    ]
+    # The tag is dispatched on through the union's metadata, `TypedText.type` itself still takes any value.
+    assert TypedText(type="image_url", text="Hi").type == "image_url"
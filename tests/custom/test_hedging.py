@@ -0,0 +1,252 @@
+import asyncio
+import contextvars
+import json
+import threading
+import time
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import HedgingPolicy
+
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+REQUEST_ID: "contextvars.ContextVar[typing.Optional[str]]" = contextvars.ContextVar("REQUEST_ID", default=None)
+
+
+def _chat_response(content: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "id": "response-id",
+            "model": "reka-core",
+            "responses": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        },
+    )
+
+
+def test_hedge_replaces_a_slow_call_that_fails() -> None:
+    calls: typing.List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            # Keep the original request outstanding until the hedge has been sent.
+            deadline = time.monotonic() + 5
+            while policy.stats()["hedges"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            return httpx.Response(503)
+        time.sleep(0.05)
+        return _chat_response("hedge")
+
+    policy = HedgingPolicy(delay=0.01)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    response = client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert response.responses[0].message.content == "hedge"
+    assert policy.stats()["hedges"] == 1
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_hedge_that_finishes_first_is_used() -> None:
+    hedge_done = threading.Event()
+    contexts: typing.List[typing.Optional[str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        contexts.append(REQUEST_ID.get())
+        if len(contexts) == 1:
+            hedge_done.wait(5)
+            return _chat_response("original")
+        hedge_done.set()
+        return _chat_response("hedge")
+
+    policy = HedgingPolicy(delay=0.01)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    REQUEST_ID.set("request-1")
+    response = client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert response.responses[0].message.content == "hedge"
+    assert policy.stats()["hedge_wins"] == 1
+    # Both copies run on the thread pool, in the context of the call.
+    assert contexts == ["request-1", "request-1"]
+
+
+def test_slow_call_that_succeeds_is_used_when_the_hedge_fails() -> None:
+    calls: typing.List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            time.sleep(0.05)
+            return _chat_response("original")
+        return httpx.Response(503)
+
+    policy = HedgingPolicy(delay=0.01)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    response = client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert response.responses[0].message.content == "original"
+    assert policy.stats()["hedges"] == 1
+    assert policy.stats()["hedge_wins"] == 0
+
+
+def test_calls_are_sent_inline_while_the_pool_is_full() -> None:
+    release = threading.Event()
+    threads: typing.List[threading.Thread] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        threads.append(threading.current_thread())
+        if len(threads) == 1:
+            release.wait(5)
+        return _chat_response("done")
+
+    policy = HedgingPolicy(delay=0.01, max_workers=1)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+    background = threading.Thread(target=client.chat.create, kwargs={"messages": MESSAGES, "model": "reka-core"})
+    background.start()
+    deadline = time.monotonic() + 5
+    while not threads and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    release.set()
+    background.join()
+
+    # The only worker is busy with the first call, so the second one keeps the calling thread and neither is hedged.
+    assert threads[1] is threading.current_thread()
+    assert len(threads) == 2
+    assert policy.stats()["hedges"] == 0
+
+
+def test_fast_call_is_not_hedged() -> None:
+    calls: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return _chat_response("fast")
+
+    policy = HedgingPolicy(delay=1)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert len(calls) == 1
+    assert policy.stats() == {"requests": 1, "hedges": 0, "hedge_wins": 0, "budget_exhausted": 0, "delay": 1}
+
+
+def test_streams_are_not_hedged() -> None:
+    calls: typing.List[httpx.Request] = []
+    chunk = {"id": "chunk-id", "model": "reka-core", "responses": [], "usage": {"input_tokens": 1, "output_tokens": 1}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=f"data: {json.dumps(chunk)}\n\n".encode()
+        )
+
+    policy = HedgingPolicy(delay=0)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    list(client.chat.create_stream(messages=MESSAGES, model="reka-core"))
+
+    assert len(calls) == 1
+    assert policy.stats()["requests"] == 0
+
+
+async def test_async_hedge_cancels_the_slower_copy() -> None:
+    cancelled = asyncio.Event()
+    calls: typing.List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return _chat_response("slow")
+        return _chat_response("fast")
+
+    policy = HedgingPolicy(delay=0.05)
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    response = await client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert response.responses[0].message.content == "fast"
+    assert cancelled.is_set()
+    assert policy.stats()["hedge_wins"] == 1
+
+
+async def test_hedges_are_limited_by_the_budget() -> None:
+    calls: typing.List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        await asyncio.sleep(0.02)
+        return _chat_response("slow")
+
+    policy = HedgingPolicy(delay=0.001, max_hedge_ratio=0.1)
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    for _ in range(3):
+        await client.chat.create(messages=MESSAGES, model="reka-core")
+
+    # The budget starts with a single hedge and earns a tenth of one per call.
+    assert policy.stats()["hedges"] == 1
+    assert policy.stats()["budget_exhausted"] == 2
+    assert len(calls) == 4
+
+
+async def test_hedge_does_not_win_with_an_error() -> None:
+    calls: typing.List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            return _chat_response("slow")
+        return httpx.Response(503)
+
+    policy = HedgingPolicy(delay=0.01)
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), hedging_policy=policy
+    )
+
+    response = await client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert response.responses[0].message.content == "slow"
+    assert policy.stats()["hedge_wins"] == 0
+
+
+def test_delay_follows_the_observed_percentile() -> None:
+    policy = HedgingPolicy(percentile=0.9, min_samples=10)
+    for latency in range(1, 10):
+        policy._record_latency(latency / 10)
+    assert policy.delay() is None
+
+    policy._record_latency(1.0)
+
+    assert policy.delay() == pytest.approx(0.9)
@@ -0,0 +1,245 @@
+import json
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, StreamInterruptedError
+from reka.core import http_client as http_client_module
+
+CHUNK = {
+    "id": "chunk-id",
+    "model": "reka-core",
+    "responses": [{"chunk": {"role": "assistant", "content": "Hello"}, "finish_reason": None}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+SSE_BODY = f"data: {json.dumps(CHUNK)}\n\n".encode() * 2
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+
+
+def _sse_response() -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=SSE_BODY)
+
+
+def _failing_then(
+    failures: typing.List[httpx.Response], success: typing.Callable[[], httpx.Response]
+) -> typing.Tuple[typing.Callable[[httpx.Request], httpx.Response], typing.List[httpx.Request]]:
+    attempts: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) <= len(failures):
+            return failures[len(attempts) - 1]
+        return success()
+
+    return handler, attempts
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> typing.List[float]:
+    recorded: typing.List[float] = []
+
+    async def fake_async_sleep(seconds: float) -> None:
+        recorded.append(seconds)
+
+    monkeypatch.setattr(http_client_module.time, "sleep", recorded.append)
+    monkeypatch.setattr(http_client_module.asyncio, "sleep", fake_async_sleep)
+    return recorded
+
+
+def test_stream_retries_before_first_byte(sleeps: typing.List[float]) -> None:
+    handler, attempts = _failing_then(
+        [httpx.Response(429, headers={"retry-after-ms": "250"}), httpx.Response(503)], _sse_response
+    )
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    chunks = list(client.chat.create_stream(messages=MESSAGES, model="reka-core", request_options={"max_retries": 2}))
+
+    assert len(chunks) == 2
+    assert chunks[0].responses[0].chunk.content == "Hello"
+    assert len(attempts) == 3
+    assert sleeps[0] == 0.25
+    # Second retry falls back to jittered exponential backoff: 0.5 * 2 ** 1 * (1 - 0.25 * random()).
+    assert 0.75 <= sleeps[1] <= 1.0
+
+
+def test_stream_gives_up_after_max_retries(sleeps: typing.List[float]) -> None:
+    handler, attempts = _failing_then([httpx.Response(503, json={"detail": "down"})] * 3, _sse_response)
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(ApiError) as exc_info:
+        list(client.chat.create_stream(messages=MESSAGES, model="reka-core", request_options={"max_retries": 1}))
+
+    assert exc_info.value.status_code == 503
+    assert len(attempts) == 2
+    assert len(sleeps) == 1
+
+
+def test_stream_interrupted_mid_stream_raises_typed_error(sleeps: typing.List[float]) -> None:
+    def body() -> typing.Iterator[bytes]:
+        yield f"data: {json.dumps(CHUNK)}\n\n".encode()
+        raise httpx.ReadError("connection reset")
+
+    handler, attempts = _failing_then(
+        [], lambda: httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body())
+    )
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    received = []
+    with pytest.raises(StreamInterruptedError) as exc_info:
+        for chunk in client.chat.create_stream(
+            messages=MESSAGES, model="reka-core", request_options={"max_retries": 2}
+        ):
+            received.append(chunk)
+
+    assert len(received) == 1
+    assert exc_info.value.status_code == 200
+    assert len(attempts) == 1
+    assert sleeps == []
+
+
+async def test_async_stream_retries_before_first_byte(sleeps: typing.List[float]) -> None:
+    handler, attempts = _failing_then([httpx.Response(429, headers={"retry-after": "1"})], _sse_response)
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    chunks = [
+        chunk
+        async for chunk in client.chat.create_stream(
+            messages=MESSAGES, model="reka-core", request_options={"max_retries": 2}
+        )
+    ]
+
+    assert len(chunks) == 2
+    assert len(attempts) == 2
+    assert sleeps == [1.0]
+
+
+async def test_async_stream_interrupted_mid_stream_raises_typed_error(sleeps: typing.List[float]) -> None:
+    async def body() -> typing.AsyncIterator[bytes]:
+        yield f"data: {json.dumps(CHUNK)}\n\n".encode()
+        raise httpx.RemoteProtocolError("peer closed connection")
+
+    handler, attempts = _failing_then(
+        [], lambda: httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body())
+    )
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(StreamInterruptedError):
+        async for _ in client.chat.create_stream(messages=MESSAGES, model="reka-core"):
+            pass
+
+    assert len(attempts) == 1
+
+
+def _raising_then(
+    errors: typing.List[Exception], success: typing.Callable[[], httpx.Response]
+) -> typing.Tuple[typing.Callable[[httpx.Request], httpx.Response], typing.List[httpx.Request]]:
+    attempts: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return success()
+
+    return handler, attempts
+
+
+def test_connect_errors_are_retried_with_backoff(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then(
+        [httpx.ConnectError("name resolution failed"), httpx.ConnectTimeout("timed out")],
+        lambda: httpx.Response(200, json=CHAT_RESPONSE),
+    )
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    response = client.chat.create(messages=MESSAGES, model="reka-core", request_options={"max_retries": 2})
+
+    assert response.id == "response-id"
+    assert len(attempts) == 3
+    assert len(sleeps) == 2
+    assert client._client_wrapper.httpx_client.attempts.snapshot() == {3: 1}
+
+
+def test_stale_connection_reconnects_immediately_without_retry_budget(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then(
+        [httpx.RemoteProtocolError("Server disconnected without sending a response.")],
+        lambda: httpx.Response(200, json=[]),
+    )
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    client.models.get()
+
+    assert len(attempts) == 2
+    assert sleeps == [0]
+
+
+def test_stale_connection_is_not_replayed_for_non_idempotent_requests(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then(
+        [httpx.ReadError("connection reset by peer")] * 2, lambda: httpx.Response(200, json=CHAT_RESPONSE)
+    )
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    # The server may have accepted the request before the connection broke, so it is not sent again, even if the
+    # caller allows retries.
+    with pytest.raises(httpx.ReadError):
+        client.chat.create(messages=MESSAGES, model="reka-core", request_options={"max_retries": 2})
+
+    assert len(attempts) == 1
+    assert sleeps == []
+
+
+def test_read_timeout_is_not_replayed_for_non_idempotent_requests(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then([httpx.ReadTimeout("timed out")], lambda: httpx.Response(200, json=CHAT_RESPONSE))
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(httpx.ReadTimeout):
+        client.chat.create(messages=MESSAGES, model="reka-core", request_options={"max_retries": 2})
+
+    assert len(attempts) == 1
+    assert client._client_wrapper.httpx_client.attempts.snapshot() == {1: 1}
+
+
+def test_read_timeout_is_retried_for_idempotent_requests(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then([httpx.ReadTimeout("timed out")], lambda: httpx.Response(200, json=[]))
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert client.models.get(request_options={"max_retries": 1}) == []
+    assert len(attempts) == 2
+
+
+def test_transport_errors_are_raised_once_retries_are_exhausted(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then([httpx.ConnectError("refused")] * 3, lambda: httpx.Response(200, json=[]))
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(httpx.ConnectError):
+        client.models.get(request_options={"max_retries": 1})
+
+    assert len(attempts) == 2
+    assert client._client_wrapper.httpx_client.attempts.snapshot() == {2: 1}
+
+
+async def test_async_transport_errors_are_retried(sleeps: typing.List[float]) -> None:
+    handler, attempts = _raising_then(
+        [httpx.ConnectTimeout("timed out"), httpx.ConnectError("refused")], _sse_response
+    )
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    chunks = [
+        chunk
+        async for chunk in client.chat.create_stream(
+            messages=MESSAGES, model="reka-core", request_options={"max_retries": 2}
+        )
+    ]
+
+    assert len(chunks) == 2
+    assert len(attempts) == 3
+    assert len(sleeps) == 2
+    assert client._client_wrapper.httpx_client.attempts.snapshot() == {3: 1}
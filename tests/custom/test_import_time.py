@@ -0,0 +1,80 @@
+import re
+import subprocess
+import sys
+import typing
+
+import pytest
+
+import reka
+import reka.types
+
+# `import reka` took about 275 ms when it imported the types and the clients eagerly, and takes about 1 ms now. The
+# limit leaves room for slow CI machines while still catching an eager import of httpx or pydantic.
+IMPORT_TIME_LIMIT_US = 30_000
+
+_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S+)$")
+
+
+def _run(statement: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args, "-c", statement], capture_output=True, text=True, check=True)
+
+
+def _import_time_us(statement: str) -> int:
+    """
+    Returns the microseconds the top-level modules of the SDK take to import, with `python -X importtime`.
+    """
+    lines = _run(statement, "-X", "importtime").stderr.splitlines()
+    return sum(
+        int(match.group(1))
+        for match in map(_LINE.match, lines)
+        if match is not None and match.group(2).split(".")[0] == "reka"
+    )
+
+
+def test_import_time_is_under_the_limit() -> None:
+    # The fastest of a few runs, as for `timeit`.
+    assert min(_import_time_us("import reka") for _ in range(3)) < IMPORT_TIME_LIMIT_US
+
+
+@pytest.mark.parametrize("statement", ["import reka", "import reka.v2", "from reka import v2; v2.API_KEY"])
+def test_import_loads_no_dependencies(statement: str) -> None:
+    check = (
+        "import sys; print(sorted({name.split('.')[0] for name in sys.modules} & {'httpx', 'pydantic', 'requests'}))"
+    )
+
+    assert _run(f"{statement}; {check}").stdout.strip() == "[]"
+
+
+def test_attributes_are_loaded_on_first_access() -> None:
+    loaded = "print('reka.types.chat_message' in sys.modules)"
+
+    process = _run(f"import reka, sys; {loaded}; reka.ChatMessage; {loaded}")
+
+    assert process.stdout.split() == ["False", "True"]
+
+
+@pytest.mark.parametrize("module", [reka, reka.types])
+def test_all_names_resolve(module: typing.Any) -> None:
+    namespace: typing.Dict[str, typing.Any] = {}
+    exec(f"from {module.__name__} import *", namespace)
+
+    assert set(module.__all__) <= set(dir(module))
+    assert all(namespace[name] is getattr(module, name) for name in module.__all__)
+
+
+def test_attributes_are_the_ones_of_their_modules() -> None:
+    from reka.chat import client
+    from reka.types.chat_message import ChatMessage
+
+    assert reka.ChatMessage is ChatMessage
+    assert reka.types.ChatMessage is ChatMessage
+    assert reka.chat.client is client
+    assert reka.__version__ == reka.version.__version__
+
+
+def test_unknown_attributes_raise_attribute_error() -> None:
+    with pytest.raises(AttributeError, match="module 'reka' has no attribute 'Unknown'"):
+        reka.Unknown  # type: ignore
+
+    with pytest.raises(ImportError):
+        from reka.types import Unknown  # type: ignore # noqa: F401
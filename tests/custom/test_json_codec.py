@@ -0,0 +1,126 @@
+import json
+import sys
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import JSONCodec
+
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+CHUNK = {
+    "id": "chunk-id",
+    "model": "reka-core",
+    "responses": [{"chunk": {"role": "assistant", "content": "Héllo 🙂"}, "finish_reason": None}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+VALUE = {"text": 'é ü 你好 🙂 "quoted"\n', "numbers": [1, -2, 3.5, 1e100], "flags": [True, False, None], "nested": {}}
+
+
+def _installed(backend: str) -> bool:
+    try:
+        JSONCodec(backend)
+    except ImportError:
+        return False
+    return True
+
+
+BACKENDS = [backend for backend in ("orjson", "msgspec", "json") if _installed(backend)]
+
+
+class _CountingCodec(JSONCodec):
+    def __init__(self) -> None:
+        super().__init__("json")
+        self.decoded = 0
+        self.encoded = 0
+        loads, dumps = self.loads, self.dumps
+
+        def counting_loads(data: typing.Union[str, bytes]) -> typing.Any:
+            self.decoded += 1
+            return loads(data)
+
+        def counting_dumps(value: typing.Any) -> bytes:
+            self.encoded += 1
+            return dumps(value)
+
+        self.loads, self.dumps = counting_loads, counting_dumps
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_round_trip(backend: str) -> None:
+    codec = JSONCodec(backend)
+
+    encoded = codec.dumps(VALUE)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == VALUE
+    assert codec.loads(encoded) == VALUE
+    assert codec.loads(encoded.decode("utf-8")) == VALUE
+
+
+def test_auto_prefers_the_fastest_installed_backend() -> None:
+    assert JSONCodec().backend == BACKENDS[0]
+
+
+def test_auto_falls_back_to_the_standard_library(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    assert JSONCodec().backend == "json"
+    with pytest.raises(ImportError):
+        JSONCodec("orjson")
+
+
+def test_unknown_backends_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        JSONCodec("simplejson")
+
+
+def test_client_decodes_and_encodes_with_the_codec() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if json.loads(request.read()).get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=f"data: {json.dumps(CHUNK)}\n\ndata: {json.dumps(CHUNK)}\n\n".encode(),
+            )
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    codec = _CountingCodec()
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), json_codec=codec)
+    messages = [ChatMessage(role="user", content="Hé")]
+
+    response = client.chat.create(messages=messages, model="reka-core")
+    chunks = list(client.chat.create_stream(messages=messages, model="reka-core"))
+
+    assert response.responses[0].message.content == "Hello"
+    assert [chunk.responses[0].chunk.content for chunk in chunks] == ["Héllo 🙂", "Héllo 🙂"]
+    assert codec.decoded == 3
+    assert codec.encoded == 2
+    assert requests[0].headers["Content-Type"] == "application/json"
+    assert json.loads(requests[0].content)["messages"] == [{"role": "user", "content": "Hé"}]
+
+
+async def test_async_client_decodes_with_the_codec() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    codec = _CountingCodec()
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), json_codec=codec
+    )
+
+    response = await client.chat.create(messages=[ChatMessage(role="user", content="Hi")], model="reka-core")
+
+    assert response.id == "response-id"
+    assert codec.decoded == 1
@@ -0,0 +1,155 @@
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, LoadBalancer
+from reka.core import load_balancer as load_balancer_module
+
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+EU = "https://eu.api.example.com/v1"
+US = "https://us.api.example.com/v1"
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(load_balancer_module.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def _client(balancer: LoadBalancer, down: typing.Set[str]) -> typing.Tuple[Reka, typing.List[httpx.Request]]:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host in down:
+            return httpx.Response(503, json={"detail": "down"})
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), load_balancer=balancer
+    )
+    return client, requests
+
+
+def test_requests_are_rewritten_onto_the_chosen_endpoint(clock: FakeClock) -> None:
+    client, requests = _client(LoadBalancer([EU, US]), down=set())
+
+    for _ in range(10):
+        client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert {str(request.url) for request in requests} == {f"{EU}/chat", f"{US}/chat"}
+
+
+def test_least_outstanding_avoids_busy_endpoints(clock: FakeClock) -> None:
+    balancer = LoadBalancer([EU, US])
+
+    with balancer.route(f"{EU}/chat") as first:
+        with balancer.route(f"{EU}/chat") as second:
+            assert {first.base_url, second.base_url} == {EU, US}
+
+
+def test_ewma_prefers_the_faster_endpoint(clock: FakeClock) -> None:
+    balancer = LoadBalancer([EU, US], strategy="ewma")
+    latencies = {EU: 0.5, US: 0.1}
+    # Endpoints without a latency sample are tried first, so the first two calls take one sample from each.
+    for _ in range(2):
+        with balancer.route(f"{EU}/chat") as lease:
+            sent_at = clock.now
+            clock.now += latencies[typing.cast(str, lease.base_url)]
+            lease.record(failed=False, sent_at=sent_at)
+    assert balancer.stats()[EU]["latency"] == pytest.approx(0.5)
+
+    for _ in range(5):
+        with balancer.route(f"{EU}/chat") as lease:
+            assert lease.base_url == US
+
+
+def test_failing_endpoint_is_ejected_and_probed_again(clock: FakeClock) -> None:
+    balancer = LoadBalancer([EU, US], failure_threshold=2, ejection_time=10)
+    down = {"eu.api.example.com"}
+    client, requests = _client(balancer, down)
+
+    for _ in range(100):
+        try:
+            client.chat.create(messages=MESSAGES, model="reka-core")
+        except ApiError:
+            pass
+        if not balancer.stats()[EU]["healthy"]:
+            break
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    assert balancer.stats()[EU]["healthy"] is False
+    assert sum(request.url.host == "eu.api.example.com" for request in requests) == 2
+
+    # Once the ejection is over, the next call probes the endpoint and brings it back.
+    down.clear()
+    clock.now = 10
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert str(requests[-1].url) == f"{EU}/chat"
+    assert balancer.stats()[EU]["healthy"] is True
+
+
+def test_retries_move_to_another_endpoint(clock: FakeClock) -> None:
+    balancer = LoadBalancer([EU, US], failure_threshold=1)
+    down: typing.Set[str] = set()
+    client, requests = _client(balancer, down)
+
+    # Keep one endpoint busy so that the first attempt goes to the other one, which is down.
+    with balancer.route(f"{EU}/chat") as busy:
+        healthy = httpx.URL(typing.cast(str, busy.base_url)).host
+        failing = "us.api.example.com" if healthy == "eu.api.example.com" else "eu.api.example.com"
+        down.add(failing)
+        client.chat.create(messages=MESSAGES, model="reka-core", request_options={"max_retries": 1})
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    # After the first failure that endpoint is ejected, so the retry and every later call go elsewhere.
+    assert [request.url.host for request in requests] == [failing, healthy, healthy]
+
+
+def test_all_endpoints_ejected_falls_back_to_the_first_to_recover(clock: FakeClock) -> None:
+    balancer = LoadBalancer([EU, US], failure_threshold=1, ejection_time=10)
+    with balancer.route(f"{EU}/chat") as lease:
+        lease.record(failed=True, sent_at=clock.now)
+        first_ejected = lease.base_url
+    clock.now = 1
+    with balancer.route(f"{EU}/chat") as lease:
+        lease.record(failed=True, sent_at=clock.now)
+
+    with balancer.route(f"{EU}/chat") as lease:
+        assert lease.base_url == first_ejected
+
+
+async def test_async_client_balances(clock: FakeClock) -> None:
+    hosts: typing.List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        load_balancer=LoadBalancer([EU, US]),
+    )
+    for _ in range(10):
+        await client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert set(hosts) == {"eu.api.example.com", "us.api.example.com"}
@@ -0,0 +1,162 @@
+import contextlib
+import datetime as dt
+import typing
+
+import pytest
+
+from reka import ChatMessage, ChatResponse, Tool, ToolCall, ToolOutput, TypedMediaContent, TypedText, Usage
+from reka.core import UncheckedBaseModel, construct_type, deep_union_pydantic_dicts, pydantic_v1
+from reka.core.pydantic_utilities import USE_PYDANTIC_V2
+
+if USE_PYDANTIC_V2:
+    pytest.skip(
+        "Checks the single-pass `dict()` of `pydantic.v1` models, run without REKA_PYDANTIC_V2", allow_module_level=True
+    )
+
+WHEN = dt.datetime(2024, 5, 1, 12, 30, tzinfo=dt.timezone.utc)
+
+
+class Plain(pydantic_v1.BaseModel):
+    name: str
+    note: typing.Optional[str] = None
+
+
+class Root(pydantic_v1.BaseModel):
+    __root__: typing.List[int]
+
+
+class Aliased(UncheckedBaseModel):
+    display_name: str = pydantic_v1.Field(alias="displayName")
+    when: typing.Optional[dt.datetime] = None
+    tags: typing.Tuple[str, ...] = ()
+    plain: typing.Optional[Plain] = None
+    root: typing.Optional[Root] = None
+    child: typing.Optional["Aliased"] = None
+    children: typing.Optional[typing.List["Aliased"]] = None
+    mapping: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+
+Aliased.update_forward_refs()
+
+MODELS: typing.List[typing.Any] = [
+    ChatMessage(role="user", content="Hello"),
+    ChatMessage(role="user", content="Hello", tool_calls=None),
+    ChatMessage(
+        role="user",
+        content=[
+            TypedMediaContent(type="image_url", image_url="https://example.com/cat.png"),
+            TypedMediaContent(type="video_url", video_url="https://example.com/a.mp4", image_url=None),
+            TypedText(type="text", text="What is this?"),
+        ],
+    ),
+    ChatMessage(role="assistant", tool_calls=[ToolCall(id="c", name="f", parameters={"a": None, "b": [1, {"c": 2}]})]),
+    ChatMessage(role="tool_output", content=[ToolOutput(tool_call_id="c", output="21 C")], extra={"x": None}),
+    Tool(name="f", description=None, parameters={"model": Usage(input_tokens=1, output_tokens=2), "none": None}),
+    construct_type(
+        type_=ChatResponse,
+        object_={
+            "id": "r",
+            "model": "reka-core",
+            "responses": [
+                {"message": {"role": "assistant", "content": [{"type": "text", "text": "x"}]}, "finish_reason": None},
+                {"message": {"role": "assistant", "content": None, "tool_calls": [{"id": "c", "name": "f"}]}},
+            ],
+            "usage": {"input_tokens": 1, "output_tokens": 2},
+        },
+    ),
+    Aliased(displayName="a"),
+    Aliased(
+        displayName="a",
+        when=WHEN,
+        tags=("x", "y"),
+        plain=Plain(name="p", note=None),
+        root=Root(__root__=[1, 2]),
+        child=Aliased(displayName="b", child=None, mapping={"k": None, "plain": Plain(name="q")}),
+        children=[Aliased(displayName="c", when=None)],
+        mapping={"nested": {"model": Aliased(displayName="d"), "list": [Plain(name="r")]}, "none": None},
+    ),
+]
+
+DICT_KWARGS: typing.List[typing.Dict[str, typing.Any]] = [
+    {},
+    {"by_alias": False},
+    {"exclude_unset": True},
+    {"exclude_unset": False},
+    {"exclude_none": True},
+    {"exclude_none": False},
+    {"exclude_unset": False, "exclude_none": False},
+    {"include": {"role", "content", "display_name"}},
+    {"exclude": {"content"}},
+    {"exclude_defaults": True},
+]
+JSON_KWARGS: typing.List[typing.Dict[str, typing.Any]] = [
+    {},
+    {"by_alias": False},
+    {"exclude_none": True},
+    {"exclude_unset": False},
+    {"indent": 2, "sort_keys": True},
+    {"exclude": {"content"}},
+]
+
+
+def _previous_dict(self: typing.Any, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+    kwargs_with_defaults_exclude_unset: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+    kwargs_with_defaults_exclude_none: typing.Any = {"by_alias": True, "exclude_none": True, **kwargs}
+
+    return deep_union_pydantic_dicts(
+        pydantic_v1.BaseModel.dict(self, **kwargs_with_defaults_exclude_unset),
+        pydantic_v1.BaseModel.dict(self, **kwargs_with_defaults_exclude_none),
+    )
+
+
+def _previous_json(self: typing.Any, **kwargs: typing.Any) -> str:
+    kwargs_with_defaults: typing.Any = {"by_alias": True, "exclude_unset": True, **kwargs}
+    return pydantic_v1.BaseModel.json(self, **kwargs_with_defaults)
+
+
+@contextlib.contextmanager
+def _previous_overrides() -> typing.Iterator[None]:
+    """
+    Swaps in the overrides the generated models had before `dict()` and `json()` were single-pass.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(UncheckedBaseModel, "dict", _previous_dict)
+        monkeypatch.setattr(UncheckedBaseModel, "json", _previous_json)
+        yield
+
+
+@pytest.mark.parametrize("kwargs", DICT_KWARGS)
+@pytest.mark.parametrize("model", MODELS)
+def test_dict_is_identical_to_the_previous_one(model: typing.Any, kwargs: typing.Dict[str, typing.Any]) -> None:
+    with _previous_overrides():
+        expected = model.dict(**kwargs)
+
+    actual = model.dict(**kwargs)
+
+    # repr also compares the order of the keys and the types of the containers.
+    assert repr(actual) == repr(expected)
+
+
+@pytest.mark.parametrize("kwargs", JSON_KWARGS)
+@pytest.mark.parametrize("model", MODELS)
+def test_json_is_identical_to_the_previous_one(model: typing.Any, kwargs: typing.Dict[str, typing.Any]) -> None:
+    with _previous_overrides():
+        expected = model.json(**kwargs)
+
+    assert model.json(**kwargs) == expected
+
+
+def test_dict_is_one_pass_over_each_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    message = ChatMessage(role="user", content=[TypedText(type="text", text="Hi")])
+    calls: typing.List[typing.Any] = []
+
+    def _iter(*args: typing.Any, **kwargs: typing.Any) -> typing.Iterator[typing.Any]:
+        calls.append(args)
+        return iter(())
+
+    monkeypatch.setattr(pydantic_v1.BaseModel, "_iter", _iter)
+
+    message.dict()
+    message.json()
+
+    assert calls == []
@@ -0,0 +1,113 @@
+import datetime as dt
+import typing
+
+import pydantic
+import pytest
+
+from reka import ChatMessage, ChatResponse, Tool, ToolCall, ToolOutput, TypedMediaContent, TypedText, Usage
+from reka.core import UncheckedBaseModel, construct_type, deep_union_pydantic_dicts
+from reka.core.pydantic_utilities import USE_PYDANTIC_V2
+
+if not USE_PYDANTIC_V2:
+    pytest.skip(
+        "Checks the single-pass `dict()` of pydantic 2 models, run with REKA_PYDANTIC_V2=1", allow_module_level=True
+    )
+
+WHEN = dt.datetime(2024, 5, 1, 12, 30, tzinfo=dt.timezone.utc)
+
+
+class Plain(pydantic.BaseModel):
+    name: str
+    note: typing.Optional[str] = None
+
+
+class Aliased(UncheckedBaseModel):
+    display_name: str = pydantic.Field(alias="displayName")
+    when: typing.Optional[dt.datetime] = None
+    tags: typing.Tuple[str, ...] = ()
+    plain: typing.Optional[Plain] = None
+    child: typing.Optional["Aliased"] = None
+    children: typing.Optional[typing.List["Aliased"]] = None
+    mapping: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+
+MODELS: typing.List[typing.Any] = [
+    ChatMessage(role="user", content="Hello"),
+    ChatMessage(role="user", content="Hello", tool_calls=None),
+    ChatMessage(
+        role="user",
+        content=[
+            TypedMediaContent(type="image_url", image_url="https://example.com/cat.png"),
+            TypedMediaContent(type="video_url", video_url="https://example.com/a.mp4", image_url=None),
+            TypedText(type="text", text="What is this?"),
+        ],
+    ),
+    ChatMessage(role="assistant", tool_calls=[ToolCall(id="c", name="f", parameters={"a": None, "b": [1, {"c": 2}]})]),
+    ChatMessage(role="tool_output", content=[ToolOutput(tool_call_id="c", output="21 C")], extra={"x": None}),
+    Tool(name="f", description=None, parameters={"model": Usage(input_tokens=1, output_tokens=2), "none": None}),
+    construct_type(
+        type_=ChatResponse,
+        object_={
+            "id": "r",
+            "model": "reka-core",
+            "responses": [
+                {"message": {"role": "assistant", "content": [{"type": "text", "text": "x"}]}, "finish_reason": None},
+                {"message": {"role": "assistant", "content": None, "tool_calls": [{"id": "c", "name": "f"}]}},
+                {"message": {"role": "assistant", "content": [{"type": "hologram"}], "unknown": None}},
+            ],
+            "usage": {"input_tokens": "1", "output_tokens": 2},
+        },
+    ),
+    Aliased(displayName="a"),
+    Aliased(
+        displayName="a",
+        when=WHEN,
+        tags=("x", "y"),
+        plain=Plain(name="p", note=None),
+        child=Aliased(displayName="b", child=None, mapping={"k": None, "plain": Plain(name="q")}),
+        children=[Aliased(displayName="c", when=None)],
+        mapping={"nested": {"model": Aliased(displayName="d"), "list": [Plain(name="r")]}, "none": None},
+    ),
+]
+
+DICT_KWARGS: typing.List[typing.Dict[str, typing.Any]] = [
+    {},
+    {"by_alias": False},
+    {"exclude_unset": True},
+    {"exclude_unset": False},
+    {"exclude_none": True},
+    {"exclude_none": False},
+    {"exclude_unset": False, "exclude_none": False},
+    {"include": {"role", "content", "display_name"}},
+    {"exclude": {"content"}},
+    {"exclude_defaults": True},
+]
+
+
+def _two_passes(model: typing.Any, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+    return deep_union_pydantic_dicts(
+        pydantic.BaseModel.model_dump(model, **{"warnings": False, "by_alias": True, "exclude_unset": True, **kwargs}),
+        pydantic.BaseModel.model_dump(model, **{"warnings": False, "by_alias": True, "exclude_none": True, **kwargs}),
+    )
+
+
+@pytest.mark.parametrize("kwargs", DICT_KWARGS)
+@pytest.mark.parametrize("model", MODELS)
+def test_dict_is_the_union_of_two_model_dump_passes(model: typing.Any, kwargs: typing.Dict[str, typing.Any]) -> None:
+    # repr also compares the order of the keys and the types of the containers.
+    assert repr(model.dict(**kwargs)) == repr(_two_passes(model, **kwargs))
+
+
+def test_dict_is_one_pass_over_each_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    message = ChatMessage(role="user", content=[TypedText(type="text", text="Hi")])
+    calls: typing.List[typing.Any] = []
+
+    def model_dump(*args: typing.Any, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        calls.append(args)
+        return {}
+
+    monkeypatch.setattr(pydantic.BaseModel, "model_dump", model_dump)
+
+    message.dict()
+
+    assert calls == []
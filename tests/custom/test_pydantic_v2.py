@@ -0,0 +1,196 @@
+import enum
+import json
+import os
+import subprocess
+import sys
+import typing
+import warnings
+
+import pydantic
+import pytest
+
+from reka import (
+    ChatMessage,
+    ChatResponse,
+    ChunkChatResponse,
+    HttpValidationError,
+    Model,
+    Tool,
+    ToolCall,
+    ToolOutput,
+    TypedMediaContent,
+    TypedText,
+)
+from reka.core import UncheckedBaseModel, construct_type, jsonable_encoder
+from reka.core.request_encoder import encode_request
+from reka.core.response_format import decode_response
+from reka.core.pydantic_utilities import PYDANTIC_MODEL_TYPES, USE_PYDANTIC_V2
+
+pytestmark = pytest.mark.skipif(not USE_PYDANTIC_V2, reason="Run with REKA_PYDANTIC_V2=1")
+
+DECODED: typing.List[typing.Tuple[typing.Any, typing.Any]] = [
+    (
+        ChatResponse,
+        {
+            "id": "response-id",
+            "model": "reka-core",
+            "responses": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": [{"type": "text", "text": "Hi"}, {"type": "image_url", "image_url": "x.png"}],
+                        "tool_calls": [{"id": "call-1", "name": "f", "parameters": {"x": [1, {"y": None}]}}],
+                        "unknown": True,
+                    },
+                    "finish_reason": "stop",
+                },
+                {"message": {"role": "assistant", "content": [{"type": "hologram", "hologram_url": "x"}]}},
+                {"message": {"role": "tool_output", "content": [{"tool_call_id": "call-1", "output": "21 C"}]}},
+                {"message": None, "finish_reason": None},
+            ],
+            "usage": {"input_tokens": "12", "output_tokens": "many"},
+        },
+    ),
+    (ChatResponse, {"id": "response-id", "responses": [{"message": {"content": "Hi"}}]}),
+    (ChunkChatResponse, {"id": "chunk-id", "responses": [{"chunk": {"role": "assistant", "content": " the"}}]}),
+    (typing.List[Model], [{"id": "reka-core"}, {"id": None}, {}]),
+    (HttpValidationError, {"detail": [{"loc": ["body", 0], "msg": "field required", "type": "value_error"}]}),
+    (typing.Union[ToolCall, ToolOutput], {"tool_call_id": "call-1", "output": "21 C"}),
+]
+
+REQUESTS: typing.List[typing.Any] = [
+    ChatMessage(role="user", content="Hello"),
+    ChatMessage(role="user", content="Hello", tool_calls=None),
+    ChatMessage(
+        role="user",
+        content=[
+            {"type": "text", "text": "What is this?"},
+            TypedMediaContent(type="video_url", video_url="https://example.com/a.mp4", image_url=None),
+        ],
+    ),
+    ChatMessage(role="assistant", tool_calls=[ToolCall(id="c", name="f", parameters={"a": None, "b": [1, {"c": 2}]})]),
+    ChatMessage(role="tool_output", content="21 C", metadata={"x": None}),
+    Tool(name="f", description=None, parameters={"model": TypedText(type="text", text="Hi"), "none": None}),
+]
+
+
+def _describe(value: typing.Any) -> typing.Any:
+    """
+    Returns what `value` holds, in a form that does not depend on the pydantic the models are built on.
+    """
+    if isinstance(value, PYDANTIC_MODEL_TYPES):
+        values = {**value.__dict__, **(getattr(value, "__pydantic_extra__", None) or {})}
+        fields_set = value.__pydantic_fields_set__ if USE_PYDANTIC_V2 else value.__fields_set__  # type: ignore
+        return {
+            "model": type(value).__name__,
+            "values": {key: _describe(item) for key, item in values.items()},
+            "set": sorted(fields_set),
+        }
+    if isinstance(value, dict):
+        return {key: _describe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    return value
+
+
+def snapshot() -> typing.Dict[str, typing.Any]:
+    """
+    Decodes and serializes `DECODED` and `REQUESTS` in every way the SDK does.
+    """
+    result: typing.Dict[str, typing.Any] = {"decoded": [], "requests": []}
+    for type_, object_ in DECODED:
+        decoded = construct_type(type_=type_, object_=object_)
+        models = decoded if isinstance(decoded, list) else [decoded]
+        result["decoded"].append(
+            {
+                "construct_type": _describe(decoded),
+                "dict": [model.dict() for model in models],
+                "dict(exclude_none=True)": [model.dict(exclude_none=True) for model in models],
+                "dict(exclude_unset=False, by_alias=False)": [
+                    model.dict(exclude_unset=False, by_alias=False) for model in models
+                ],
+                "json": [json.loads(model.json()) for model in models],
+                "slots": repr(decode_response(type_, object_, "slots")),
+            }
+        )
+    for message in REQUESTS:
+        result["requests"].append(
+            {
+                "model": _describe(message),
+                "dict": message.dict(),
+                "json": json.loads(message.json()),
+                "jsonable_encoder": jsonable_encoder(message),
+                "encode_request": encode_request({"messages": [message]}),
+            }
+        )
+    return json.loads(json.dumps(result))
+
+
+def test_the_models_are_pydantic_2_models() -> None:
+    assert issubclass(ChatMessage, pydantic.BaseModel)
+    assert ChatMessage.model_fields["role"].is_required()
+
+
+def test_the_models_behave_as_on_pydantic_v1() -> None:
+    env = {**os.environ, "REKA_PYDANTIC_V2": ""}
+    process = subprocess.run([sys.executable, __file__], env=env, capture_output=True, text=True, check=True)
+
+    assert snapshot() == json.loads(process.stdout)
+
+
+def test_nothing_is_deprecated() -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        snapshot()
+
+
+def test_model_construct_does_not_validate() -> None:
+    values: typing.Any = {"id": 1, "responses": [{"message": {"role": "assistant"}}]}
+
+    response = ChatResponse.model_construct(**values)
+
+    assert response.id == 1
+    assert response.responses[0].message.role == "assistant"  # type: ignore
+    assert response.dict() == ChatResponse.construct(**values).dict()
+
+
+def test_rebuilt_models_are_decoded_with_their_new_fields() -> None:
+    class Node(UncheckedBaseModel):
+        child: typing.Optional["Leaf"] = None
+
+    assert Node.construct(child={"name": "leaf"}).child == {"name": "leaf"}
+
+    class Leaf(UncheckedBaseModel):
+        name: str
+
+    Node.model_rebuild(_types_namespace={"Leaf": Leaf})
+
+    assert Node.construct(child={"name": "leaf"}).child == Leaf(name="leaf")
+
+
+def test_tool_outputs_are_kept_as_they_are() -> None:
+    output = ToolOutput(tool_call_id="c", output="21 C")
+
+    # `pydantic.v1` makes a `TypedMediaContent` of it, which accepts anything.
+    assert ChatMessage(role="tool_output", content=[output]).content == [output]
+
+
+def test_str_subclasses_are_kept_as_they_are() -> None:
+    class Url(str):
+        pass
+
+    class Color(str, enum.Enum):
+        RED = "red"
+
+    url = Url("https://example.com/cat.png")
+
+    content = TypedMediaContent(type="image_url", image_url=url)
+    message = ChatMessage(role="user", content=[{"type": "text", "text": Color.RED}])
+
+    assert content.image_url is url
+    assert type(message.content[0].text) is str  # type: ignore
+
+
+if __name__ == "__main__":
+    print(json.dumps(snapshot()))
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+import typing
+
+import httpx
+import pytest
+
+from reka.client import AsyncReka, Reka
+from reka.core import AdaptiveRateLimiter, ApiError
+from reka.core import http_client as http_client_module
+from reka.core import rate_limiter as rate_limiter_module
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: typing.List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter_module.time, "sleep", fake.sleep)
+    monkeypatch.setattr(http_client_module.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_requests_are_paced_at_the_current_rate(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=4)
+
+    assert [limiter.reserve() for _ in range(4)] == [0, 0.25, 0.5, 0.75]
+
+
+def test_429_cuts_the_rate_once_per_congestion_event(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=8, decrease_factor=0.5)
+    in_flight = [limiter.acquire() for _ in range(3)]
+
+    for sent_at in in_flight:
+        limiter.on_response(status_code=429, retry_after=None, sent_at=sent_at)
+
+    assert limiter.rate == 4
+    assert limiter.stats()["throttled"] == 3
+
+
+def test_rate_ramps_back_up_additively_while_saturated(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=2, min_rate=1, additive_increase=1)
+    limiter.on_response(status_code=429, retry_after=None, sent_at=limiter.acquire())
+    assert limiter.rate == 1
+
+    # Keep the limiter saturated for ten seconds of traffic.
+    while clock.now < 10:
+        limiter.on_response(status_code=200, retry_after=None, sent_at=limiter.acquire())
+
+    # One request per second more for every second of saturated traffic.
+    assert 10 <= limiter.rate <= 12
+
+
+def test_rate_does_not_grow_when_the_limiter_is_not_the_bottleneck(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=10)
+    for _ in range(20):
+        clock.now += 1
+        limiter.on_response(status_code=200, retry_after=None, sent_at=limiter.acquire())
+
+    assert limiter.rate == 10
+
+
+def test_retry_after_pauses_every_call(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=100, burst=10)
+    limiter.on_response(status_code=429, retry_after=2.0, sent_at=limiter.acquire())
+
+    assert limiter.reserve() >= 2.0
+    assert limiter.stats()["blocked_for"] == 2.0
+
+
+def test_calls_queued_during_a_pause_are_released_at_the_current_rate(clock: FakeClock) -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=10, decrease_factor=0.5)
+    limiter.on_response(status_code=429, retry_after=10.0, sent_at=limiter.acquire())
+
+    delays = [limiter.reserve() for _ in range(5)]
+
+    assert delays == pytest.approx([10.2, 10.4, 10.6, 10.8, 11.0])
+
+
+def test_unreasonable_retry_after_headers_are_ignored(clock: FakeClock) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"retry-after": "Fri, 31 Dec 2999 23:59:59 GMT"}, json=[])
+
+    limiter = AdaptiveRateLimiter()
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter
+    )
+
+    with pytest.raises(ApiError):
+        client.models.get()
+
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.stats()["blocked_for"] == 0
+
+
+def test_client_shares_the_limiter_across_calls(clock: FakeClock) -> None:
+    statuses = iter([429, 200, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        return httpx.Response(status, headers={"retry-after-ms": "1500"}, json=[])
+
+    limiter = AdaptiveRateLimiter(initial_rate=10, burst=5)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter
+    )
+
+    client.models.get(request_options={"max_retries": 1})
+    # The 429 halved the rate; the retry then had to wait for a paced slot, so its success nudges it back up.
+    assert 5 <= limiter.rate < 6
+    client.models.get()
+
+    assert limiter.stats()["throttled"] == 1
+    # The retry sleeps through the retry-after itself, so later calls only wait for their paced slot.
+    assert clock.sleeps[0] == 1.5
+    assert all(delay <= 0.2 for delay in clock.sleeps[1:])
+
+
+def test_limiter_is_shared_by_threads_and_tasks() -> None:
+    limiter = AdaptiveRateLimiter(initial_rate=200, max_rate=200)
+    sent: typing.List[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(time.monotonic())
+        return httpx.Response(200, json=[])
+
+    sync_client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter
+    )
+    async_client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), rate_limiter=limiter
+    )
+
+    async def run_tasks() -> None:
+        await asyncio.gather(*(async_client.models.get() for _ in range(10)))
+
+    threads = [threading.Thread(target=sync_client.models.get) for _ in range(10)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    asyncio.run(run_tasks())
+    for thread in threads:
+        thread.join()
+
+    assert len(sent) == 20
+    # 20 requests at 200 per second cannot complete in less than ~95ms.
+    assert time.monotonic() - start >= 0.09
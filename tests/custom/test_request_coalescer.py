@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, RequestCoalescer
+
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+def test_key_is_canonical() -> None:
+    assert RequestCoalescer.key({"a": 1, "b": [1, 2]}) == RequestCoalescer.key({"b": [1, 2], "a": 1})
+    assert RequestCoalescer.key({"a": 1}) != RequestCoalescer.key({"a": 2})
+
+
+def test_concurrent_identical_calls_share_one_request() -> None:
+    release = threading.Event()
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        release.wait(timeout=5)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    coalescer = RequestCoalescer()
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        request_coalescer=coalescer,
+    )
+    results: typing.List[typing.Any] = []
+
+    def call() -> None:
+        results.append(client.chat.create(messages=MESSAGES, model="reka-core", seed=1))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while coalescer.stats()["coalesced"] < 3:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(requests) == 1
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
+    assert coalescer.stats() == {"sent": 1, "coalesced": 3, "in_flight": 0}
+
+
+def test_different_bodies_are_not_coalesced() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        request_coalescer=RequestCoalescer(),
+    )
+    client.chat.create(messages=MESSAGES, model="reka-core", seed=1)
+    client.chat.create(messages=MESSAGES, model="reka-core", seed=2)
+    # Calls that do not overlap in time are sent again, there is no caching.
+    client.chat.create(messages=MESSAGES, model="reka-core", seed=2)
+
+    assert len(requests) == 3
+
+
+async def test_async_calls_share_one_request_and_its_error() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(500, json={"detail": "down"})
+
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        request_coalescer=RequestCoalescer(),
+    )
+
+    results = await asyncio.gather(
+        *(client.chat.create(messages=MESSAGES, model="reka-core", temperature=0) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert len(requests) == 1
+    assert all(isinstance(result, ApiError) and result.status_code == 500 for result in results)
+
+
+async def test_cancelling_one_caller_does_not_cancel_the_others() -> None:
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    coalescer = RequestCoalescer()
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        request_coalescer=coalescer,
+    )
+    first = asyncio.ensure_future(client.chat.create(messages=MESSAGES, model="reka-core"))
+    second = asyncio.ensure_future(client.chat.create(messages=MESSAGES, model="reka-core"))
+    await started.wait()
+    first.cancel()
+
+    response = await second
+
+    assert response.id == "response-id"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert coalescer.stats()["sent"] == 1
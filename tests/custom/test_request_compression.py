@@ -0,0 +1,141 @@
+import base64
+import gzip
+import json
+import os
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import CircuitBreaker, RequestCompression
+
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+CHUNK = {
+    "id": "chunk-id",
+    "model": "reka-core",
+    "responses": [{"chunk": {"role": "assistant", "content": "Hello"}, "finish_reason": None}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+# Random bytes stand in for an already compressed image such as a JPEG.
+IMAGE_URL = "data:image/jpeg;base64," + base64.b64encode(os.urandom(96 * 1024)).decode()
+IMAGE_MESSAGES = [
+    ChatMessage(
+        role="user",
+        content=[{"type": "image_url", "image_url": IMAGE_URL}, {"type": "text", "text": "What is in this image?"}],
+    )
+]
+
+
+def _decode(request: httpx.Request) -> typing.Any:
+    body = request.read()
+    if request.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def _client(compression: RequestCompression, **kwargs: typing.Any) -> typing.Tuple[Reka, typing.List[httpx.Request]]:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if _decode(request).get("stream"):
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, content=f"data: {json.dumps(CHUNK)}\n\n".encode()
+            )
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        request_compression=compression,
+        **kwargs,
+    )
+    return client, requests
+
+
+def test_large_bodies_are_compressed() -> None:
+    compression = RequestCompression(threshold=64 * 1024, level=1)
+    client, requests = _client(compression)
+
+    client.chat.create(messages=IMAGE_MESSAGES, model="reka-core")
+
+    request = requests[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert _decode(request)["messages"][0]["content"][0]["image_url"] == IMAGE_URL
+    stats = compression.stats()
+    assert stats["compressed"] == 1
+    # Base64 only carries 6 bits per byte, so even random data shrinks by about a quarter.
+    assert stats["bytes_out"] < 0.8 * stats["bytes_in"]
+    assert int(request.headers["Content-Length"]) == stats["bytes_out"]
+
+
+def test_small_bodies_are_sent_as_they_are() -> None:
+    compression = RequestCompression(threshold=64 * 1024)
+    client, requests = _client(compression)
+
+    client.chat.create(messages=[ChatMessage(role="user", content="Hi")], model="reka-core")
+
+    assert "Content-Encoding" not in requests[0].headers
+    assert _decode(requests[0])["model"] == "reka-core"
+    assert compression.stats() == {"requests": 1, "compressed": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def test_streams_are_compressed() -> None:
+    compression = RequestCompression(threshold=1024)
+    client, requests = _client(compression)
+
+    chunks = list(client.chat.create_stream(messages=IMAGE_MESSAGES, model="reka-core"))
+
+    assert len(chunks) == 1
+    assert requests[0].headers["Content-Encoding"] == "gzip"
+
+
+def test_circuits_still_see_the_model() -> None:
+    breaker = CircuitBreaker()
+    client, _ = _client(RequestCompression(threshold=1024), circuit_breaker=breaker)
+
+    client.chat.create(messages=IMAGE_MESSAGES, model="reka-core")
+
+    assert any(key.endswith("[reka-core]") for key in breaker.states())
+
+
+def test_zstd_requires_zstandard() -> None:
+    try:
+        import zstandard  # type: ignore # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            RequestCompression(encoding="zstd")
+    else:
+        assert RequestCompression(encoding="zstd").compress(b"x" * 10) is None
+
+
+def test_unknown_encodings_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        RequestCompression(encoding="br")
+
+
+async def test_async_client_compresses_bodies() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        request_compression=RequestCompression(threshold=1024),
+    )
+
+    await client.chat.create(messages=IMAGE_MESSAGES, model="reka-core")
+
+    assert requests[0].headers["Content-Encoding"] == "gzip"
+    assert _decode(requests[0])["model"] == "reka-core"
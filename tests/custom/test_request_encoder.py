@@ -0,0 +1,101 @@
+import datetime as dt
+import enum
+import json
+import typing
+import uuid
+
+import httpx
+import pytest
+
+from reka import ChatMessage, Tool, ToolCall, ToolOutput, TypedMediaContent, TypedText
+from reka.chat import client as chat_client_module
+from reka.client import Reka
+from reka.core import InMemoryResponseCache, RequestCoalescer, jsonable_encoder, pydantic_v1
+from reka.core.request_encoder import encode_request
+
+
+class Color(str, enum.Enum):
+    RED = "red"
+
+
+class Plain(pydantic_v1.BaseModel):
+    name: str
+    note: typing.Optional[str] = None
+    when: typing.Optional[dt.datetime] = None
+
+
+WHEN = dt.datetime(2024, 5, 1, 12, 30, tzinfo=dt.timezone.utc)
+TOOL = Tool(
+    name="get_weather",
+    description="Get the weather",
+    parameters={"type": "object", "properties": {"location": {"type": "string"}}, "required": ["location"]},
+)
+CALL = ToolCall(id="call-1", name="get_weather", parameters={"location": "Paris", "units": ("c", "f")})
+
+CASES: typing.List[typing.Any] = [
+    ChatMessage(role="user", content="Hello"),
+    ChatMessage(role="user", content="Hello", tool_calls=None),
+    ChatMessage(
+        role="user",
+        content=[
+            TypedMediaContent(type="image_url", image_url="https://example.com/cat.png"),
+            TypedMediaContent(type="video_url", video_url="https://example.com/a.mp4", image_url=None),
+            TypedText(type="text", text="What is this?"),
+        ],
+    ),
+    ChatMessage(role="user", content=[{"type": "audio_url", "audio_url": "data:audio/wav;base64,AAAA"}]),
+    ChatMessage(role="assistant", content=None, tool_calls=[CALL]),
+    ChatMessage(role="tool_output", content=[ToolOutput(tool_call_id="call-1", output='{"temperature": 21}')]),
+    ChatMessage(role="user", content="Hi", name="extra field", metadata={"when": WHEN, "color": Color.RED}),
+    ChatMessage.construct(role="user", content=[{"type": "text", "text": "constructed"}]),
+    TOOL,
+    Tool(name="no_description", parameters={"id": uuid.UUID(int=1), "when": WHEN, "tags": {"a"}}),
+    CALL,
+    {
+        "messages": [ChatMessage(role="user", content="Hi"), {"role": "assistant", "content": "Hello"}],
+        "model": "reka-core",
+        "tools": (TOOL,),
+        "tool_choice": "auto",
+        "stop": ["\n\n"],
+        "temperature": 0.5,
+        "max_tokens": 10,
+        "stream": False,
+        "seed": None,
+    },
+    {"when": WHEN, "date": WHEN.date(), "color": Color.RED, Color.RED: 1, "plain": Plain(name="x", when=WHEN)},
+    ChatMessage(role="user", content="Hi", plain=Plain(name="x"), plains=[Plain(name="y", note=None)]),
+    [1, 2.5, True, None, "text", (1, 2)],
+]
+
+
+@pytest.mark.parametrize("value", CASES)
+def test_output_is_identical_to_jsonable_encoder(value: typing.Any) -> None:
+    expected = jsonable_encoder(value)
+
+    actual = encode_request(value)
+
+    assert actual == expected
+    # Dicts compare equal regardless of key order, the encoded bodies do not.
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+def test_chat_create_encodes_the_request_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    encoded: typing.List[typing.Any] = []
+
+    def counting_encode_request(value: typing.Any) -> typing.Any:
+        encoded.append(value)
+        return encode_request(value)
+
+    monkeypatch.setattr(chat_client_module, "encode_request", counting_encode_request)
+    response = {"id": "response-id", "responses": [], "usage": {"input_tokens": 1, "output_tokens": 1}}
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=response))),
+        response_cache=InMemoryResponseCache(),
+        request_coalescer=RequestCoalescer(),
+    )
+
+    client.chat.create(messages=[ChatMessage(role="user", content="Hi")], model="reka-core", seed=1)
+
+    # The same encoded body is used for the cache key, the coalescer key and the request.
+    assert len(encoded) == 1
@@ -0,0 +1,118 @@
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import BaseClientWrapper, RequestOptions
+
+CHAT_RESPONSE = {"id": "response-id", "responses": [], "usage": {"input_tokens": 1, "output_tokens": 2}}
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.requests: typing.List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json=[] if request.url.path.endswith("/models") else CHAT_RESPONSE)
+
+
+def _client(recorder: _Recorder, **kwargs: typing.Any) -> Reka:
+    return Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(recorder)), **kwargs)
+
+
+def _timeout(request: httpx.Request) -> typing.Any:
+    return request.extensions["timeout"]["read"]
+
+
+def test_envelope_is_computed_once_per_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client(_Recorder())
+    calls = []
+    get_headers = BaseClientWrapper.get_headers
+
+    def counting_get_headers(self: BaseClientWrapper) -> typing.Dict[str, str]:
+        calls.append(self)
+        return get_headers(self)
+
+    monkeypatch.setattr(BaseClientWrapper, "get_headers", counting_get_headers)
+
+    for _ in range(3):
+        client.chat.create(messages=MESSAGES, model="reka-core")
+        client.chat.create(messages=MESSAGES, model="reka-core", request_options={"timeout_in_seconds": 1})
+        client.models.get()
+
+    assert len(calls) == 2
+
+
+def test_calls_without_request_options_send_the_envelope() -> None:
+    recorder = _Recorder()
+    client = _client(recorder, base_url="https://example.com/v1", timeout=12)
+
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    client.models.get()
+
+    chat, models = recorder.requests
+    assert str(chat.url) == "https://example.com/v1/chat"
+    assert str(models.url) == "https://example.com/v1/models"
+    assert chat.headers["X-Api-Key"] == "test"
+    assert chat.headers["X-Fern-SDK-Name"] == "reka-api"
+    assert _timeout(chat) == _timeout(models) == 12
+
+
+def test_request_options_are_merged_into_the_envelope() -> None:
+    recorder = _Recorder()
+    client = _client(recorder, timeout=12)
+    request_options: RequestOptions = {
+        "timeout_in_seconds": 3,
+        "additional_headers": {"X-Request-Id": "1", "X-Fern-Language": None},
+        "additional_query_parameters": {"trace": True, "filter": {"tier": "pro"}},
+    }
+
+    client.chat.create(messages=MESSAGES, model="reka-core", request_options=request_options)
+    client.chat.create(messages=MESSAGES, model="reka-core", request_options={"additional_headers": {}})
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    with_options, with_empty_options, without_options = recorder.requests
+    assert with_options.headers["X-Request-Id"] == "1"
+    assert "X-Fern-Language" not in with_options.headers
+    assert with_options.url.params == httpx.QueryParams({"trace": "true", "filter[tier]": "pro"})
+    assert _timeout(with_options) == 3
+    # The options of one call do not leak into the envelope.
+    for request in (with_empty_options, without_options):
+        assert "X-Request-Id" not in request.headers
+        assert request.headers["X-Fern-Language"] == "Python"
+        assert not request.url.params
+        assert _timeout(request) == 12
+
+
+def test_changing_the_api_key_resets_the_envelopes() -> None:
+    recorder = _Recorder()
+    client = _client(recorder)
+
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    client._client_wrapper.api_key = "rotated"
+    client.chat.create(messages=MESSAGES, model="reka-core")
+
+    assert [request.headers["X-Api-Key"] for request in recorder.requests] == ["test", "rotated"]
+
+
+async def test_async_client_sends_the_envelope() -> None:
+    recorder = _Recorder()
+    client = AsyncReka(
+        api_key="test", timeout=12, httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(recorder))
+    )
+
+    await client.chat.create(messages=MESSAGES, model="reka-core")
+    await client.chat.create(messages=MESSAGES, model="reka-core", request_options={"timeout_in_seconds": 3})
+    await client.models.get()
+
+    assert [str(request.url) for request in recorder.requests] == [
+        "https://api.reka.ai/v1/chat",
+        "https://api.reka.ai/v1/chat",
+        "https://api.reka.ai/v1/models",
+    ]
+    assert [_timeout(request) for request in recorder.requests] == [12, 3, 12]
+    assert all(request.headers["X-Api-Key"] == "test" for request in recorder.requests)
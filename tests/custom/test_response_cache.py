@@ -0,0 +1,208 @@
+import pathlib
+import sqlite3
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+from reka.core import response_cache as response_cache_module
+
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache_module.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(response_cache_module.time, "time", fake.time)
+    return fake
+
+
+def _client(cache: ResponseCache) -> typing.Tuple[Reka, typing.List[httpx.Request]]:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), response_cache=cache
+    )
+    return client, requests
+
+
+def test_deterministic_calls_are_cached() -> None:
+    cache = InMemoryResponseCache()
+    client, requests = _client(cache)
+
+    first = client.chat.create(messages=MESSAGES, model="reka-core", seed=42)
+    # Per-call options do not change the request, so they share the cached response.
+    second = client.chat.create(
+        messages=MESSAGES, model="reka-core", seed=42, request_options={"timeout_in_seconds": 5, "max_retries": 2}
+    )
+    client.chat.create(messages=MESSAGES, model="reka-core", temperature=0)
+    client.chat.create(messages=MESSAGES, model="reka-core", temperature=0)
+
+    assert len(requests) == 2
+    assert second == first
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_clients_sharing_a_cache_do_not_share_responses() -> None:
+    cache = InMemoryResponseCache()
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    for api_key, base_url in [("a", "https://a.example.com"), ("b", "https://a.example.com"), ("a", None)]:
+        client = Reka(
+            api_key=api_key,
+            base_url=base_url,
+            httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            response_cache=cache,
+        )
+        client.chat.create(messages=MESSAGES, model="reka-core", seed=42)
+        client.chat.create(messages=MESSAGES, model="reka-core", seed=42)
+
+    assert len(requests) == 3
+    assert cache.stats()["entries"] == 3
+
+
+def test_non_deterministic_calls_are_not_cached() -> None:
+    cache = InMemoryResponseCache()
+    client, requests = _client(cache)
+
+    client.chat.create(messages=MESSAGES, model="reka-core")
+    client.chat.create(messages=MESSAGES, model="reka-core", temperature=0.7)
+    client.chat.create(messages=MESSAGES, model="reka-core", temperature=0.7)
+
+    assert len(requests) == 3
+    assert cache.stats()["entries"] == 0
+
+
+def test_errors_are_not_cached() -> None:
+    cache = InMemoryResponseCache()
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(500, json={}))),
+        response_cache=cache,
+    )
+
+    with pytest.raises(ApiError):
+        client.chat.create(messages=MESSAGES, model="reka-core", seed=1)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_in_memory_cache_evicts_least_recently_used(clock: FakeClock) -> None:
+    cache = InMemoryResponseCache(max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.set("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1, "errors": 0, "entries": 2, "bytes": 8}
+
+
+def test_in_memory_cache_expires_entries(clock: FakeClock) -> None:
+    cache = InMemoryResponseCache(ttl=60)
+    cache.set("a", b"1")
+    clock.now += 59
+    assert cache.get("a") == b"1"
+
+    clock.now += 1
+
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path: pathlib.Path, clock: FakeClock) -> None:
+    path = str(tmp_path / "responses.db")
+    writer = SQLiteResponseCache(path, ttl=60)
+    reader = SQLiteResponseCache(path, ttl=60)
+    writer.set("a", b"body")
+    writer.set("b", b"body")
+
+    assert reader.get("a") == b"body"
+    clock.now += 60
+    assert reader.get("a") is None
+    assert reader.purge() == 1
+    assert reader.stats() == {"hits": 1, "misses": 1, "evictions": 2, "errors": 0, "entries": 0, "bytes": 0}
+
+
+def test_sqlite_cache_evicts_the_oldest_entries(tmp_path: pathlib.Path, clock: FakeClock) -> None:
+    cache = SQLiteResponseCache(str(tmp_path / "responses.db"), max_entries=2)
+    for key in "abc":
+        cache.set(key, b"body")
+        clock.now += 1
+
+    assert cache.get("a") is None
+    assert cache.get("b") == cache.get("c") == b"body"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_cache_faults_degrade_to_misses(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "responses.db")
+    cache = SQLiteResponseCache(path)
+    client, requests = _client(cache)
+    with sqlite3.connect(path) as connection:
+        connection.execute("DROP TABLE responses")
+
+    for _ in range(2):
+        response = client.chat.create(messages=MESSAGES, model="reka-core", seed=3)
+
+    assert response.responses[0].message.content == "Hello"
+    assert len(requests) == 2
+    # Two failed reads and two failed writes.
+    assert cache.stats() == {"hits": 0, "misses": 2, "evictions": 0, "errors": 4, "entries": 0, "bytes": 0}
+
+
+def test_response_cache_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        ResponseCache()  # type: ignore
+
+
+async def test_async_client_uses_the_sqlite_cache(tmp_path: pathlib.Path) -> None:
+    requests: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    cache = SQLiteResponseCache(str(tmp_path / "responses.db"))
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), response_cache=cache
+    )
+
+    for _ in range(3):
+        response = await client.chat.create(messages=MESSAGES, model="reka-core", seed=7)
+
+    assert response.responses[0].message.content == "Hello"
+    assert len(requests) == 1
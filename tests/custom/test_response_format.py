@@ -0,0 +1,139 @@
+import json
+import typing
+
+import httpx
+import pytest
+from typing_extensions import assert_type
+
+from reka import ChatMessage, ChatResponse, Model
+from reka.client import AsyncReka, Reka
+from reka.core import ResponseView, TTLCache
+from reka.core.response_format import decode_response
+
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [
+        {
+            "message": {
+                "role": "assistant",
+                "content": [{"type": "text", "text": "Hi"}],
+                "tool_calls": [{"id": "call-1", "name": "f", "parameters": {"x": 1}}],
+            },
+            "finish_reason": "stop",
+            "unknown": True,
+        }
+    ],
+    "usage": {"input_tokens": 1, "output_tokens": 2},
+}
+CHUNK = {"id": "chunk-id", "model": "reka-core", "responses": [{"chunk": {"role": "assistant", "content": "Hé"}}]}
+MODELS = [{"id": "reka-core"}, {"id": "reka-flash"}]
+MESSAGES = [ChatMessage(role="user", content="Hi")]
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/models"):
+        return httpx.Response(200, json=MODELS)
+    if json.loads(request.read()).get("stream"):
+        data = f"data: {json.dumps(CHUNK)}\n\n".encode()
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=data * 2)
+    return httpx.Response(200, json=CHAT_RESPONSE)
+
+
+def _client(**kwargs: typing.Any) -> Reka:
+    return Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(_handler)), **kwargs)
+
+
+def test_models_are_the_default() -> None:
+    response = _client().chat.create(messages=MESSAGES, model="reka-core")
+
+    assert isinstance(response, ChatResponse)
+
+
+def test_raw_returns_the_decoded_json() -> None:
+    client = _client(response_format="raw")
+
+    assert client.chat.create(messages=MESSAGES, model="reka-core") == CHAT_RESPONSE
+    assert list(client.chat.create_stream(messages=MESSAGES, model="reka-core")) == [CHUNK, CHUNK]
+    assert client.models.get() == MODELS
+
+
+def test_slots_returns_read_only_views() -> None:
+    client = _client(response_format="slots")
+
+    # Type checkers cannot see the client's format.
+    response = typing.cast(ResponseView, client.chat.create(messages=MESSAGES, model="reka-core"))
+
+    assert type(response).__name__ == "ChatResponseView" and isinstance(response, ResponseView)
+    assert not hasattr(response, "__dict__")
+    assert (response.id, response.model, response.usage.output_tokens) == ("response-id", "reka-core", 2)
+    message = response.responses[0].message
+    assert message.content == [{"type": "text", "text": "Hi"}]
+    assert message.tool_calls[0].parameters == {"x": 1}
+    assert not hasattr(response.responses[0], "unknown")
+    with pytest.raises(AttributeError):
+        response.id = "other"
+    assert [chunk.responses[0].chunk.content for chunk in client.chat.create_stream(messages=MESSAGES, model="x")] == [
+        "Hé",
+        "Hé",
+    ]
+    assert [model.id for model in client.models.get()] == ["reka-core", "reka-flash"]
+
+
+def test_views_default_missing_fields_to_none() -> None:
+    view = decode_response(ChatResponse, {"id": "response-id", "responses": [{"message": None}]}, "slots")
+
+    assert view.model is None and view.usage is None
+    assert view.responses[0].message is None
+    assert view == decode_response(ChatResponse, {"id": "response-id", "responses": [{}]}, "slots")
+    assert "ChatResponseView(id='response-id', model=None" in repr(view)
+
+
+def test_request_options_override_the_client() -> None:
+    client = _client(response_format="slots")
+
+    raw = client.chat.create(messages=MESSAGES, model="reka-core", request_options={"response_format": "raw"})
+    models = client.chat.create(messages=MESSAGES, model="reka-core", request_options={"response_format": "models"})
+
+    assert assert_type(raw, typing.Dict[str, typing.Any]) == CHAT_RESPONSE
+    assert isinstance(assert_type(models, ChatResponse), ChatResponse)
+
+
+def test_request_options_type_the_result() -> None:
+    client = _client()
+
+    chunks = client.chat.create_stream(messages=MESSAGES, model="x", request_options={"response_format": "slots"})
+    models = client.models.get(request_options={"response_format": "raw", "max_retries": 1})
+
+    assert [chunk.id for chunk in assert_type(chunks, typing.Iterator[ResponseView])] == ["chunk-id", "chunk-id"]
+    assert assert_type(models, typing.List[typing.Dict[str, typing.Any]]) == MODELS
+    assert assert_type(client.models.get(), typing.List[Model])[0].id == "reka-core"
+
+
+def test_models_cache_keeps_formats_apart() -> None:
+    client = _client(models_cache=TTLCache(ttl=60))
+
+    raw = client.models.get(request_options={"response_format": "raw"})
+    models = client.models.get()
+
+    assert raw == MODELS
+    assert [model.id for model in models] == ["reka-core", "reka-flash"]
+
+
+def test_unknown_formats_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        _client(response_format="xml").chat.create(messages=MESSAGES, model="reka-core")  # type: ignore
+
+
+async def test_async_client_returns_the_format() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return _handler(request)
+
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), response_format="raw"
+    )
+
+    assert await client.chat.create(messages=MESSAGES, model="reka-core") == CHAT_RESPONSE
+    assert [chunk async for chunk in client.chat.create_stream(messages=MESSAGES, model="reka-core")] == [CHUNK, CHUNK]
+    views = await client.models.get(request_options={"response_format": "slots"})
+    assert [model.id for model in views] == ["reka-core", "reka-flash"]
@@ -0,0 +1,82 @@
+import typing
+
+import httpx
+import pytest
+
+from reka.client import Reka
+from reka.core import ApiError, RetryBudget
+from reka.core import http_client as http_client_module
+from reka.core import retry_budget as retry_budget_module
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(retry_budget_module.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(http_client_module.time, "sleep", lambda _: None)
+    return fake
+
+
+def test_retries_are_bounded_by_ratio_of_requests(clock: FakeClock) -> None:
+    budget = RetryBudget(retry_ratio=0.5, min_retries_per_second=0, max_tokens=1)
+
+    budget.record_request()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    assert budget.stats() == {"requests": 3, "retries": 2, "exhausted": 2, "balance": 0}
+
+
+def test_min_retries_per_second_refills_over_time(clock: FakeClock) -> None:
+    budget = RetryBudget(retry_ratio=0, min_retries_per_second=2, max_tokens=4)
+    for _ in range(4):
+        assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    clock.now += 1
+    assert budget.try_acquire_retry()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    # The balance never grows beyond max_tokens, however long the client has been idle.
+    clock.now += 60
+    assert budget.stats()["balance"] == 4
+
+
+def test_invalid_configuration_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        RetryBudget(max_tokens=0)
+
+
+def test_exhausted_budget_fails_fast_across_calls(clock: FakeClock) -> None:
+    attempts: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        return httpx.Response(503, json={"detail": "overloaded"})
+
+    budget = RetryBudget(retry_ratio=0, min_retries_per_second=0, max_tokens=3)
+    client = Reka(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), retry_budget=budget
+    )
+
+    for _ in range(3):
+        with pytest.raises(ApiError):
+            client.models.get(request_options={"max_retries": 2})
+
+    # The first call spends two retries, the second spends the last one, the third is not retried at all.
+    assert len(attempts) == 3 + 2 + 1
+    assert budget.stats() == {"requests": 3, "retries": 3, "exhausted": 2, "balance": 0}
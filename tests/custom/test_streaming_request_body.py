@@ -0,0 +1,195 @@
+import base64
+import gzip
+import io
+import json
+import os
+import tracemalloc
+import typing
+
+import httpx
+import pytest
+
+from reka import ChatMessage
+from reka.client import AsyncReka, Reka
+from reka.core import MediaFile, RequestCompression, StreamingRequestBody, jsonable_encoder
+from reka.core.streaming_request_body import iter_json
+
+CHAT_RESPONSE = {
+    "id": "response-id",
+    "model": "reka-core",
+    "responses": [{"message": {"role": "assistant", "content": "Hello"}, "finish_reason": "stop"}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+CHUNK = {
+    "id": "chunk-id",
+    "model": "reka-core",
+    "responses": [{"chunk": {"role": "assistant", "content": "Hello"}, "finish_reason": None}],
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+def _video_message(file: typing.BinaryIO) -> ChatMessage:
+    return ChatMessage(
+        role="user",
+        content=[{"type": "video_url", "video_url": MediaFile(file, "video/mp4")}, {"type": "text", "text": "Hi"}],
+    )
+
+
+def _read(request: httpx.Request) -> typing.Any:
+    body = request.read()
+    if request.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"a": [1, 2.5, None, True, False], "b": {"c": "d", 1: "int key", None: "none key"}},
+        ["é ü 你好 🙂", 'quote " backslash \\ newline \n tab \t control \x01', ""],
+        {"long": 'x"y\n' * 10_000, "unicode": "🙂" * 5_000},
+        [],
+        {},
+        "plain",
+        3,
+    ],
+)
+def test_encoding_matches_json_dumps(value: typing.Any) -> None:
+    expected = json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    chunks = list(iter_json(value, chunk_size=1024))
+
+    assert b"".join(chunks) == expected
+    assert all(len(chunk) < 3 * 1024 for chunk in chunks)
+
+
+def test_media_files_are_encoded_as_data_urls() -> None:
+    data = os.urandom(100_003)
+    file = io.BytesIO(b"skipped" + data)
+    file.seek(len(b"skipped"))
+    media = MediaFile(file, "image/png")
+
+    encoded = b"".join(iter_json({"image_url": media}, chunk_size=1000))
+
+    expected = "data:image/png;base64," + base64.b64encode(data).decode()
+    assert json.loads(encoded) == {"image_url": expected}
+    # The file can be read again, e.g. for a retry.
+    assert b"".join(iter_json({"image_url": media}, chunk_size=4096)) == encoded
+
+
+def test_media_files_survive_message_validation() -> None:
+    media = MediaFile(io.BytesIO(b"video"), "video/mp4")
+    message = _video_message(typing.cast(typing.BinaryIO, media.file))
+
+    content = jsonable_encoder(message)["content"]
+
+    assert isinstance(content[0]["video_url"], MediaFile)
+
+
+def test_peak_memory_stays_near_the_chunk_size() -> None:
+    body = {"messages": [{"role": "user", "content": "x" * (8 * 1024 * 1024)}]}
+    tracemalloc.start()
+    try:
+        for _ in iter_json(body, chunk_size=64 * 1024):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1024 * 1024
+
+
+def test_create_streams_the_body() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    streaming = StreamingRequestBody(chunk_size=4096)
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        streaming_request_body=streaming,
+    )
+    data = os.urandom(50_000)
+
+    client.chat.create(messages=[_video_message(io.BytesIO(data))], model="reka-core")
+
+    assert requests[0].headers["Transfer-Encoding"] == "chunked"
+    body = _read(requests[0])
+    assert body["messages"][0]["content"][0]["video_url"] == "data:video/mp4;base64," + base64.b64encode(data).decode()
+    assert body["model"] == "reka-core"
+    assert streaming.stats()["requests"] == 1
+
+
+def test_retries_resend_the_whole_body() -> None:
+    bodies: typing.List[typing.Any] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(_read(request))
+        return httpx.Response(500 if len(bodies) == 1 else 200, json=CHAT_RESPONSE)
+
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        streaming_request_body=StreamingRequestBody(chunk_size=4096),
+    )
+
+    client.chat.create(
+        messages=[_video_message(io.BytesIO(os.urandom(20_000)))],
+        model="reka-core",
+        request_options={"max_retries": 1},
+    )
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+
+
+def test_streamed_bodies_are_compressed_from_the_threshold() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=f"data: {json.dumps(CHUNK)}\n\n".encode()
+        )
+
+    compression = RequestCompression(threshold=10_000)
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        request_compression=compression,
+        streaming_request_body=StreamingRequestBody(chunk_size=4096),
+    )
+    small = [ChatMessage(role="user", content="Hi")]
+    large = [_video_message(io.BytesIO(os.urandom(20_000)))]
+
+    list(client.chat.create_stream(messages=small, model="reka-core"))
+    list(client.chat.create_stream(messages=large, model="reka-core"))
+
+    assert "Content-Encoding" not in requests[0].headers
+    assert _read(requests[0])["messages"][0]["content"] == "Hi"
+    assert requests[1].headers["Content-Encoding"] == "gzip"
+    assert _read(requests[1])["stream"] is True
+    assert compression.stats()["compressed"] == 1
+
+
+async def test_async_client_streams_the_body() -> None:
+    requests: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await request.aread()
+        return httpx.Response(200, json=CHAT_RESPONSE)
+
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        streaming_request_body=StreamingRequestBody(chunk_size=4096),
+    )
+    data = os.urandom(50_000)
+
+    await client.chat.create(messages=[_video_message(io.BytesIO(data))], model="reka-core")
+
+    body = json.loads(requests[0].content)
+    assert body["messages"][0]["content"][0]["video_url"] == "data:video/mp4;base64," + base64.b64encode(data).decode()
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+import typing
+
+import httpx
+import pytest
+
+from reka.client import AsyncReka, Reka
+from reka.core import ApiError, TTLCache
+from reka.core import ttl_cache as ttl_cache_module
+
+MODELS = [{"id": "reka-core"}, {"id": "reka-flash"}]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    # Only the cache's clock is faked, asyncio's event loop clock keeps running.
+    monkeypatch.setattr(ttl_cache_module, "monotonic", fake.monotonic)
+    return fake
+
+
+def _wait_until(condition: typing.Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the background refresh"
+        time.sleep(0.001)
+
+
+async def _wait_until_async(condition: typing.Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the background refresh"
+        await asyncio.sleep(0.001)
+
+
+def _client(cache: TTLCache, handler: typing.Callable[[httpx.Request], httpx.Response]) -> Reka:
+    return Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)), models_cache=cache)
+
+
+def test_models_are_cached_for_the_ttl(clock: FakeClock) -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=MODELS)
+
+    cache = TTLCache(ttl=60, stale_while_revalidate=0)
+    client = _client(cache, handler)
+
+    first = client.models.get()
+    first.clear()
+    second = client.models.get()
+    clock.now += 60
+    client.models.get()
+
+    # Callers get their own list, so changing one does not change the cache.
+    assert [model.id for model in second] == ["reka-core", "reka-flash"]
+    assert len(requests) == 2
+    assert cache.stats() == {"hits": 1, "stale_hits": 0, "misses": 2, "refreshes": 2, "errors": 0, "entries": 1}
+
+
+def test_stale_models_are_returned_while_refreshing_in_the_background(clock: FakeClock) -> None:
+    release = threading.Event()
+    responses = iter([MODELS, MODELS[:1]])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = next(responses)
+        if len(body) == 1:
+            release.wait(timeout=5)
+        return httpx.Response(200, json=body)
+
+    cache = TTLCache(ttl=60, stale_while_revalidate=60)
+    client = _client(cache, handler)
+    client.models.get()
+    clock.now += 90
+
+    # Neither call waits for the refresh, and only one refresh is sent.
+    assert len(client.models.get()) == 2
+    assert len(client.models.get()) == 2
+    release.set()
+    _wait_until(lambda: cache.stats()["refreshes"] == 2)
+
+    assert len(client.models.get()) == 1
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_failed_background_refresh_keeps_the_stale_entry(clock: FakeClock) -> None:
+    statuses = iter([200, 500, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), json=MODELS)
+
+    cache = TTLCache(ttl=60, stale_while_revalidate=60)
+    client = _client(cache, handler)
+    client.models.get()
+    clock.now += 90
+
+    assert len(client.models.get()) == 2
+    _wait_until(lambda: cache.stats()["errors"] == 1)
+    assert len(client.models.get()) == 2
+
+
+def test_errors_are_raised_when_there_is_nothing_cached(clock: FakeClock) -> None:
+    cache = TTLCache()
+    client = _client(cache, lambda request: httpx.Response(503, json={"detail": "down"}))
+
+    with pytest.raises(ApiError):
+        client.models.get()
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_drops_the_cached_models(clock: FakeClock) -> None:
+    requests: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=MODELS)
+
+    client = _client(TTLCache(), handler)
+    client.models.get()
+    client.models.invalidate()
+    client.models.get()
+
+    assert len(requests) == 2
+
+
+def test_clients_with_different_api_keys_do_not_share_entries(clock: FakeClock) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=MODELS if request.headers["X-Api-Key"] == "a" else MODELS[:1])
+
+    cache = TTLCache()
+    transport = httpx.MockTransport(handler)
+    first = Reka(api_key="a", httpx_client=httpx.Client(transport=transport), models_cache=cache)
+    second = Reka(api_key="b", httpx_client=httpx.Client(transport=transport), models_cache=cache)
+
+    assert len(first.models.get()) == 2
+    assert len(second.models.get()) == 1
+
+
+async def test_concurrent_async_calls_share_one_request(clock: FakeClock) -> None:
+    requests: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=MODELS)
+
+    cache = TTLCache(ttl=60, stale_while_revalidate=60)
+    client = AsyncReka(
+        api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), models_cache=cache
+    )
+
+    results = await asyncio.gather(*(client.models.get() for _ in range(5)))
+    assert len(requests) == 1
+    assert all(len(result) == 2 for result in results)
+
+    clock.now += 90
+    assert len(await client.models.get()) == 2
+    assert len(requests) == 1
+    await _wait_until_async(lambda: cache.stats()["refreshes"] == 2)
+    assert len(requests) == 2
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import typing
+
+import httpx
+import pytest
+
+from reka.client import AsyncReka, Reka
+from reka.core import LoadBalancer
+
+
+def _counting_handler() -> typing.Tuple[typing.Callable[[httpx.Request], httpx.Response], typing.List[httpx.Request]]:
+    requests: typing.List[httpx.Request] = []
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            requests.append(request)
+        return httpx.Response(404)
+
+    return handler, requests
+
+
+def test_warmup_sends_concurrent_head_requests() -> None:
+    handler, requests = _counting_handler()
+    client = Reka(
+        api_key="test",
+        base_url="https://api.example.com/v1",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    assert client.warmup(n_connections=4) == 4
+
+    assert len(requests) == 4
+    assert {(r.method, str(r.url)) for r in requests} == {("HEAD", "https://api.example.com/v1")}
+    assert requests[0].headers["X-Api-Key"] == "test"
+
+
+def test_warmup_reports_failed_connections() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert client.warmup(n_connections=2) == 0
+
+
+def test_warmup_rejects_zero_connections() -> None:
+    handler, requests = _counting_handler()
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(ValueError):
+        client.warmup(n_connections=0)
+    with pytest.raises(ValueError):
+        client.start_keepalive(n_connections=0)
+
+    assert requests == []
+
+
+def test_warmup_opens_connections_to_every_balanced_endpoint() -> None:
+    handler, requests = _counting_handler()
+    client = Reka(
+        api_key="test",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        load_balancer=LoadBalancer(["https://eu.api.example.com/v1", "https://us.api.example.com/v1"]),
+    )
+
+    assert client.warmup(n_connections=2) == 4
+
+    assert sorted(request.url.host for request in requests) == ["eu.api.example.com"] * 2 + ["us.api.example.com"] * 2
+
+
+def test_keepalive_rewarms_in_the_background() -> None:
+    handler, requests = _counting_handler()
+    client = Reka(api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    client.start_keepalive(n_connections=2, interval=0.01)
+    deadline = time.monotonic() + 5
+    while len(requests) < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client.stop_keepalive()
+    sent = len(requests)
+    time.sleep(0.05)
+
+    assert sent >= 4
+    assert len(requests) == sent
+
+
+async def test_async_warmup_and_keepalive() -> None:
+    handler, requests = _counting_handler()
+    client = AsyncReka(api_key="test", httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert await client.warmup(n_connections=3) == 3
+
+    client.start_keepalive(n_connections=1, interval=0.01)
+    await asyncio.sleep(0.1)
+    await client.stop_keepalive()
+    sent = len(requests)
+    await asyncio.sleep(0.05)
+
+    assert sent > 3
+    assert len(requests) == sent
+
+
+async def test_async_warmup_opens_connections_to_every_balanced_endpoint() -> None:
+    handler, requests = _counting_handler()
+    client = AsyncReka(
+        api_key="test",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        load_balancer=LoadBalancer(["https://eu.api.example.com/v1", "https://us.api.example.com/v1"]),
+    )
+
+    assert await client.warmup() == 2
+
+    assert {request.url.host for request in requests} == {"eu.api.example.com", "us.api.example.com"}